@@ -1,359 +1,546 @@
-from flask import Flask, render_template, request, jsonify
-import random
-import string
+from flask import Flask, render_template, request, jsonify, Response, stream_with_context, g
+import csv
+import io
+import json
+import math
+import os
 import re
+from time import perf_counter
+
+import password_core
+from password_core import (CHARACTER_SETS, PasswordPolicy, estimate_entropy, exclusion_set,
+                           score_password)
+from password_core import metrics, profiling
+from password_core.audit import AuditSummary, audit, summary_line
+from password_core.breach import load_breach_list
+from password_core.bulk import EXPORT_FORMATS, generate_bulk, iter_encrypted, load_key
+from password_core.ratelimit import rate_limiter_from_env
+from password_core.sources import lock_to_system
+from static_assets import load_assets
+
+# Seeded (reproducible) sources are for benchmarks only; refuse them in the server
+lock_to_system()
 
 app = Flask(__name__)
 
+# Upper bound on passwords returned by a single /generate/batch request
+MAX_BATCH_COUNT = 500000
+
+# Streaming responses are produced chunk by chunk, so they can go much higher
+MAX_STREAM_COUNT = 10000000
+STREAM_CHUNK_SIZE = 4096
+
+# /generate/export runs the bulk generator in-process unless told otherwise
+EXPORT_WORKERS = int(os.environ.get('PASSWORD_EXPORT_WORKERS', 1))
+# /analyze scores uploads in-process unless told otherwise
+AUDIT_WORKERS = int(os.environ.get('PASSWORD_AUDIT_WORKERS', 1))
+# Exports live in memory until sent, so their size is capped
+MAX_EXPORT_LENGTH = 4096
+MAX_EXPORT_BYTES = int(os.environ.get('PASSWORD_EXPORT_MAX_BYTES', 1 << 30))
+# Key for "encrypt": true exports; encryption is refused when it is not set
+EXPORT_KEY_FILE = os.environ.get('PASSWORD_EXPORT_KEY_FILE')
+EXPORT_CONTENT_TYPES = {
+    'lines': 'text/plain; charset=us-ascii',
+    'fixed': 'application/octet-stream',
+    'binary': 'application/octet-stream',
+}
+
 class PasswordGenerator:
-    def __init__(self):
-        self.character_sets = {
-            'uppercase': string.ascii_uppercase,
-            'lowercase': string.ascii_lowercase,
-            'numbers': string.digits,
-            'symbols': '!@#$%^&*()_+-=[]{}|;:,.<>?'
-        }
+    """
+    Flask-facing adapter over the shared password_core engine
+    """
+    def __init__(self, blocklist=None):
+        self.character_sets = dict(CHARACTER_SETS)
+        # Optional breach.BreachList; generated passwords found in it are redrawn
+        self.blocklist = blocklist
     
     def generate_password(self, length=12, use_uppercase=True, use_lowercase=True, 
-                         use_numbers=True, use_symbols=True, exclude_chars=''):
+                         use_numbers=True, use_symbols=True, exclude_chars='',
+                         enforce_rules=True, exclude_presets=()):
         """
         Generate a random password based on specified criteria
         """
-        # Build character set based on user preferences
-        charset = ''
-        if use_uppercase:
-            charset += self.character_sets['uppercase']
-        if use_lowercase:
-            charset += self.character_sets['lowercase']
-        if use_numbers:
-            charset += self.character_sets['numbers']
-        if use_symbols:
-            charset += self.character_sets['symbols']
-        
-        # Remove excluded characters
-        if exclude_chars:
-            for char in exclude_chars:
-                charset = charset.replace(char, '')
-        
-        # Validate character set
-        if not charset:
-            return "Error: At least one character type must be selected"
-        
-        if length < 4:
-            return "Error: Password length must be at least 4 characters"
-        
-        # Generate password
-        password = ''.join(random.choice(charset) for _ in range(length))
+        policy = PasswordPolicy(length, use_uppercase, use_lowercase, use_numbers,
+                                use_symbols, exclude_chars, enforce_rules, exclude_presets)
+        metrics.REQUESTS.inc(('generate', metrics.policy_label(policy)))
+        try:
+            if metrics.sample():
+                start = perf_counter()
+                password = password_core.generate_password(policy, self.blocklist)
+                stage = 'constrained_generate' if policy.enforce_rules else 'generate'
+                metrics.STAGE_SECONDS.observe(perf_counter() - start, (stage,))
+            else:
+                password = password_core.generate_password(policy, self.blocklist)
+        except ValueError as e:
+            metrics.ERRORS.inc(('generate',))
+            return f"Error: {e}"
+        metrics.PASSWORDS.inc(('generate',))
         return password
     
+    def generate_many(self, count, length=12, use_uppercase=True, use_lowercase=True,
+                      use_numbers=True, use_symbols=True, exclude_chars='',
+                      enforce_rules=True, exclude_presets=()):
+        """
+        Generate a list of passwords, raising ValueError for invalid options
+        """
+        policy = PasswordPolicy(length, use_uppercase, use_lowercase, use_numbers,
+                                use_symbols, exclude_chars, enforce_rules, exclude_presets)
+        metrics.REQUESTS.inc(('batch', metrics.policy_label(policy)))
+        passwords = password_core.generate_many(policy, count, self.blocklist)
+        metrics.PASSWORDS.inc(('batch',), len(passwords))
+        return passwords
+    
+    def iter_many(self, count, chunk_size=STREAM_CHUNK_SIZE, length=12, use_uppercase=True,
+                  use_lowercase=True, use_numbers=True, use_symbols=True, exclude_chars='',
+                  enforce_rules=True, exclude_presets=()):
+        """
+        Return an iterator over lists of at most ``chunk_size`` passwords
+        """
+        policy = PasswordPolicy(length, use_uppercase, use_lowercase, use_numbers,
+                                use_symbols, exclude_chars, enforce_rules, exclude_presets)
+        metrics.REQUESTS.inc(('stream', metrics.policy_label(policy)))
+        chunks = password_core.iter_many(policy, count, chunk_size, self.blocklist)
+        return self._count_chunks(chunks)
+    
+    def generate_bulk(self, count, length=12, use_uppercase=True, use_lowercase=True,
+                      use_numbers=True, use_symbols=True, exclude_chars='',
+                      enforce_rules=True, exclude_presets=()):
+        """
+        Generate passwords as fixed-width records in one shared buffer;
+        returns a bulk.BulkResult the caller must close
+        """
+        policy = PasswordPolicy(length, use_uppercase, use_lowercase, use_numbers,
+                                use_symbols, exclude_chars, enforce_rules, exclude_presets)
+        metrics.REQUESTS.inc(('export', metrics.policy_label(policy)))
+        result = generate_bulk(policy, count, EXPORT_WORKERS,
+                               blocklist_path=getattr(self.blocklist, 'index_path', None))
+        metrics.PASSWORDS.inc(('export',), count)
+        return result
+    
+    def _count_chunks(self, chunks):
+        for chunk in chunks:
+            metrics.PASSWORDS.inc(('stream',), len(chunk))
+            yield chunk
+    
+    def generate_passphrase(self, words=6, separator='-', capitalize=False, digits=0):
+        """
+        Generate a diceware-style passphrase, raising ValueError for invalid
+        options or a missing wordlist
+        """
+        metrics.REQUESTS.inc(('generate', 'passphrase'))
+        result = password_core.generate_passphrase(words, separator, capitalize, digits)
+        metrics.PASSWORDS.inc(('generate',))
+        return result
+    
+    def generate_template(self, template, exclude_chars='', exclude_presets=()):
+        """
+        Generate a password from a pattern template such as "Cvccvc-99",
+        raising ValueError for malformed templates
+        """
+        metrics.REQUESTS.inc(('generate', 'template'))
+        excluded = exclusion_set(exclude_chars, exclude_presets)
+        password = password_core.generate_template(template, excluded, self.blocklist)
+        metrics.PASSWORDS.inc(('generate',))
+        return password
+    
+    def template_entropy(self, template, exclude_chars='', exclude_presets=()):
+        """
+        Exact entropy of a template in bits, and the bits its exclusions remove
+        """
+        bits = password_core.compile_template(template, exclusion_set(exclude_chars, exclude_presets)).bits
+        removed = password_core.compile_template(template).bits - bits
+        return round(bits, 1), round(removed, 1)
+    
+    def entropy_removed(self, length=12, use_uppercase=True, use_lowercase=True,
+                        use_numbers=True, use_symbols=True, exclude_chars='',
+                        enforce_rules=True, exclude_presets=()):
+        """
+        Bits of entropy the exclusions take away from a password of these options
+        """
+        try:
+            policy = PasswordPolicy(length, use_uppercase, use_lowercase, use_numbers,
+                                    use_symbols, exclude_chars, enforce_rules, exclude_presets)
+            return round(policy.validate().excluded_bits(length), 1)
+        except ValueError:
+            return 0.0
+    
     def calculate_strength(self, password):
         """
         Calculate password strength
         """
         if password.startswith("Error:"):
             return "None"
-            
-        score = 0
-        
-        # Length score
-        if len(password) >= 8: score += 1
-        if len(password) >= 12: score += 1
-        if len(password) >= 16: score += 1
-        
-        # Character variety score
-        if any(c.islower() for c in password): score += 1
-        if any(c.isupper() for c in password): score += 1
-        if any(c.isdigit() for c in password): score += 1
-        if any(not c.isalnum() for c in password): score += 1
-        
-        # Determine strength
-        if score <= 2: return "Weak"
-        elif score <= 4: return "Fair"
-        elif score <= 6: return "Good"
-        else: return "Strong"
-
-# Initialize password generator
-pwd_generator = PasswordGenerator()
+        if metrics.sample():
+            start = perf_counter()
+            label = score_password(password).label
+            metrics.STAGE_SECONDS.observe(perf_counter() - start, ('score',))
+            return label
+        return score_password(password).label
+    
+    def calculate_entropy(self, password):
+        """
+        Estimate password entropy in bits
+        """
+        if password.startswith("Error:"):
+            return 0.0
+        return round(estimate_entropy(password).bits, 1)
+
+def request_options(data):
+    """Map /generate payload fields onto PasswordGenerator keyword arguments"""
+    return {
+        'length': data.get('length', 12),
+        'use_uppercase': data.get('uppercase', True),
+        'use_lowercase': data.get('lowercase', True),
+        'use_numbers': data.get('numbers', True),
+        'use_symbols': data.get('symbols', True),
+        'exclude_chars': data.get('exclude', ''),
+        'enforce_rules': data.get('enforce_rules', True),
+        'exclude_presets': data.get('exclude_presets', ())
+    }
+
+# Initialize password generator, rejecting breached passwords when
+# PASSWORD_BREACH_INDEX points at an index built with password_core.breach
+pwd_generator = PasswordGenerator(blocklist=load_breach_list())
+export_key = load_key(EXPORT_KEY_FILE) if EXPORT_KEY_FILE else None
+
+# Web UI, read and pre-compressed once at start-up
+STATIC_ASSETS = load_assets()
+
+def static_response(path):
+    """Serve a pre-compressed asset, answering conditional GETs with 304"""
+    asset = STATIC_ASSETS[path]
+    encoding, body, etag = asset.select(lambda name: request.accept_encodings[name] > 0)
+    headers = {
+        'ETag': etag,
+        'Cache-Control': asset.cache_control,
+        'Vary': 'Accept-Encoding',
+    }
+    if encoding != 'identity':
+        headers['Content-Encoding'] = encoding
+    if request.if_none_match.contains_weak(etag.strip('"')):
+        return Response(status=304, headers=headers)
+    return Response(body, content_type=asset.content_type, headers=headers)
 
 @app.route('/')
 def index():
     """Render the main page"""
-    return """
-    <!DOCTYPE html>
-    <html lang="en">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>Python Password Generator</title>
-        <style>
-            * {
-                margin: 0;
-                padding: 0;
-                box-sizing: border-box;
-            }
-            body {
-                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                min-height: 100vh;
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                padding: 20px;
-            }
-            .container {
-                background: white;
-                border-radius: 15px;
-                box-shadow: 0 10px 30px rgba(0, 0, 0, 0.2);
-                padding: 30px;
-                max-width: 500px;
-                width: 100%;
-            }
-            header {
-                text-align: center;
-                margin-bottom: 30px;
-            }
-            header h1 {
-                color: #333;
-                margin-bottom: 10px;
-                font-size: 2rem;
-            }
-            header p {
-                color: #666;
-                font-size: 1rem;
-            }
-            .password-display {
-                display: flex;
-                margin-bottom: 25px;
-                gap: 10px;
-            }
-            #password-output {
-                flex: 1;
-                padding: 15px;
-                border: 2px solid #ddd;
-                border-radius: 8px;
-                font-size: 1.1rem;
-                font-family: 'Courier New', monospace;
-                background: #f9f9f9;
-            }
-            button {
-                padding: 15px 20px;
-                background: #4CAF50;
-                color: white;
-                border: none;
-                border-radius: 8px;
-                cursor: pointer;
-                font-size: 1rem;
-                transition: background 0.3s;
-            }
-            button:hover {
-                background: #45a049;
-            }
-            .controls {
-                margin-bottom: 25px;
-            }
-            .form-group {
-                margin-bottom: 15px;
-            }
-            label {
-                display: block;
-                margin-bottom: 5px;
-                font-weight: 600;
-                color: #333;
-            }
-            input[type="range"], input[type="text"] {
-                width: 100%;
-                padding: 10px;
-                border: 2px solid #ddd;
-                border-radius: 5px;
-            }
-            .checkbox-group {
-                display: flex;
-                flex-direction: column;
-                gap: 10px;
-            }
-            .checkbox-group label {
-                display: flex;
-                align-items: center;
-                gap: 10px;
-                font-weight: normal;
-                cursor: pointer;
-            }
-            .strength-bar {
-                height: 10px;
-                background: #ddd;
-                border-radius: 5px;
-                overflow: hidden;
-                margin-top: 10px;
-            }
-            .strength-indicator {
-                height: 100%;
-                width: 0%;
-                transition: all 0.3s ease;
-                border-radius: 5px;
-            }
-            .strength-weak { background: #ff4757; width: 25%; }
-            .strength-fair { background: #ffa502; width: 50%; }
-            .strength-good { background: #2ed573; width: 75%; }
-            .strength-strong { background: #1e90ff; width: 100%; }
-            .generate-btn {
-                width: 100%;
-                padding: 15px;
-                background: #007bff;
-                color: white;
-                border: none;
-                border-radius: 8px;
-                font-size: 1.1rem;
-                font-weight: 600;
-                cursor: pointer;
-                margin-top: 10px;
-            }
-            .generate-btn:hover {
-                background: #0056b3;
-            }
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <header>
-                <h1>🐍 Python Password Generator</h1>
-                <p>Powered by Flask - Running on Localhost</p>
-            </header>
-
-            <div class="password-display">
-                <input type="text" id="password-output" readonly value="Click Generate to create a password">
-                <button onclick="copyToClipboard()">📋 Copy</button>
-            </div>
-
-            <div class="controls">
-                <div class="form-group">
-                    <label for="length">Password Length: <span id="length-value">12</span></label>
-                    <input type="range" id="length" name="length" min="4" max="50" value="12" oninput="updateLengthValue(this.value)">
-                </div>
-
-                <div class="form-group">
-                    <label>Character Types:</label>
-                    <div class="checkbox-group">
-                        <label><input type="checkbox" id="uppercase" checked> Uppercase Letters (A-Z)</label>
-                        <label><input type="checkbox" id="lowercase" checked> Lowercase Letters (a-z)</label>
-                        <label><input type="checkbox" id="numbers" checked> Numbers (0-9)</label>
-                        <label><input type="checkbox" id="symbols" checked> Symbols (!@#$%^&*)</label>
-                    </div>
-                </div>
-
-                <div class="form-group">
-                    <label for="exclude">Exclude Characters:</label>
-                    <input type="text" id="exclude" placeholder="e.g., 0O1l">
-                </div>
-
-                <button class="generate-btn" onclick="generatePassword()">Generate Password</button>
-            </div>
-
-            <div class="form-group">
-                <label>Password Strength: <span id="strength-text">-</span></label>
-                <div class="strength-bar">
-                    <div id="strength-indicator" class="strength-indicator"></div>
-                </div>
-            </div>
-        </div>
-
-        <script>
-            function updateLengthValue(value) {
-                document.getElementById('length-value').textContent = value;
-            }
-
-            function generatePassword() {
-                const length = document.getElementById('length').value;
-                const uppercase = document.getElementById('uppercase').checked;
-                const lowercase = document.getElementById('lowercase').checked;
-                const numbers = document.getElementById('numbers').checked;
-                const symbols = document.getElementById('symbols').checked;
-                const exclude = document.getElementById('exclude').value;
-
-                // Send request to Flask backend
-                fetch('/generate', {
-                    method: 'POST',
-                    headers: {
-                        'Content-Type': 'application/json',
-                    },
-                    body: JSON.stringify({
-                        length: parseInt(length),
-                        uppercase: uppercase,
-                        lowercase: lowercase,
-                        numbers: numbers,
-                        symbols: symbols,
-                        exclude: exclude
-                    })
-                })
-                .then(response => response.json())
-                .then(data => {
-                    document.getElementById('password-output').value = data.password;
-                    updateStrengthIndicator(data.strength);
-                })
-                .catch(error => {
-                    console.error('Error:', error);
-                    document.getElementById('password-output').value = 'Error generating password';
-                });
-            }
-
-            function updateStrengthIndicator(strength) {
-                const strengthLabels = {
-                    'None': { text: 'None', class: '' },
-                    'Weak': { text: 'Weak', class: 'strength-weak' },
-                    'Fair': { text: 'Fair', class: 'strength-fair' },
-                    'Good': { text: 'Good', class: 'strength-good' },
-                    'Strong': { text: 'Strong', class: 'strength-strong' }
-                };
-
-                const strengthInfo = strengthLabels[strength] || strengthLabels['None'];
-                document.getElementById('strength-text').textContent = strengthInfo.text;
-                document.getElementById('strength-indicator').className = 'strength-indicator ' + strengthInfo.class;
-            }
-
-            function copyToClipboard() {
-                const passwordField = document.getElementById('password-output');
-                passwordField.select();
-                document.execCommand('copy');
-                
-                // Visual feedback
-                const copyBtn = event.target;
-                const originalText = copyBtn.textContent;
-                copyBtn.textContent = '✓ Copied!';
-                copyBtn.style.background = '#28a745';
-                
-                setTimeout(() => {
-                    copyBtn.textContent = originalText;
-                    copyBtn.style.background = '';
-                }, 2000);
-            }
-
-            // Generate initial password on page load
-            window.onload = generatePassword;
-        </script>
-    </body>
-    </html>
-    """
+    return static_response('/')
+
+@app.route('/style.css')
+def stylesheet():
+    return static_response('/style.css')
+
+@app.route('/script.js')
+def script():
+    return static_response('/script.js')
+
+# Per-client request and password quotas, configured by PASSWORD_RATE_*
+rate_limiter = rate_limiter_from_env()
+
+# Endpoints that generate passwords -> (metrics label, whether the payload's count is charged)
+RATE_LIMITED_ENDPOINTS = {
+    'generate_password': ('generate', False),
+    'generate_password_batch': ('batch', True),
+    'generate_password_stream': ('stream', True),
+    'generate_password_export': ('export', True),
+    'analyze_passwords': ('analyze', False),
+}
+
+# Endpoint name -> metrics label for request timing; streamed responses are
+# only timed up to the first byte, so they are left out
+TIMED_ENDPOINTS = {
+    'generate_password': 'generate',
+    'generate_password_batch': 'batch',
+}
+
+# Local requests carrying this header are profiled even when PASSWORD_PROFILE is off
+PROFILE_HEADER = 'X-Password-Profile'
+TRUSTED_ADDRESSES = ('127.0.0.1', '::1')
+
+def is_trusted_local():
+    return request.remote_addr in TRUSTED_ADDRESSES
+
+@app.before_request
+def start_request_timer():
+    g.request_start = perf_counter()
+    if profiling.ENABLED or (PROFILE_HEADER in request.headers and is_trusted_local()):
+        g.profile = profiling.profiler.start(request.path)
+
+def json_object():
+    """The request's JSON body if it is an object, otherwise None"""
+    data = request.get_json(silent=True)
+    return data if isinstance(data, dict) else None
+
+@app.before_request
+def check_rate_limit():
+    """Refuse requests over the client's quota with 429 rather than queueing them"""
+    if rate_limiter is None or request.endpoint not in RATE_LIMITED_ENDPOINTS:
+        return None
+    label, charge_count = RATE_LIMITED_ENDPOINTS[request.endpoint]
+    passwords = 1
+    if charge_count:
+        data = json_object()
+        count = data.get('count', 1) if data is not None else 1
+        # Out-of-range counts are rejected by the route itself
+        if isinstance(count, int) and 1 < count <= MAX_STREAM_COUNT:
+            passwords = count
+    try:
+        wait = rate_limiter.check(request.remote_addr or '', passwords)
+    except ValueError as e:
+        metrics.RATE_LIMITED.inc((label,))
+        return jsonify({'error': str(e)}), 429
+    if wait:
+        metrics.RATE_LIMITED.inc((label,))
+        return (jsonify({'error': 'Rate limit exceeded'}), 429,
+                {'Retry-After': str(max(1, math.ceil(wait)))})
+    return None
+
+@app.teardown_request
+def stop_request_profile(exc):
+    profile = g.pop('profile', None)
+    if profile is not None:
+        profiling.profiler.stop(profile)
+
+@app.after_request
+def record_request_time(response):
+    endpoint = TIMED_ENDPOINTS.get(request.endpoint)
+    if endpoint is not None:
+        metrics.REQUEST_SECONDS.observe(perf_counter() - g.request_start, (endpoint,))
+    return response
+
+@app.route('/metrics')
+def export_metrics():
+    """Expose counters and timings in the Prometheus text format"""
+    return Response(metrics.render(), mimetype=metrics.CONTENT_TYPE)
+
+@app.route('/debug/profiles')
+def export_profiles():
+    """Collapsed stacks of the slowest profiled requests (local requests only)"""
+    if not is_trusted_local():
+        return jsonify({'error': 'Profiles are only available locally'}), 403
+    return Response(profiling.profiler.collapsed(), mimetype='text/plain')
 
 @app.route('/generate', methods=['POST'])
 def generate_password():
     """Generate password based on user input"""
     data = request.json
     
-    password = pwd_generator.generate_password(
-        length=data.get('length', 12),
-        use_uppercase=data.get('uppercase', True),
-        use_lowercase=data.get('lowercase', True),
-        use_numbers=data.get('numbers', True),
-        use_symbols=data.get('symbols', True),
-        exclude_chars=data.get('exclude', '')
-    )
+    mode = data.get('mode', 'password')
+    if mode == 'passphrase':
+        return generate_passphrase(data)
+    if mode == 'template':
+        return generate_from_template(data)
+    
+    options = request_options(data)
+    password = pwd_generator.generate_password(**options)
     
     strength = pwd_generator.calculate_strength(password)
+    entropy = pwd_generator.calculate_entropy(password)
     
     return jsonify({
         'password': password,
-        'strength': strength
+        'strength': strength,
+        'entropy': entropy,
+        'entropy_removed': pwd_generator.entropy_removed(**options)
+    })
+
+def generate_passphrase(data):
+    """Handle /generate requests in passphrase mode"""
+    try:
+        result = pwd_generator.generate_passphrase(
+            words=data.get('words', 6),
+            separator=data.get('separator', '-'),
+            capitalize=data.get('capitalize', False),
+            digits=data.get('digits', 0)
+        )
+    except ValueError as e:
+        metrics.ERRORS.inc(('generate',))
+        return jsonify({'password': f"Error: {e}", 'strength': "None", 'entropy': 0.0})
+    
+    return jsonify({
+        'password': result.passphrase,
+        'strength': pwd_generator.calculate_strength(result.passphrase),
+        'entropy': round(result.bits, 1),
+        'entropy_per_word': round(result.bits_per_word, 2)
     })
 
+def generate_from_template(data):
+    """Handle /generate requests in template mode"""
+    template = data.get('template', '')
+    exclude = data.get('exclude', '')
+    presets = data.get('exclude_presets', ())
+    try:
+        password = pwd_generator.generate_template(template, exclude, presets)
+        entropy, removed = pwd_generator.template_entropy(template, exclude, presets)
+    except ValueError as e:
+        metrics.ERRORS.inc(('generate',))
+        return jsonify({'password': f"Error: {e}", 'strength': "None", 'entropy': 0.0})
+    
+    return jsonify({
+        'password': password,
+        'strength': pwd_generator.calculate_strength(password),
+        'entropy': entropy,
+        'entropy_removed': removed
+    })
+
+@app.route('/generate/batch', methods=['POST'])
+def generate_password_batch():
+    """Generate a batch of passwords in a single request"""
+    data = json_object()
+    if data is None:
+        return jsonify({'error': 'Request body must be a JSON object'}), 400
+    count = data.get('count', 1)
+    
+    if not isinstance(count, int) or not 1 <= count <= MAX_BATCH_COUNT:
+        return jsonify({
+            'error': f'count must be an integer between 1 and {MAX_BATCH_COUNT}'
+        }), 400
+    
+    try:
+        passwords = pwd_generator.generate_many(count, **request_options(data))
+    except ValueError as e:
+        metrics.ERRORS.inc(('batch',))
+        return jsonify({'error': str(e)}), 400
+    
+    response = {
+        'passwords': passwords,
+        'count': len(passwords)
+    }
+    if data.get('include_strength', False):
+        response['strengths'] = [pwd_generator.calculate_strength(p) for p in passwords]
+    
+    return jsonify(response)
+
+@app.route('/generate/stream', methods=['POST'])
+def generate_password_stream():
+    """Stream passwords as NDJSON or CSV lines while they are generated"""
+    data = json_object()
+    if data is None:
+        return jsonify({'error': 'Request body must be a JSON object'}), 400
+    count = data.get('count', 1)
+    output_format = data.get('format', 'ndjson')
+    include_strength = data.get('include_strength', False)
+    
+    if not isinstance(count, int) or not 1 <= count <= MAX_STREAM_COUNT:
+        return jsonify({
+            'error': f'count must be an integer between 1 and {MAX_STREAM_COUNT}'
+        }), 400
+    if output_format not in ('ndjson', 'csv'):
+        return jsonify({'error': "format must be 'ndjson' or 'csv'"}), 400
+    
+    try:
+        chunks = pwd_generator.iter_many(count, **request_options(data))
+    except ValueError as e:
+        metrics.ERRORS.inc(('stream',))
+        return jsonify({'error': str(e)}), 400
+    
+    def ndjson_lines():
+        for chunk in chunks:
+            if include_strength:
+                yield ''.join(
+                    json.dumps({'password': p, 'strength': pwd_generator.calculate_strength(p)}) + '\n'
+                    for p in chunk
+                )
+            else:
+                yield ''.join(json.dumps({'password': p}) + '\n' for p in chunk)
+    
+    def csv_lines():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+        writer.writerow(['password', 'strength'] if include_strength else ['password'])
+        yield buffer.getvalue()
+        for chunk in chunks:
+            buffer.seek(0)
+            buffer.truncate()
+            if include_strength:
+                writer.writerows((p, pwd_generator.calculate_strength(p)) for p in chunk)
+            else:
+                writer.writerows((p,) for p in chunk)
+            yield buffer.getvalue()
+    
+    if output_format == 'csv':
+        body, mimetype = csv_lines(), 'text/csv'
+    else:
+        body, mimetype = ndjson_lines(), 'application/x-ndjson'
+    
+    return Response(stream_with_context(body), mimetype=mimetype)
+
+@app.route('/generate/export', methods=['POST'])
+def generate_password_export():
+    """Send passwords as text lines, fixed-width records or a binary file, optionally encrypted"""
+    data = json_object()
+    if data is None:
+        return jsonify({'error': 'Request body must be a JSON object'}), 400
+    count = data.get('count', 1)
+    output_format = data.get('format', 'fixed')
+    encrypt = data.get('encrypt', False)
+    
+    if not isinstance(count, int) or not 1 <= count <= MAX_STREAM_COUNT:
+        return jsonify({
+            'error': f'count must be an integer between 1 and {MAX_STREAM_COUNT}'
+        }), 400
+    if output_format not in EXPORT_FORMATS:
+        return jsonify({'error': f"format must be one of {', '.join(EXPORT_FORMATS)}"}), 400
+    length = data.get('length', 12)
+    if isinstance(length, int) and length > MAX_EXPORT_LENGTH:
+        return jsonify({'error': f'length must be at most {MAX_EXPORT_LENGTH} for exports'}), 400
+    if isinstance(length, int) and count * length > MAX_EXPORT_BYTES:
+        return jsonify({
+            'error': f'count * length must be at most {MAX_EXPORT_BYTES} bytes'
+        }), 400
+    if encrypt and export_key is None:
+        return jsonify({'error': 'Encrypted export is not configured on this server'}), 400
+    
+    try:
+        result = pwd_generator.generate_bulk(count, **request_options(data))
+    except ValueError as e:
+        metrics.ERRORS.inc(('export',))
+        return jsonify({'error': str(e)}), 400
+    
+    headers = {
+        'Content-Disposition': f'attachment; filename=passwords.{"enc" if encrypt else output_format}',
+        'X-Record-Length': str(result.length),
+    }
+    blocks = result.iter_export(output_format)
+    if encrypt:
+        # Encrypted a segment at a time, so only one is in memory
+        body, content_type = iter_encrypted(blocks, export_key), 'application/octet-stream'
+    else:
+        # WSGI servers want bytes, so each block is copied once on its way out
+        body, content_type = (bytes(block) for block in blocks), EXPORT_CONTENT_TYPES[output_format]
+    response = Response(body, content_type=content_type, headers=headers)
+    # Runs even when the client goes away before the first block: let go of
+    # the current slice, then free the shared memory
+    response.call_on_close(blocks.close)
+    response.call_on_close(result.close)
+    return response
+
+@app.route('/analyze', methods=['POST'])
+def analyze_passwords():
+    """Score an uploaded password list, streaming per-line results and a running summary"""
+    if request.mimetype == 'multipart/form-data':
+        # Werkzeug spools large uploads to a temporary file
+        upload = request.files.get('file')
+        if upload is None:
+            return jsonify({'error': "multipart uploads must include a 'file' field"}), 400
+        # Take the file over: Flask closes uploads when the view returns,
+        # before the streamed response has read them
+        stream, upload.stream = upload.stream, io.BytesIO()
+    else:
+        stream = request.stream
+    
+    def ndjson_lines():
+        summary = None
+        try:
+            for text, summary in audit(stream, AUDIT_WORKERS):
+                yield text
+                yield summary_line(summary)
+        finally:
+            stream.close()
+        yield summary_line(summary or AuditSummary(), final=True)
+    
+    return Response(stream_with_context(ndjson_lines()), mimetype='application/x-ndjson')
+
 if __name__ == '__main__':
     print("Starting Python Password Generator...")
     print("Open your browser and go to: http://localhost:5000")
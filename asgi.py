@@ -0,0 +1,183 @@
+"""
+Asyncio (ASGI) serving mode for the password generator API.
+
+Serves the same POST /generate payload as app.py, but answers from
+pre-generated password pools that a background task keeps topped up, so the
+request path is normally a single pop. Passphrase and template modes are
+generated per request. Pool sizes and hit rates are exposed on
+GET /pool/metrics.
+
+Run with any ASGI server, e.g.::
+
+    uvicorn asgi:app --port 5000
+"""
+import json
+import os
+
+import password_core
+from password_core import PasswordPolicy, exclusion_set, score_password
+from password_core.breach import load_breach_list
+from password_core.pool import (
+    DEFAULT_HIGH_WATERMARK,
+    DEFAULT_LOW_WATERMARK,
+    DEFAULT_MAX_AGE,
+    DEFAULT_MAX_POOL_LENGTH,
+    PoolManager,
+)
+from password_core.sources import lock_to_system
+
+# Served passwords always come from the OS CSPRNG
+lock_to_system()
+
+pool_manager = PoolManager(
+    low_watermark=int(os.environ.get('PASSWORD_POOL_LOW', DEFAULT_LOW_WATERMARK)),
+    high_watermark=int(os.environ.get('PASSWORD_POOL_HIGH', DEFAULT_HIGH_WATERMARK)),
+    max_age=float(os.environ.get('PASSWORD_POOL_MAX_AGE', DEFAULT_MAX_AGE)),
+    max_length=int(os.environ.get('PASSWORD_POOL_MAX_LENGTH', DEFAULT_MAX_POOL_LENGTH)),
+    blocklist=load_breach_list(),
+)
+
+# The web UI's default settings are by far the most common request
+pool_manager.add_policy(PasswordPolicy())
+
+MAX_BODY_SIZE = 64 * 1024
+
+
+async def app(scope, receive, send):
+    """ASGI entry point"""
+    if scope['type'] == 'lifespan':
+        await lifespan(receive, send)
+    elif scope['type'] == 'http':
+        await handle_http(scope, receive, send)
+
+
+async def lifespan(receive, send):
+    """Start the pool refill task on startup and wipe the pools on shutdown"""
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            pool_manager.start()
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await pool_manager.stop()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def handle_http(scope, receive, send):
+    method = scope['method']
+    path = scope['path']
+
+    if path == '/generate' and method == 'POST':
+        body = await read_body(receive)
+        if body is None:
+            await send_json(send, {'error': 'Request body too large'}, 413)
+            return
+        try:
+            data = json.loads(body or b'{}')
+        except ValueError:
+            await send_json(send, {'error': 'Request body must be JSON'}, 400)
+            return
+        if not isinstance(data, dict):
+            await send_json(send, {'error': 'Request body must be a JSON object'}, 400)
+            return
+        await send_json(send, generate(data))
+    elif path == '/pool/metrics' and method == 'GET':
+        await send_json(send, pool_manager.metrics())
+    else:
+        await send_json(send, {'error': 'Not found'}, 404)
+
+
+def generate(data):
+    """Generate password based on user input, same response as app.py"""
+    mode = data.get('mode', 'password')
+    if mode == 'passphrase':
+        return generate_passphrase(data)
+    if mode == 'template':
+        return generate_from_template(data)
+    try:
+        policy = PasswordPolicy.from_json(data)
+        password = pool_manager.get(policy)
+    except ValueError as e:
+        return {'password': f"Error: {e}", 'strength': "None", 'entropy': 0.0}
+
+    strength = score_password(password)
+    return {
+        'password': password,
+        'strength': strength.label,
+        'entropy': round(strength.bits, 1),
+        'entropy_removed': round(policy.validate().excluded_bits(policy.length), 1)
+    }
+
+
+def generate_passphrase(data):
+    """Passphrases are cheap to draw and rarely repeat a setting, so they skip the pools"""
+    try:
+        result = password_core.generate_passphrase(
+            words=data.get('words', 6),
+            separator=data.get('separator', '-'),
+            capitalize=data.get('capitalize', False),
+            digits=data.get('digits', 0)
+        )
+    except ValueError as e:
+        return {'password': f"Error: {e}", 'strength': "None", 'entropy': 0.0}
+
+    return {
+        'password': result.passphrase,
+        'strength': score_password(result.passphrase).label,
+        'entropy': round(result.bits, 1),
+        'entropy_per_word': round(result.bits_per_word, 2)
+    }
+
+
+def generate_from_template(data):
+    """Templates are compiled once and cached, but not pooled"""
+    template = data.get('template', '')
+    try:
+        excluded = exclusion_set(data.get('exclude', ''), data.get('exclude_presets', ()))
+        compiled = password_core.compile_template(template, excluded)
+        password = password_core.generate_template(template, excluded, pool_manager.blocklist)
+        removed = password_core.compile_template(template).bits - compiled.bits
+    except ValueError as e:
+        return {'password': f"Error: {e}", 'strength': "None", 'entropy': 0.0}
+
+    return {
+        'password': password,
+        'strength': score_password(password).label,
+        'entropy': round(compiled.bits, 1),
+        'entropy_removed': round(removed, 1)
+    }
+
+
+async def read_body(receive):
+    """Read the whole request body, or return None if it exceeds MAX_BODY_SIZE"""
+    body = bytearray()
+    while True:
+        message = await receive()
+        body += message.get('body', b'')
+        if len(body) > MAX_BODY_SIZE:
+            return None
+        if not message.get('more_body', False):
+            return bytes(body)
+
+
+async def send_json(send, payload, status=200):
+    body = json.dumps(payload).encode('utf-8')
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(body)).encode('ascii')),
+            (b'cache-control', b'no-store'),
+        ],
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+if __name__ == '__main__':
+    try:
+        import uvicorn
+    except ImportError:
+        raise SystemExit("The asyncio server mode needs an ASGI server: pip install uvicorn")
+    uvicorn.run(app, host='127.0.0.1', port=5000)
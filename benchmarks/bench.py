@@ -0,0 +1,255 @@
+"""
+Local benchmark suite for password generation, scoring and the HTTP routes.
+
+Measures ops/sec and transient allocation per operation over a grid of
+lengths, charsets and exclusion sets, latency percentiles of the Flask
+routes through the test client, and CLI start-up time. Results are written
+as JSON and can be compared against a saved baseline:
+
+    python benchmarks/bench.py --output baseline.json
+    # ... make changes ...
+    python benchmarks/bench.py --output current.json --baseline baseline.json --threshold 0.10
+
+The comparison exits with status 1 if any benchmark's ops/sec dropped by
+more than the threshold (or a latency percentile rose by more than it).
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# The HTTP benchmarks send far more requests than a client's quota allows
+os.environ.setdefault('PASSWORD_RATE_LIMIT', '0')
+
+import password_core
+from password_core import PasswordPolicy, compile_policy, generate_secure_password, score_password
+
+LENGTHS = (8, 16, 64, 256)
+
+# name -> PasswordPolicy keyword arguments
+CHARSETS = {
+    'full': {},
+    'alnum': {'use_symbols': False},
+    'lower': {'use_uppercase': False, 'use_numbers': False, 'use_symbols': False},
+    'digits': {'use_uppercase': False, 'use_lowercase': False, 'use_symbols': False},
+}
+
+EXCLUSIONS = {
+    'none': '',
+    'ambiguous': '0O1lI|',
+    'heavy': 'ABCDEFGHIJKLMabcdefghijklm01234!@#$%',
+}
+
+
+def measure(func, min_time):
+    """
+    Return (ops/sec, mean transient bytes allocated per call)
+    """
+    # Warm up and size the loop so one round takes about min_time
+    func()
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        loops *= 2 if elapsed < min_time / 10 else 1 + int(min_time / max(elapsed, 1e-9))
+
+    # Best of three rounds is the least noisy estimate
+    best = elapsed
+    for _ in range(2):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        best = min(best, time.perf_counter() - start)
+
+    samples = min(loops, 50)
+    tracemalloc.start()
+    total = 0
+    for _ in range(samples):
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        func()
+        total += tracemalloc.get_traced_memory()[1] - current
+    tracemalloc.stop()
+
+    return loops / best, total / samples
+
+
+def bench_generation(results, min_time):
+    from app import PasswordGenerator
+    adapter = PasswordGenerator()
+
+    for charset_name, options in CHARSETS.items():
+        for exclusion_name, exclude in EXCLUSIONS.items():
+            compiled = compile_policy(exclude_chars=exclude, **options)
+            if compiled.size == 0:
+                continue
+            for length in LENGTHS:
+                suffix = f'{charset_name}/{exclusion_name}/len={length}'
+                policy = PasswordPolicy(length=length, exclude_chars=exclude, enforce_rules=False, **options)
+                rules_policy = PasswordPolicy(length=length, exclude_chars=exclude, **options)
+                cases = {
+                    'generate_password': lambda: adapter.generate_password(
+                        length, exclude_chars=exclude, enforce_rules=False, **options),
+                    'generate_secure_password': lambda: generate_secure_password(compiled, length),
+                    'core.generate_password[rules]': lambda: password_core.generate_password(rules_policy),
+                    'core.generate_many[1000]': lambda: password_core.generate_many(policy, 1000),
+                    'core.generate_many[rules][1000]': lambda: password_core.generate_many(rules_policy, 1000),
+                }
+                for name, func in cases.items():
+                    ops, alloc = measure(func, min_time)
+                    per_password = 1000 if name.endswith('[1000]') else 1
+                    record(results, f'{name}/{suffix}', ops * per_password, alloc / per_password)
+
+
+def bench_scoring(results, min_time):
+    from app import PasswordGenerator
+    adapter = PasswordGenerator()
+
+    for length in LENGTHS:
+        sample = password_core.generate_password(PasswordPolicy(length=length))
+        for name, func in {
+            'calculate_strength': lambda: adapter.calculate_strength(sample),
+            'score_password': lambda: score_password(sample),
+        }.items():
+            ops, alloc = measure(func, min_time)
+            record(results, f'{name}/len={length}', ops, alloc)
+
+
+def bench_http(results, requests):
+    try:
+        from app import app
+    except ImportError as e:
+        print(f"skipping HTTP benchmarks: {e}", file=sys.stderr)
+        return
+
+    client = app.test_client()
+    for name, path, payload in (
+        ('http /generate', '/generate', {}),
+        ('http /generate[rules=off]', '/generate', {'enforce_rules': False, 'length': 32}),
+        ('http /generate/batch[100]', '/generate/batch', {'count': 100}),
+    ):
+        client.post(path, json=payload)
+        latencies = []
+        for _ in range(requests):
+            start = time.perf_counter()
+            response = client.post(path, json=payload)
+            latencies.append(time.perf_counter() - start)
+            assert response.status_code == 200, response.data
+        latencies.sort()
+        results[name] = {
+            'ops_per_sec': len(latencies) / sum(latencies),
+            'p50_ms': percentile(latencies, 50) * 1e3,
+            'p90_ms': percentile(latencies, 90) * 1e3,
+            'p99_ms': percentile(latencies, 99) * 1e3,
+        }
+        print_result(name, results[name])
+
+
+def bench_cli_startup(results, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-m', 'password_core'], cwd=ROOT,
+                       stdout=subprocess.DEVNULL, check=True)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    results['cli startup'] = {
+        'ops_per_sec': 1 / percentile(timings, 50),
+        'p50_ms': percentile(timings, 50) * 1e3,
+        'p90_ms': percentile(timings, 90) * 1e3,
+    }
+    print_result('cli startup', results['cli startup'])
+
+
+def percentile(sorted_values, pct):
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def record(results, name, ops, alloc):
+    results[name] = {'ops_per_sec': ops, 'alloc_bytes_per_op': alloc}
+    print_result(name, results[name])
+
+
+def print_result(name, result):
+    details = '  '.join(f'{key}={value:,.1f}' for key, value in result.items())
+    print(f'{name:<60} {details}')
+
+
+def compare(results, baseline, threshold):
+    """
+    Return the list of regressions against a baseline results dict
+    """
+    regressions = []
+    for name, base in baseline.items():
+        current = results.get(name)
+        if current is None:
+            continue
+        if current['ops_per_sec'] < base['ops_per_sec'] * (1 - threshold):
+            regressions.append(f"{name}: {base['ops_per_sec']:,.0f} -> {current['ops_per_sec']:,.0f} ops/sec")
+        for key in ('p50_ms', 'p99_ms'):
+            if key in base and key in current and current[key] > base[key] * (1 + threshold):
+                regressions.append(f"{name}: {key} {base[key]:.3f} -> {current[key]:.3f}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the password generator benchmarks")
+    parser.add_argument('--output', '-o', help="write results to this JSON file")
+    parser.add_argument('--baseline', help="compare against a previous results file")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="allowed relative slowdown before failing (default 0.10)")
+    parser.add_argument('--min-time', type=float, default=0.2,
+                        help="seconds per timing round (default 0.2)")
+    parser.add_argument('--requests', type=int, default=500,
+                        help="requests per HTTP benchmark (default 500)")
+    parser.add_argument('--only', choices=('generation', 'scoring', 'http', 'cli'), action='append',
+                        help="run only these groups (repeatable)")
+    args = parser.parse_args(argv)
+
+    groups = args.only or ('generation', 'scoring', 'http', 'cli')
+    results = {}
+    if 'generation' in groups:
+        bench_generation(results, args.min_time)
+    if 'scoring' in groups:
+        bench_scoring(results, args.min_time)
+    if 'http' in groups:
+        bench_http(results, args.requests)
+    if 'cli' in groups:
+        bench_cli_startup(results, 20)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'timestamp': time.time(),
+                'results': results,
+            }, f, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nNo regressions beyond {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
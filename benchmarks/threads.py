@@ -0,0 +1,144 @@
+"""
+Multi-threaded stress test for the default generation path.
+
+Generates passwords from 1, 2, 4, ... threads at once and checks that
+every password is valid for its policy and that no password repeats across
+threads, then reports throughput and speed-up over one thread. The engine
+is run with the per-thread CSPRNG buffers (sources.random_bytes) and with
+direct os.urandom calls, and the Flask adapter (metrics included) on top of
+it. A forked child must not see its parent's buffered bytes either.
+
+    python benchmarks/threads.py --threads 1,2,4,8 --passwords 20000
+
+Under a GIL build the speed-up stays near 1x, since only one thread runs
+Python code at a time; on a free-threaded build (python3.13t and later) it
+should grow close to linearly with the thread count. Exits with status 1 if
+a correctness check fails.
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+os.environ.setdefault('PASSWORD_RATE_LIMIT', '0')
+
+from password_core import PasswordPolicy, generate_secure_password
+from password_core.sources import random_bytes
+
+
+def run_threads(threads, passwords, generate):
+    """
+    Call ``generate()`` ``passwords`` times in each of ``threads`` threads,
+    started together; returns (per-thread password lists, seconds)
+    """
+    results = [None] * threads
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(slot):
+        barrier.wait()
+        results[slot] = [generate() for _ in range(passwords)]
+
+    workers = [threading.Thread(target=worker, args=(slot,)) for slot in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    return results, time.perf_counter() - start
+
+
+def check(results, policy):
+    """
+    Return a list of problems: passwords breaking the policy's rules, or
+    passwords seen more than once
+    """
+    compiled = policy.validate()
+    charset = set(compiled.text)
+    problems = []
+    seen = set()
+    for thread, passwords in enumerate(results):
+        for password in passwords:
+            if len(password) != policy.length or not set(password) <= charset:
+                problems.append(f"thread {thread}: {password!r} is outside the policy")
+            elif any(not set(password) & set(chars) for chars in compiled.class_sets.values()):
+                problems.append(f"thread {thread}: {password!r} misses a character type")
+            elif any(a == b for a, b in zip(password, password[1:])):
+                problems.append(f"thread {thread}: {password!r} repeats a character")
+            if password in seen:
+                problems.append(f"thread {thread}: {password!r} was generated twice")
+            seen.add(password)
+    return problems
+
+
+def check_fork():
+    """
+    A child forked after the parent filled its buffer must draw different bytes
+    """
+    if not hasattr(os, 'fork'):
+        return []
+    random_bytes(16)
+    read_end, write_end = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_end)
+        os.write(write_end, random_bytes(32))
+        os._exit(0)
+    os.close(write_end)
+    child = os.read(read_end, 32)
+    os.close(read_end)
+    os.waitpid(pid, 0)
+    if child == random_bytes(32):
+        return ["forked child drew the same random bytes as its parent"]
+    return []
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stress the generator from many threads")
+    parser.add_argument('--threads', default='1,2,4,8',
+                        help="comma-separated thread counts (default 1,2,4,8)")
+    parser.add_argument('--passwords', type=int, default=20000,
+                        help="passwords per thread (default 20000)")
+    parser.add_argument('--length', type=int, default=16)
+    args = parser.parse_args(argv)
+
+    from app import PasswordGenerator
+    adapter = PasswordGenerator()
+    policy = PasswordPolicy(length=args.length)
+    compiled = policy.validate()
+    length = args.length
+    paths = {
+        'buffered': lambda: generate_secure_password(compiled, length),
+        'os.urandom': lambda: generate_secure_password(compiled, length, os.urandom),
+        'flask adapter': lambda: adapter.generate_password(length),
+    }
+
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil else 'disabled'}, "
+          f"{os.cpu_count()} CPUs, {args.passwords} passwords per thread")
+
+    problems = check_fork()
+    for name, generate in paths.items():
+        single = None
+        for threads in (int(n) for n in args.threads.split(',')):
+            results, elapsed = run_threads(threads, args.passwords, generate)
+            problems += check(results, policy)
+            rate = threads * args.passwords / elapsed
+            single = single or rate
+            print(f"{name:<14}{threads:>3} threads  {rate:>12,.0f} passwords/s  {rate / single:5.2f}x")
+
+    if problems:
+        print(f"\n{len(problems)} problem(s):")
+        for line in problems[:20]:
+            print(f"  {line}")
+        return 1
+    print("\nAll passwords valid and unique; forked child drew independent bytes")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,56 @@
+"""
+Core password generation and scoring shared by the Flask app and the GUI.
+"""
+from password_core.policy import (
+    CHARACTER_SETS,
+    EXCLUSION_PRESETS,
+    MIN_LENGTH,
+    CompiledPolicy,
+    PasswordPolicy,
+    compile_policy,
+    exclusion_set,
+)
+from password_core.engine import (
+    generate_many,
+    generate_password,
+    generate_secure_password,
+    iter_many,
+    resize_password,
+)
+from password_core.passphrase import Passphrase, generate_passphrase, passphrase_entropy
+from password_core.scoring import (
+    EntropyEstimate,
+    IncrementalScorer,
+    StrengthScore,
+    estimate_entropy,
+    score_password,
+    strength_label,
+)
+from password_core.template import CompiledTemplate, compile_template, generate_template
+
+__all__ = [
+    'CHARACTER_SETS',
+    'EXCLUSION_PRESETS',
+    'MIN_LENGTH',
+    'CompiledPolicy',
+    'CompiledTemplate',
+    'EntropyEstimate',
+    'IncrementalScorer',
+    'Passphrase',
+    'PasswordPolicy',
+    'StrengthScore',
+    'compile_policy',
+    'compile_template',
+    'estimate_entropy',
+    'exclusion_set',
+    'generate_many',
+    'generate_passphrase',
+    'generate_password',
+    'generate_secure_password',
+    'generate_template',
+    'iter_many',
+    'passphrase_entropy',
+    'resize_password',
+    'score_password',
+    'strength_label',
+]
@@ -0,0 +1,175 @@
+"""
+Streaming strength audit of existing password lists.
+
+Input is read in fixed-size blocks cut at line boundaries, so memory stays
+flat whatever the file size. Each block is scored as a unit, either inline
+or on a pool of worker processes (a bounded number of blocks in flight),
+and results come back in input order together with a running summary.
+
+Per-line results carry the line number, strength label and estimated
+entropy, never the password itself.
+"""
+from collections import deque
+import json
+
+from password_core.scoring import score_password
+
+DEFAULT_BLOCK_SIZE = 1 << 20
+
+# Longer lines are scored on their first MAX_LINE_LENGTH characters
+MAX_LINE_LENGTH = 4096
+# Bytes of a line kept while reading; enough for MAX_LINE_LENGTH characters of UTF-8
+MAX_LINE_BYTES = 4 * MAX_LINE_LENGTH
+
+# Upper bounds (bits) of the entropy histogram buckets; the last bucket is open
+ENTROPY_BUCKETS = (20, 40, 60, 80, 100, 128)
+
+OUTPUT_FORMATS = ('ndjson', 'tsv')
+
+LABELS = ('Weak', 'Fair', 'Good', 'Strong')
+
+
+class AuditSummary:
+    """
+    Running strength and entropy histogram of scored passwords
+    """
+    __slots__ = ('total', 'labels', 'entropy', 'bits')
+
+    def __init__(self):
+        self.total = 0
+        self.labels = dict.fromkeys(LABELS, 0)
+        self.entropy = [0] * (len(ENTROPY_BUCKETS) + 1)
+        self.bits = 0.0
+
+    def add(self, strength):
+        self.total += 1
+        self.labels[strength.label] += 1
+        self.bits += strength.bits
+        for index, bound in enumerate(ENTROPY_BUCKETS):
+            if strength.bits < bound:
+                self.entropy[index] += 1
+                break
+        else:
+            self.entropy[-1] += 1
+
+    def merge(self, other):
+        self.total += other.total
+        for label, count in other.labels.items():
+            self.labels[label] += count
+        for index, count in enumerate(other.entropy):
+            self.entropy[index] += count
+        self.bits += other.bits
+
+    def as_dict(self):
+        bounds = (0,) + ENTROPY_BUCKETS
+        histogram = {f'{low}-{high}': count for low, high, count in zip(bounds, bounds[1:], self.entropy)}
+        histogram[f'{ENTROPY_BUCKETS[-1]}+'] = self.entropy[-1]
+        return {
+            'total': self.total,
+            'strength': dict(self.labels),
+            'entropy_histogram': histogram,
+            'mean_entropy': round(self.bits / self.total, 1) if self.total else 0.0,
+        }
+
+
+def iter_blocks(stream, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    Read a binary stream in blocks of about ``block_size`` bytes that end on
+    a newline (except possibly the last). Lines longer than MAX_LINE_BYTES
+    are cut down to that many bytes, so every line lands in exactly one block.
+    """
+    carry = b''
+    while True:
+        data = stream.read(block_size)
+        if not data:
+            break
+        if carry:
+            data = carry + data
+        cut = data.rfind(b'\n')
+        if cut == -1:
+            # Still inside one line; only its head is ever scored, so keep
+            # that much and drop the rest rather than grow without bound
+            carry = data[:MAX_LINE_BYTES]
+            continue
+        yield data[:cut + 1]
+        carry = data[cut + 1:]
+    if carry:
+        yield carry
+
+
+def score_block(block, first_line, output_format='ndjson'):
+    """
+    Score every non-empty line of a block; returns (formatted results,
+    AuditSummary of the block)
+    """
+    summary = AuditSummary()
+    out = []
+    lines = block.decode('utf-8', 'replace').split('\n')
+    if lines[-1] == '':
+        lines.pop()
+    for line_number, password in enumerate(lines, first_line):
+        if password.endswith('\r'):
+            password = password[:-1]
+        if not password:
+            continue
+        strength = score_password(password[:MAX_LINE_LENGTH])
+        summary.add(strength)
+        if output_format == 'tsv':
+            out.append(f'{line_number}\t{strength.label}\t{strength.bits:.1f}\n')
+        else:
+            out.append(f'{{"line": {line_number}, "strength": "{strength.label}", '
+                       f'"entropy": {round(strength.bits, 1)}}}\n')
+    return ''.join(out), summary
+
+
+def audit(stream, workers=1, output_format='ndjson', block_size=DEFAULT_BLOCK_SIZE):
+    """
+    Score a binary stream of newline-separated passwords.
+
+    Yields (formatted results, running AuditSummary) for every block, in
+    input order. With ``workers`` > 1 blocks are scored in that many
+    processes, at most two blocks per worker in flight.
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Output format must be one of {', '.join(OUTPUT_FORMATS)}")
+    if workers < 1:
+        raise ValueError("Worker count must be at least 1")
+    if block_size < 1:
+        raise ValueError("Block size must be at least 1")
+
+    summary = AuditSummary()
+    line = 1
+    if workers == 1:
+        for block in iter_blocks(stream, block_size):
+            text, block_summary = score_block(block, line, output_format)
+            line += block.count(b'\n')
+            summary.merge(block_summary)
+            yield text, summary
+        return
+
+    # Imported here so that single-process audits and the CLI stay light
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(workers) as pool:
+        pending = deque()
+        for block in iter_blocks(stream, block_size):
+            pending.append(pool.submit(score_block, block, line, output_format))
+            line += block.count(b'\n')
+            if len(pending) >= 2 * workers:
+                text, block_summary = pending.popleft().result()
+                summary.merge(block_summary)
+                yield text, summary
+        while pending:
+            text, block_summary = pending.popleft().result()
+            summary.merge(block_summary)
+            yield text, summary
+
+
+def summary_line(summary, final=False):
+    """
+    NDJSON line carrying a summary
+    """
+    record = {'summary': summary.as_dict()}
+    if final:
+        record['final'] = True
+    return json.dumps(record) + '\n'
@@ -0,0 +1,191 @@
+"""
+Breached-password blocklist backed by memory-mapped files.
+
+An index is two files built once from a HIBP-style SHA-1 list
+("<40 hex chars>[:count]" per line, sorted by hash):
+
+- ``<index>``: every SHA-1 digest as a raw 20-byte record, sorted.
+- ``<index>.bloom``: a Bloom filter over the same digests.
+
+Both are opened with mmap, so nothing is parsed into Python objects at
+startup and every worker process shares the same page cache. A lookup hashes
+the candidate, checks the Bloom filter and only binary-searches the digest
+file when the filter reports a possible hit.
+
+Build an index with::
+
+    python -m password_core.breach build pwned-passwords-sha1-ordered-by-hash.txt breached.sha1
+"""
+import argparse
+import hashlib
+import math
+import mmap
+import os
+import struct
+import sys
+
+RECORD_SIZE = 20
+
+BLOOM_MAGIC = b'PWBLOOM1'
+BLOOM_HEADER = struct.Struct('>8sQI')
+DEFAULT_BITS_PER_ENTRY = 10
+
+
+def _bloom_positions(digest, num_bits, num_hashes):
+    """
+    Derive the filter bit positions from the digest itself (double hashing);
+    SHA-1 output is already uniformly distributed
+    """
+    h1 = int.from_bytes(digest[:8], 'big')
+    h2 = int.from_bytes(digest[8:16], 'big') | 1
+    return [(h1 + i * h2) % num_bits for i in range(num_hashes)]
+
+
+class BreachList:
+    """
+    Read-only view of a breached-password index
+    """
+
+    def __init__(self, index_path, bloom_path=None):
+        self.index_path = index_path
+        self.bloom_path = bloom_path or index_path + '.bloom'
+        self._records = _map_file(index_path)
+        self.count = len(self._records) // RECORD_SIZE if self._records else 0
+
+        self._bloom = None
+        if os.path.exists(self.bloom_path):
+            self._bloom = _map_file(self.bloom_path)
+            magic, self._num_bits, self._num_hashes = BLOOM_HEADER.unpack_from(self._bloom)
+            if magic != BLOOM_MAGIC:
+                raise ValueError(f"{self.bloom_path} is not a Bloom filter file")
+
+    def __contains__(self, password):
+        return self.contains_digest(hashlib.sha1(password.encode('utf-8')).digest())
+
+    def __len__(self):
+        return self.count
+
+    def contains_digest(self, digest):
+        """
+        Return True if the SHA-1 digest is in the breached list
+        """
+        bloom = self._bloom
+        if bloom is not None:
+            offset = BLOOM_HEADER.size
+            for position in _bloom_positions(digest, self._num_bits, self._num_hashes):
+                if not bloom[offset + (position >> 3)] & (1 << (position & 7)):
+                    return False
+
+        records = self._records
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) >> 1
+            start = middle * RECORD_SIZE
+            record = records[start:start + RECORD_SIZE]
+            if record < digest:
+                low = middle + 1
+            elif record > digest:
+                high = middle
+            else:
+                return True
+        return False
+
+    def close(self):
+        for mapped in (self._records, self._bloom):
+            if mapped is not None:
+                mapped.close()
+        self._records = self._bloom = None
+        self.count = 0
+
+
+def _map_file(path):
+    """
+    Memory-map a file read-only; empty files map to None
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def build_index(source_path, index_path, bits_per_entry=DEFAULT_BITS_PER_ENTRY):
+    """
+    Convert a sorted HIBP-style text list into a digest file plus Bloom filter.
+
+    The source is streamed line by line and the filter is filled from the
+    finished (memory-mapped) digest file, so memory use is bounded by the
+    size of the filter. Returns the number of digests written.
+    """
+    count = 0
+    previous = b''
+    with open(source_path, 'rb') as source, open(index_path, 'wb') as index:
+        for line_number, line in enumerate(source, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                digest = bytes.fromhex(line.split(b':', 1)[0].decode('ascii'))
+            except ValueError:
+                raise ValueError(f"{source_path}:{line_number}: not a SHA-1 hex digest")
+            if len(digest) != RECORD_SIZE:
+                raise ValueError(f"{source_path}:{line_number}: not a SHA-1 hex digest")
+            if digest < previous:
+                raise ValueError(f"{source_path}:{line_number}: input is not sorted by hash")
+            if digest != previous:
+                index.write(digest)
+                count += 1
+                previous = digest
+
+    num_bits = max(64, count * bits_per_entry)
+    num_hashes = max(1, round(bits_per_entry * math.log(2)))
+    bits = bytearray((num_bits + 7) // 8)
+    records = _map_file(index_path)
+    if records is not None:
+        with records:
+            for start in range(0, count * RECORD_SIZE, RECORD_SIZE):
+                for position in _bloom_positions(records[start:start + RECORD_SIZE], num_bits, num_hashes):
+                    bits[position >> 3] |= 1 << (position & 7)
+
+    with open(index_path + '.bloom', 'wb') as bloom:
+        bloom.write(BLOOM_HEADER.pack(BLOOM_MAGIC, num_bits, num_hashes))
+        bloom.write(bits)
+    return count
+
+
+def load_breach_list(path=None):
+    """
+    Open the index named by ``path`` or the PASSWORD_BREACH_INDEX environment
+    variable; returns None when neither is set
+    """
+    path = path or os.environ.get('PASSWORD_BREACH_INDEX')
+    if not path:
+        return None
+    return BreachList(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m password_core.breach',
+                                     description="Build or query a breached-password index")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    build = commands.add_parser('build', help="build an index from a sorted SHA-1 list")
+    build.add_argument('source')
+    build.add_argument('index')
+    build.add_argument('--bits-per-entry', type=int, default=DEFAULT_BITS_PER_ENTRY)
+
+    check = commands.add_parser('check', help="check passwords read from stdin against an index")
+    check.add_argument('index')
+
+    args = parser.parse_args(argv)
+    if args.command == 'build':
+        count = build_index(args.source, args.index, args.bits_per_entry)
+        print(f"Wrote {count} digests to {args.index}")
+    else:
+        breach_list = BreachList(args.index)
+        for line in sys.stdin:
+            password = line.rstrip('\n')
+            print(f"{'BREACHED' if password in breach_list else 'ok'}\t{password}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,413 @@
+"""
+Multi-process bulk password generation.
+
+The requested count is split into fixed-size chunks that a process pool
+generates in parallel. Every chunk is written straight into its own slice of
+one shared-memory buffer of fixed-width records, so nothing is pickled back
+to the parent and the output order is the chunk order, no matter which
+worker finishes first. Each worker draws from the OS CSPRNG in its own
+process; with ``--seed`` every password depends only on the seed and its
+index instead, so the output is the same for any worker or chunk count.
+
+The records can be exported as text lines, or written straight from the
+shared buffer with no per-password objects as fixed-width records ('fixed')
+or records behind a small header ('binary'), optionally encrypted at rest
+with AES-256-GCM when the cryptography package is installed.
+
+Command line::
+
+    python -m password_core.bulk --count 1000000 --workers 8 --length 16 -o passwords.txt
+    python -m password_core.bulk --count 10000000 --format binary --key-file export.key -o passwords.bin
+"""
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import os
+import struct
+import sys
+
+from password_core.breach import BreachList
+from password_core.engine import MAX_BREACH_RETRIES, generate_records, secure_password_bytes, secure_records
+from password_core.policy import EXCLUSION_PRESETS, PasswordPolicy
+from password_core.sources import SeededSource
+
+DEFAULT_BULK_CHUNK_SIZE = 65536
+
+EXPORT_FORMATS = ('lines', 'fixed', 'binary')
+
+# 'binary' exports start with: magic, record length, record count
+BINARY_MAGIC = b'PWB1'
+BINARY_HEADER = struct.Struct('<4sIQ')
+
+# Encrypted exports are the magic followed by segments of at most
+# SEGMENT_SIZE plaintext bytes, each: plaintext length, 12-byte nonce,
+# AES-256-GCM ciphertext and tag. Every segment authenticates the magic, its
+# index and whether it is the last one, so segments cannot be reordered,
+# dropped or cut off unnoticed.
+ENCRYPTED_MAGIC = b'PWE1'
+SEGMENT_HEADER = struct.Struct('<I')
+SEGMENT_AAD = struct.Struct('<4sQ?')
+SEGMENT_SIZE = 1 << 20
+NONCE_SIZE = 12
+TAG_SIZE = 16
+KEY_SIZE = 32
+
+
+class BulkResult:
+    """
+    Fixed-width password records living in shared memory.
+
+    ``records`` is a memoryview of ``count * length`` ASCII bytes; record
+    ``i`` is ``records[i * length:(i + 1) * length]``. Call close() (or use
+    the result as a context manager) to release the shared memory.
+    """
+
+    def __init__(self, shm, count, length):
+        self._shm = shm
+        self.count = count
+        self.length = length
+        self.records = shm.buf[:count * length]
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if not -self.count <= index < self.count:
+            raise IndexError("password index out of range")
+        start = (index % self.count) * self.length
+        return bytes(self.records[start:start + self.length]).decode('ascii')
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self[index]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write_lines(self, fp, records_per_write=DEFAULT_BULK_CHUNK_SIZE):
+        """
+        Write the records to a binary file, one password per line
+        """
+        for block in self.iter_export('lines', records_per_write):
+            fp.write(block)
+
+    def header(self):
+        return BINARY_HEADER.pack(BINARY_MAGIC, self.length, self.count)
+
+    def export(self, fp, output_format='lines', key=None):
+        """
+        Write the records to a binary file in one of EXPORT_FORMATS: 'lines'
+        (one password per line), 'fixed' (records back to back) or 'binary'
+        (BINARY_HEADER, then the records). 'fixed' and 'binary' are a single
+        write of the shared buffer. With a KEY_SIZE-byte ``key`` the export
+        is encrypted segment by segment instead; see iter_encrypted().
+        """
+        _check_format(output_format)
+        if key is not None:
+            blocks = self.iter_export(output_format)
+            try:
+                for segment in iter_encrypted(blocks, key):
+                    fp.write(segment)
+            finally:
+                blocks.close()
+        elif output_format == 'lines':
+            self.write_lines(fp)
+        else:
+            if output_format == 'binary':
+                fp.write(self.header())
+            fp.write(self.records)
+
+    def iter_export(self, output_format='lines', records_per_chunk=DEFAULT_BULK_CHUNK_SIZE):
+        """
+        Yield an unencrypted export in bytes-like blocks of about
+        ``records_per_chunk`` records, e.g. for a streamed HTTP response
+        """
+        _check_format(output_format)
+        length = self.length
+        step = records_per_chunk * length
+        if output_format == 'binary':
+            yield self.header()
+        for start in range(0, self.count * length, step):
+            if output_format == 'lines':
+                yield _add_newlines(self.records[start:start + step], length)
+            else:
+                # Released when the consumer asks for the next block, so close() works
+                with self.records[start:start + step] as block:
+                    yield block
+
+    def close(self):
+        if self._shm is not None:
+            self.records.release()
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+
+def _add_newlines(block, length):
+    """
+    Interleave a newline after every ``length``-byte record using strided
+    slice assignment instead of a per-record loop
+    """
+    data = bytes(block)
+    count = len(data) // length
+    out = bytearray(count * (length + 1))
+    for column in range(length):
+        out[column::length + 1] = data[column::length]
+    out[length::length + 1] = b'\n' * count
+    return out
+
+
+def _check_format(output_format):
+    if output_format not in EXPORT_FORMATS:
+        raise ValueError(f"Export format must be one of {', '.join(EXPORT_FORMATS)}")
+
+
+def load_key(path):
+    """
+    Read an export key file holding KEY_SIZE raw bytes or their hex digits.
+    Raises ValueError for a malformed key, or when encryption is unavailable
+    so that callers fail before generating anything.
+    """
+    with open(path, 'rb') as f:
+        key = f.read().strip()
+    if len(key) == 2 * KEY_SIZE:
+        try:
+            key = bytes.fromhex(key.decode('ascii'))
+        except ValueError:
+            pass
+    if len(key) != KEY_SIZE:
+        raise ValueError(f"{path} must hold a {KEY_SIZE}-byte key (raw or hex)")
+    _aesgcm(key)
+    return key
+
+
+def _aesgcm(key):
+    try:
+        from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+    except ImportError:
+        raise ValueError("Encrypted export needs the 'cryptography' package")
+    if len(key) != KEY_SIZE:
+        raise ValueError(f"Export keys must be {KEY_SIZE} bytes")
+    return AESGCM(key)
+
+
+def iter_encrypted(blocks, key, segment_size=SEGMENT_SIZE):
+    """
+    Encrypt an export given as bytes-like ``blocks`` with AES-256-GCM,
+    yielding ENCRYPTED_MAGIC and then one encrypted segment at a time, each
+    under a fresh random nonce. Only about one segment is held in memory.
+    """
+    aesgcm = _aesgcm(key)
+    yield ENCRYPTED_MAGIC
+    pending = bytearray()
+    index = 0
+    for block in blocks:
+        pending += block
+        # Keep the last segment back until we know it is the last
+        while len(pending) > segment_size:
+            yield _encrypt_segment(aesgcm, pending[:segment_size], index, False)
+            del pending[:segment_size]
+            index += 1
+    yield _encrypt_segment(aesgcm, pending, index, True)
+
+
+def _encrypt_segment(aesgcm, plaintext, index, final):
+    nonce = os.urandom(NONCE_SIZE)
+    ciphertext = aesgcm.encrypt(nonce, bytes(plaintext), SEGMENT_AAD.pack(ENCRYPTED_MAGIC, index, final))
+    return SEGMENT_HEADER.pack(len(plaintext)) + nonce + ciphertext
+
+
+def encrypt_export(payload, key):
+    """
+    Encrypt a whole export held in memory; see iter_encrypted()
+    """
+    return b''.join(iter_encrypted([payload], key))
+
+
+def decrypt_export(data, key):
+    """
+    Reverse encrypt_export(), raising ValueError if the data is not an
+    encrypted export, is truncated or fails authentication
+    """
+    aesgcm = _aesgcm(key)
+    data = memoryview(data)
+    if data[:len(ENCRYPTED_MAGIC)] != ENCRYPTED_MAGIC:
+        raise ValueError("Not an encrypted password export")
+    out = bytearray()
+    offset = len(ENCRYPTED_MAGIC)
+    index = 0
+    while True:
+        start = offset + SEGMENT_HEADER.size + NONCE_SIZE
+        if start > len(data):
+            raise ValueError("Encrypted export is truncated")
+        size, = SEGMENT_HEADER.unpack_from(data, offset)
+        nonce = bytes(data[offset + SEGMENT_HEADER.size:start])
+        offset = start + size + TAG_SIZE
+        if offset > len(data):
+            raise ValueError("Encrypted export is truncated")
+        final = offset == len(data)
+        try:
+            out += aesgcm.decrypt(nonce, bytes(data[start:offset]),
+                                  SEGMENT_AAD.pack(ENCRYPTED_MAGIC, index, final))
+        except Exception:
+            # cryptography raises InvalidTag, which callers cannot catch without importing it
+            raise ValueError("Encrypted export failed authentication "
+                             "(wrong key, corrupted or truncated file)")
+        if final:
+            return bytes(out)
+        index += 1
+
+
+def _fill_chunk(shm_name, offset, count, policy, blocklist_path, seed=None):
+    """
+    Worker: generate ``count`` passwords into the shared buffer at ``offset``
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        compiled = policy.validate()
+        length = policy.length
+        size = count * length
+        blocklist = BreachList(blocklist_path) if blocklist_path else None
+
+        if seed is not None:
+            records = generate_records(policy, count, blocklist, SeededSource(seed), offset // length)
+            shm.buf[offset:offset + size] = records
+            return count
+
+        if policy.enforce_rules:
+            shm.buf[offset:offset + size] = secure_records(compiled, length, count)
+            generate = lambda: secure_password_bytes(compiled, length)
+        else:
+            shm.buf[offset:offset + size] = compiled.sample(size)
+            generate = lambda: compiled.sample(length)
+        if blocklist is not None:
+            view = shm.buf
+            for start in range(offset, offset + size, length):
+                password = bytes(view[start:start + length]).decode('ascii')
+                if password in blocklist:
+                    view[start:start + length] = _checked(generate, blocklist)
+        return count
+    finally:
+        shm.close()
+
+
+def _checked(generate, blocklist):
+    """
+    Draw records from ``generate`` (ASCII bytes) until one is not in the
+    blocklist, giving up like engine._replace_breached() does
+    """
+    for _ in range(MAX_BREACH_RETRIES):
+        record = generate()
+        if record.decode('ascii') not in blocklist:
+            return record
+    raise ValueError("Could not generate a password outside the breached-password list; "
+                     "try a longer length or more character types")
+
+
+def generate_bulk(policy, count, workers=None, chunk_size=DEFAULT_BULK_CHUNK_SIZE,
+                  blocklist_path=None, seed=None, progress=None):
+    """
+    Generate ``count`` passwords across a process pool and return a BulkResult.
+
+    ``seed`` switches to a sources.SeededSource: reproducible output for
+    benchmarks and load tests, never for real passwords. ``progress(done)``
+    is called with the number of finished records after each chunk; an
+    exception raised from it releases the buffer and stops generation.
+    """
+    policy.validate()
+    if seed is not None:
+        # Fail in the caller, not in every worker, when seeding is locked out
+        SeededSource(seed)
+    if count < 1:
+        raise ValueError("Password count must be at least 1")
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be at least 1")
+    workers = workers or os.cpu_count() or 1
+
+    length = policy.length
+    shm = shared_memory.SharedMemory(create=True, size=count * length)
+    try:
+        chunks = [(start * length, min(chunk_size, count - start))
+                  for start in range(0, count, chunk_size)]
+        done = 0
+        if workers == 1 or len(chunks) == 1:
+            for offset, size in chunks:
+                done += _fill_chunk(shm.name, offset, size, policy, blocklist_path, seed)
+                if progress is not None:
+                    progress(done)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(_fill_chunk, shm.name, offset, size, policy, blocklist_path, seed)
+                           for offset, size in chunks]
+                for future in futures:
+                    done += future.result()
+                    if progress is not None:
+                        progress(done)
+    except BaseException:
+        shm.close()
+        shm.unlink()
+        raise
+    return BulkResult(shm, count, length)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m password_core.bulk',
+                                     description="Generate passwords in bulk across CPU cores")
+    parser.add_argument('--count', type=int, required=True)
+    parser.add_argument('--workers', type=int, default=None,
+                        help="worker processes (default: one per CPU)")
+    parser.add_argument('--length', type=int, default=12)
+    parser.add_argument('--no-uppercase', action='store_true')
+    parser.add_argument('--no-lowercase', action='store_true')
+    parser.add_argument('--no-numbers', action='store_true')
+    parser.add_argument('--no-symbols', action='store_true')
+    parser.add_argument('--exclude', default='')
+    parser.add_argument('--exclude-preset', action='append', default=[],
+                        choices=sorted(EXCLUSION_PRESETS), help="may be given more than once")
+    parser.add_argument('--no-rules', action='store_true',
+                        help="skip the class-coverage and no-repeat rules")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_BULK_CHUNK_SIZE)
+    parser.add_argument('--breach-index', default=os.environ.get('PASSWORD_BREACH_INDEX'))
+    parser.add_argument('--seed', help="reproducible output for tests and benchmarks "
+                                       "(never use for real passwords)")
+    parser.add_argument('--format', choices=EXPORT_FORMATS, default='lines',
+                        help="one password per line (default), fixed-width records, "
+                             "or records behind a binary header")
+    parser.add_argument('--key-file', help="encrypt the output with this 32-byte key "
+                                           "(raw or hex; needs the cryptography package)")
+    parser.add_argument('-o', '--output', help="output file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    policy = PasswordPolicy(
+        length=args.length,
+        use_uppercase=not args.no_uppercase,
+        use_lowercase=not args.no_lowercase,
+        use_numbers=not args.no_numbers,
+        use_symbols=not args.no_symbols,
+        exclude_chars=args.exclude,
+        exclude_presets=tuple(args.exclude_preset),
+        enforce_rules=not args.no_rules,
+    )
+    key = None
+    try:
+        if args.key_file:
+            key = load_key(args.key_file)
+        result = generate_bulk(policy, args.count, args.workers, args.chunk_size, args.breach_index,
+                               args.seed)
+    except ValueError as e:
+        parser.error(str(e))
+
+    with result:
+        if args.output:
+            with open(args.output, 'wb') as fp:
+                result.export(fp, args.format, key)
+        else:
+            result.export(sys.stdout.buffer, args.format, key)
+            sys.stdout.buffer.flush()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,310 @@
+"""
+Headless command line interface: ``python -m password_core``.
+
+Options mirror the /generate JSON fields. The CLI is meant to be called from
+shell scripts thousands of times, so it only imports the core engine (no
+Flask, tkinter, pyperclip, argparse or re) and parses its few options by
+hand; check with ``python -X importtime -m password_core``.
+
+Usage::
+
+    python -m password_core [generate] [options]
+    python -m password_core score [PASSWORD ...]   (reads stdin when none given)
+    python -m password_core analyze [FILE]         (reads stdin when none given)
+"""
+import os
+import sys
+
+from password_core.engine import generate_many
+from password_core.policy import PasswordPolicy
+from password_core.scoring import score_password
+from password_core.sources import SYSTEM_SOURCE
+
+USAGE = """\
+usage: python -m password_core [generate] [options]
+       python -m password_core score [--json] [PASSWORD ...]
+       python -m password_core analyze [--json] [--workers N] [FILE]
+
+generate options:
+  --length N                password length (default 12)
+  --count N                 number of passwords (default 1)
+  --uppercase / --no-uppercase
+  --lowercase / --no-lowercase
+  --numbers / --no-numbers
+  --symbols / --no-symbols
+  --exclude CHARS           characters to leave out
+  --exclude-preset NAMES    comma-separated exclusion presets: ambiguous, shell,
+                            url, brackets
+  --enforce-rules / --no-enforce-rules
+                            one character of each type and no repeats (default on)
+  --breach-index PATH       reject passwords found in a breach index
+                            (default: $PASSWORD_BREACH_INDEX)
+  --mode MODE               'password' (default), 'passphrase' or 'template'
+  --words N                 passphrase: number of words (default 6)
+  --separator SEP           passphrase: word separator (default '-')
+  --capitalize              passphrase: capitalize every word
+  --digits N                passphrase: random digits appended to random words
+  --template T              template: pattern such as 'Cvccvc-99' (implies --mode template)
+  --seed SEED               reproducible output for tests and benchmarks: password N
+                            depends only on SEED and N (never use for real passwords)
+  --start N                 with --seed: index of the first password (default 0)
+  --strength                print strength and entropy after each password
+  --json                    print one /generate style JSON object per line
+
+analyze options (one password per line; results never include the passwords):
+  --workers N               score in N processes (default 1)
+  --json                    NDJSON results with a running summary after each block;
+                            otherwise tab-separated results and a summary on stderr
+"""
+
+# Boolean flags: option name -> (PasswordPolicy field, value)
+FLAGS = {}
+for _field, _name in (('use_uppercase', 'uppercase'), ('use_lowercase', 'lowercase'),
+                      ('use_numbers', 'numbers'), ('use_symbols', 'symbols'),
+                      ('enforce_rules', 'enforce-rules')):
+    FLAGS['--' + _name] = (_field, True)
+    FLAGS['--no-' + _name] = (_field, False)
+
+# Options taking a value: option name -> converter
+VALUE_OPTIONS = {
+    '--length': int,
+    '--count': int,
+    '--exclude': str,
+    '--exclude-preset': lambda names: tuple(name for name in names.split(',') if name),
+    '--breach-index': str,
+    '--mode': str,
+    '--words': int,
+    '--separator': str,
+    '--digits': int,
+    '--template': str,
+    '--workers': int,
+    '--seed': str,
+    '--start': int,
+}
+
+SWITCHES = ('--strength', '--json', '--capitalize')
+
+
+class UsageError(Exception):
+    pass
+
+
+def parse_args(args):
+    """
+    Split ``args`` into option values, switches and positional arguments
+    """
+    values = {}
+    switches = set()
+    positional = []
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        name, equals, inline = arg.partition('=')
+        if arg in FLAGS:
+            field, value = FLAGS[arg]
+            values[field] = value
+        elif arg in SWITCHES:
+            switches.add(arg)
+        elif name in VALUE_OPTIONS:
+            if equals:
+                raw = inline
+            else:
+                i += 1
+                if i == len(args):
+                    raise UsageError(f"{name} needs a value")
+                raw = args[i]
+            try:
+                values[name] = VALUE_OPTIONS[name](raw)
+            except ValueError:
+                raise UsageError(f"invalid value for {name}: {raw!r}")
+        elif arg in ('-h', '--help'):
+            switches.add('--help')
+        elif arg.startswith('--'):
+            raise UsageError(f"unknown option {arg}")
+        else:
+            positional.append(arg)
+        i += 1
+    return values, switches, positional
+
+
+def format_result(password, switches):
+    if '--json' in switches:
+        import json
+        strength = score_password(password)
+        return json.dumps({'password': password, 'strength': strength.label,
+                           'entropy': round(strength.bits, 1)})
+    if '--strength' in switches:
+        strength = score_password(password)
+        return f"{password}\t{strength.label}\t{strength.bits:.1f}"
+    return password
+
+
+def make_source(values):
+    """
+    Pop --seed/--start; returns (source, start index)
+    """
+    seed = values.pop('--seed', None)
+    start = values.pop('--start', 0)
+    if seed is None:
+        if start:
+            raise UsageError("--start only applies with --seed")
+        return SYSTEM_SOURCE, 0
+    if start < 0:
+        raise UsageError("--start must not be negative")
+    from password_core.sources import SeededSource
+    return SeededSource(seed), start
+
+
+def run_generate(values, switches):
+    if '--workers' in values:
+        raise UsageError("--workers only applies to analyze")
+    mode = values.pop('--mode', 'template' if '--template' in values else 'password')
+    if mode == 'passphrase':
+        return run_passphrase(values, switches)
+    if mode == 'template':
+        return run_template(values, switches)
+    if mode != 'password':
+        raise UsageError(f"unknown mode {mode!r}")
+    for name in ('--words', '--separator', '--digits'):
+        if name in values:
+            raise UsageError(f"{name} only applies to --mode passphrase")
+    if '--template' in values:
+        raise UsageError("--template only applies to --mode template")
+
+    count = values.pop('--count', 1)
+    length = values.pop('--length', 12)
+    exclude = values.pop('--exclude', '')
+    presets = values.pop('--exclude-preset', ())
+    breach_index = values.pop('--breach-index', None) or os.environ.get('PASSWORD_BREACH_INDEX')
+
+    source, start = make_source(values)
+    policy = PasswordPolicy(length=length, exclude_chars=exclude, exclude_presets=presets, **values)
+    blocklist = None
+    if breach_index:
+        from password_core.breach import BreachList
+        blocklist = BreachList(breach_index)
+
+    passwords = generate_many(policy, count, blocklist, source, start)
+    sys.stdout.write(''.join(format_result(p, switches) + '\n' for p in passwords))
+    return 0
+
+
+def run_passphrase(values, switches):
+    from password_core.passphrase import generate_passphrase
+
+    source, start = make_source(values)
+    count = values.get('--count', 1)
+    write = sys.stdout.write
+    for index in range(start, start + count):
+        result = generate_passphrase(
+            words=values.get('--words', 6),
+            separator=values.get('--separator', '-'),
+            capitalize='--capitalize' in switches,
+            digits=values.get('--digits', 0),
+            urandom=source.randbytes_for(index),
+        )
+        if '--json' in switches:
+            import json
+            strength = score_password(result.passphrase)
+            write(json.dumps({'password': result.passphrase, 'strength': strength.label,
+                              'entropy': round(result.bits, 1),
+                              'entropy_per_word': round(result.bits_per_word, 2)}) + '\n')
+        elif '--strength' in switches:
+            write(f"{result.passphrase}\t{score_password(result.passphrase).label}\t{result.bits:.1f}\n")
+        else:
+            write(result.passphrase + '\n')
+    return 0
+
+
+def run_template(values, switches):
+    from password_core.template import compile_template
+
+    if '--template' not in values:
+        raise UsageError("--mode template needs --template")
+    source, start = make_source(values)
+    from password_core.policy import exclusion_set
+
+    excluded = exclusion_set(values.get('--exclude', ''), values.get('--exclude-preset', ()))
+    compiled = compile_template(values['--template'], excluded)
+    write = sys.stdout.write
+    for index in range(start, start + values.get('--count', 1)):
+        password = compiled.generate(source.randbytes_for(index))
+        if '--json' in switches:
+            import json
+            write(json.dumps({'password': password, 'strength': score_password(password).label,
+                              'entropy': round(compiled.bits, 1)}) + '\n')
+        elif '--strength' in switches:
+            write(f"{password}\t{score_password(password).label}\t{compiled.bits:.1f}\n")
+        else:
+            write(password + '\n')
+    return 0
+
+
+def run_score(positional, switches):
+    passwords = positional or (line.rstrip('\r\n') for line in sys.stdin)
+    write = sys.stdout.write
+    for password in passwords:
+        if '--json' in switches:
+            write(format_result(password, switches) + '\n')
+        else:
+            strength = score_password(password)
+            write(f"{strength.label}\t{strength.bits:.1f}\t{password}\n")
+    return 0
+
+
+def run_analyze(values, positional, switches):
+    from password_core.audit import AuditSummary, audit, summary_line
+
+    if len(positional) > 1:
+        raise UsageError("analyze takes at most one file")
+    output_format = 'ndjson' if '--json' in switches else 'tsv'
+    write = sys.stdout.write
+    summary = None
+
+    if positional and positional[0] != '-':
+        stream = open(positional[0], 'rb')
+    else:
+        stream = sys.stdin.buffer
+    with stream:
+        for text, summary in audit(stream, values.pop('--workers', 1), output_format):
+            write(text)
+            if output_format == 'ndjson':
+                write(summary_line(summary))
+
+    if summary is None:
+        summary = AuditSummary()
+    if output_format == 'ndjson':
+        write(summary_line(summary, final=True))
+    else:
+        totals = summary.as_dict()
+        report = [f"{totals['total']} passwords, mean entropy {totals['mean_entropy']} bits"]
+        report += [f"  {label:<14}{count}" for label, count in totals['strength'].items()]
+        report += [f"  {bucket + ' bits':<14}{count}" for bucket, count in totals['entropy_histogram'].items()]
+        sys.stderr.write('\n'.join(report) + '\n')
+    return 0
+
+
+def main(argv=None):
+    args = sys.argv[1:] if argv is None else list(argv)
+    command = 'generate'
+    if args and args[0] in ('generate', 'score', 'analyze'):
+        command = args.pop(0)
+
+    try:
+        values, switches, positional = parse_args(args)
+        if '--help' in switches:
+            sys.stdout.write(USAGE)
+            return 0
+        if command == 'score':
+            return run_score(positional, switches)
+        if command == 'analyze':
+            return run_analyze(values, positional, switches)
+        if positional:
+            raise UsageError(f"unexpected argument {positional[0]!r}")
+        return run_generate(values, switches)
+    except UsageError as e:
+        sys.stderr.write(f"{USAGE}\nerror: {e}\n")
+        return 2
+    except ValueError as e:
+        sys.stderr.write(f"error: {e}\n")
+        return 1
@@ -0,0 +1,472 @@
+"""
+Password generation engine.
+
+Every front end funnels through these functions with a PasswordPolicy, so
+there is a single hot path to optimise and benchmark.
+
+Randomness comes from the OS CSPRNG, read through per-thread buffers
+(sources.random_bytes) so that threaded servers neither contend nor make a
+syscall per password. Benchmarks and load tests can pass a
+sources.SeededSource instead, which makes password ``index`` of a seed
+reproducible on its own; see password_core/sources.py.
+"""
+from functools import lru_cache
+from itertools import accumulate
+
+from password_core.sources import random_bytes
+
+DEFAULT_CHUNK_SIZE = 4096
+
+# Give up on a policy whose every candidate keeps landing in the breached list
+MAX_BREACH_RETRIES = 1000
+
+# secure_records() samples whole blocks when at least this share of random
+# passwords meets the rules, and redraws broken ones at most this many times
+MIN_RULE_ODDS = 0.25
+MAX_REDRAW_ROUNDS = 8
+
+# secure_password_bytes() redraws repeat-free passwords that miss a class
+# while at least this share of them has every class, and decodes a uniform
+# rank otherwise
+MIN_CLASS_ODDS = 0.5
+
+# Seeded passwords are sampled this many at a time, block N of a seed from
+# its own stream, so each password still depends only on its index
+SEEDED_BLOCK_SIZE = 256
+
+# _LIMITS[n] is the largest multiple of n that fits in a byte; random bytes at
+# or above it are rejected so that ``byte % n`` stays uniform
+_LIMITS = (0,) + tuple(256 - (256 % n) for n in range(1, 257))
+
+
+def generate_password(policy, blocklist=None, source=None, index=0):
+    """
+    Generate one password for the policy.
+
+    ``blocklist`` is any container of passwords to reject, typically a
+    breach.BreachList. With a deterministic ``source``, the result is
+    password number ``index`` of its stream.
+    """
+    compiled = policy.validate()
+    if source is not None and source.deterministic:
+        return next(_iter_indexed(compiled, policy.length, policy.enforce_rules, 1, 1,
+                                  blocklist, source, index))[0]
+    urandom = random_bytes if source is None else source.randbytes_for(index)
+    password = _generate_one(compiled, policy.length, policy.enforce_rules, urandom)
+    if blocklist is not None and password in blocklist:
+        password = _replace_breached(compiled, policy.length, policy.enforce_rules, blocklist, urandom)
+    return password
+
+
+def generate_many(policy, count, blocklist=None, source=None, start=0):
+    """
+    Generate a list of ``count`` passwords for the policy
+    """
+    return next(iter_many(policy, count, count, blocklist, source, start))
+
+
+def iter_many(policy, count, chunk_size=DEFAULT_CHUNK_SIZE, blocklist=None, source=None, start=0):
+    """
+    Return an iterator over lists of at most ``chunk_size`` passwords.
+
+    The policy is validated up front, so a bad request raises ValueError
+    here rather than halfway through a streamed response. Only one chunk
+    is held in memory at a time. With a deterministic ``source`` the
+    passwords are numbers ``start`` to ``start + count - 1`` of its stream,
+    so a range split across workers gives the same passwords as one run.
+    """
+    compiled = policy.validate()
+    if count < 1:
+        raise ValueError("Password count must be at least 1")
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be at least 1")
+    if start < 0:
+        raise ValueError("Start index must not be negative")
+    if source is not None and source.deterministic:
+        return _iter_indexed(compiled, policy.length, policy.enforce_rules, count, chunk_size,
+                             blocklist, source, start)
+    return _iter_chunks(compiled, policy.length, policy.enforce_rules, count, chunk_size, blocklist)
+
+
+def generate_records(policy, count, blocklist=None, source=None, start=0):
+    """
+    Generate ``count`` passwords as one bytearray of ``count * length``
+    ASCII bytes, for callers that keep passwords in mutable buffers they can
+    wipe (no str copy of any password is made, except to look it up in a
+    plain container blocklist). A deterministic ``source`` gives the same
+    passwords as iter_many() with that source and ``start``.
+    """
+    compiled = policy.validate()
+    if count < 1:
+        raise ValueError("Password count must be at least 1")
+    if start < 0:
+        raise ValueError("Start index must not be negative")
+    length = policy.length
+    enforce_rules = policy.enforce_rules
+    seeded = source is not None and source.deterministic
+    if seeded:
+        block = bytearray()
+        for _, records in _seeded_blocks(compiled, length, enforce_rules, count, source, start):
+            block += records
+    elif enforce_rules:
+        block = secure_records(compiled, length, count)
+    else:
+        block = compiled.sample(count * length)
+    if blocklist is not None:
+        breached = _breach_check(blocklist)
+        for offset in range(0, len(block), length):
+            if breached(block[offset:offset + length]):
+                urandom = source.randbytes_for(start + offset // length) if seeded else random_bytes
+                block[offset:offset + length] = _replace_breached_bytes(
+                    compiled, length, enforce_rules, breached, urandom)
+    return block
+
+
+def _breach_check(blocklist):
+    """
+    Return ``breached(record)`` for ASCII byte records
+    """
+    contains_digest = getattr(blocklist, 'contains_digest', None)
+    if contains_digest is None:
+        return lambda record: record.decode('ascii') in blocklist
+    # A breach.BreachList is looked up by SHA-1 digest, which needs no str
+    from hashlib import sha1
+    return lambda record: contains_digest(sha1(record).digest())
+
+
+def _replace_breached_bytes(compiled, length, enforce_rules, breached, urandom=random_bytes):
+    for _ in range(MAX_BREACH_RETRIES):
+        if enforce_rules:
+            record = secure_password_bytes(compiled, length, urandom)
+        else:
+            record = compiled.sample(length, urandom)
+        if not breached(record):
+            return record
+    raise ValueError("Could not generate a password outside the breached-password list; "
+                     "try a longer length or more character types")
+
+
+def _iter_indexed(compiled, length, enforce_rules, count, chunk_size, blocklist, source, start):
+    """
+    Passwords come from fixed blocks of indexes and breached ones are
+    replaced from their own index's stream, so each depends only on its
+    index, whatever the chunk size
+    """
+    chunk = []
+    for index, records in _seeded_blocks(compiled, length, enforce_rules, count, source, start):
+        text = records.decode('ascii')
+        for offset in range(0, len(text), length):
+            password = text[offset:offset + length]
+            if blocklist is not None and password in blocklist:
+                password = _replace_breached(compiled, length, enforce_rules, blocklist,
+                                             source.randbytes_for(index + offset // length))
+            chunk.append(password)
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def _seeded_blocks(compiled, length, enforce_rules, count, source, start):
+    """
+    Yield (first index, records) covering indexes ``start`` to
+    ``start + count - 1``, sampling SEEDED_BLOCK_SIZE passwords per stream
+    """
+    end = start + count
+    for block in range(start // SEEDED_BLOCK_SIZE, (end - 1) // SEEDED_BLOCK_SIZE + 1):
+        first = block * SEEDED_BLOCK_SIZE
+        urandom = source.randbytes_for_block(block)
+        if enforce_rules:
+            records = secure_records(compiled, length, SEEDED_BLOCK_SIZE, urandom)
+        else:
+            records = compiled.sample(SEEDED_BLOCK_SIZE * length, urandom)
+        low = max(start, first)
+        high = min(end, first + SEEDED_BLOCK_SIZE)
+        if low > first or high < first + SEEDED_BLOCK_SIZE:
+            records = records[(low - first) * length:(high - first) * length]
+        yield low, records
+
+
+def _iter_chunks(compiled, length, enforce_rules, count, chunk_size, blocklist):
+    remaining = count
+    while remaining:
+        batch = min(chunk_size, remaining)
+        # Sample the whole chunk in one go and slice it into passwords
+        needed = batch * length
+        if enforce_rules:
+            text = secure_records(compiled, length, batch).decode('ascii')
+        else:
+            text = compiled.sample(needed).decode('ascii')
+        chunk = [text[i:i + length] for i in range(0, needed, length)]
+        if blocklist is not None:
+            for i, password in enumerate(chunk):
+                if password in blocklist:
+                    chunk[i] = _replace_breached(compiled, length, enforce_rules, blocklist)
+        yield chunk
+        remaining -= batch
+
+
+def _generate_one(compiled, length, enforce_rules, urandom=random_bytes):
+    if enforce_rules:
+        return generate_secure_password(compiled, length, urandom)
+    return compiled.sample(length, urandom).decode('ascii')
+
+
+def _replace_breached(compiled, length, enforce_rules, blocklist, urandom=random_bytes):
+    """
+    Draw fresh candidates until one is not in the blocklist
+    """
+    for _ in range(MAX_BREACH_RETRIES):
+        password = _generate_one(compiled, length, enforce_rules, urandom)
+        if password not in blocklist:
+            return password
+    raise ValueError("Could not generate a password outside the breached-password list; "
+                     "try a longer length or more character types")
+
+
+def resize_password(policy, password):
+    """
+    Return a password for the policy that keeps as much of ``password`` as
+    possible: cut short when the policy is shorter, extended with fresh
+    characters when it is longer.
+
+    Meant for live previews, where the password should not jump around
+    while only the length changes. If the result would break the policy
+    (e.g. ``password`` was made with other options), a new password is
+    generated instead.
+    """
+    compiled = policy.validate()
+    length = policy.length
+    enforce_rules = policy.enforce_rules
+    kept = password[:length].encode('ascii', 'replace')
+    if kept.translate(None, compiled.charset) or (enforce_rules and compiled.size < 3):
+        return _generate_one(compiled, length, enforce_rules)
+
+    buf = bytearray(kept)
+    while len(buf) < length:
+        for char in compiled.sample(2 * (length - len(buf)) + 8):
+            if enforce_rules and buf and char == buf[-1]:
+                continue
+            buf.append(char)
+            if len(buf) == length:
+                break
+
+    if enforce_rules and (any(len(buf.translate(None, pool)) == length for pool in compiled.required)
+                          or any(a == b for a, b in zip(buf, buf[1:]))):
+        return _generate_one(compiled, length, enforce_rules)
+    return buf.decode('ascii')
+
+
+def generate_secure_password(compiled, length, urandom=random_bytes):
+    """
+    Generate a password that adheres to the security rules: at least one
+    character from each selected class and no consecutive repeats.
+
+    Every such password is equally likely. A repeat-free password is drawn
+    uniformly in a single O(n) pass (each character is a uniform step of 1
+    to size - 1 away from the previous one in the charset) and drawn again
+    if it misses a required class. Where that would happen often (short
+    passwords, small classes), the password is instead decoded from one
+    uniform number below the count of rule-abiding passwords.
+
+    ``urandom(n)`` supplies the random bytes (the OS CSPRNG by default).
+    """
+    return secure_password_bytes(compiled, length, urandom).decode('ascii')
+
+
+def secure_password_bytes(compiled, length, urandom=random_bytes):
+    """
+    generate_secure_password() returning the ASCII bytes, for callers that
+    write records into a buffer and never need a str
+    """
+    required = compiled.required
+    if length < len(required):
+        raise ValueError(f"Password length must be at least {len(required)} to include every character type")
+
+    charset = compiled.charset
+    size = compiled.size
+    if size < 3:
+        return _generate_alternating(charset, length, urandom)
+
+    if _class_odds(compiled, length) < MIN_CLASS_ODDS:
+        return _unrank_password(compiled, length, urandom)
+
+    step_table, step_rejected = _step_tables(size)
+    limit = _LIMITS[size - 1]
+    # Maps a charset index back to its character
+    index_table = charset + bytes(256 - size)
+    while True:
+        steps = b''
+        while len(steps) < length - 1:
+            missing = length - 1 - len(steps)
+            steps += urandom(missing * 256 // limit + 16).translate(step_table, step_rejected)
+        first = charset.find(compiled.sample(1, urandom))
+        indexes = bytes(total % size for total in accumulate(steps[:length - 1], initial=first))
+        buf = indexes.translate(index_table)
+        if not any(len(buf.translate(None, pool)) == length for pool in required):
+            return bytearray(buf)
+
+
+@lru_cache(maxsize=None)
+def _step_tables(size):
+    """
+    Translation table and rejected bytes that turn random bytes into steps
+    uniform over 1..size - 1
+    """
+    return bytes(b % (size - 1) + 1 for b in range(256)), bytes(range(_LIMITS[size - 1], 256))
+
+
+def secure_records(compiled, length, count, urandom=random_bytes):
+    """
+    Return ``count`` rule-abiding passwords as one bytearray of
+    ``count * length`` bytes.
+
+    The whole block is sampled uniformly in one go and only the records that
+    break a rule are drawn again, a few rounds at most, before falling back
+    to secure_password_bytes(). Policies whose random passwords rarely meet
+    the rules (long passwords over a small charset) use
+    secure_password_bytes() throughout.
+    """
+    required = compiled.required
+    size = compiled.size
+    if length < len(required) or size < 3 or _rule_odds(compiled, length) < MIN_RULE_ODDS:
+        return bytearray(b''.join(secure_password_bytes(compiled, length, urandom)
+                                  for _ in range(count)))
+
+    block = compiled.sample(count * length, urandom)
+    redraw = sorted(_broken_records(compiled, length, block))
+    for _ in range(MAX_REDRAW_ROUNDS):
+        if not redraw:
+            break
+        fresh = compiled.sample(len(redraw) * length, urandom)
+        broken = _broken_records(compiled, length, fresh)
+        still = []
+        for i, index in enumerate(redraw):
+            if i in broken:
+                still.append(index)
+            else:
+                block[index * length:(index + 1) * length] = fresh[i * length:(i + 1) * length]
+        redraw = still
+    for index in redraw:
+        block[index * length:(index + 1) * length] = secure_password_bytes(compiled, length, urandom)
+    return block
+
+
+def _rule_odds(compiled, length):
+    """
+    Rough chance that a uniformly sampled password meets the rules
+    """
+    size = compiled.size
+    return ((size - 1) / size) ** (length - 1) * _class_odds(compiled, length)
+
+
+def _class_odds(compiled, length):
+    """
+    Rough chance that a uniformly sampled password has every required class
+    """
+    size = compiled.size
+    odds = 1.0
+    for pool in compiled.required:
+        odds *= 1 - (1 - len(pool) / size) ** length
+    return odds
+
+
+def _unrank_password(compiled, length, urandom=random_bytes):
+    """
+    Decode a uniform number below the count of rule-abiding passwords into
+    the password of that rank, one character at a time
+    """
+    required = compiled.required
+    classes = len(required)
+    counts = _count_table(tuple(len(pool) for pool in required), length)
+    rank = _randbelow(counts[length][0][classes], urandom)
+
+    buf = bytearray(length)
+    seen = 0
+    prev = classes
+    for i in range(length):
+        rest = counts[length - 1 - i]
+        for cls, pool in enumerate(required):
+            ways = rest[seen | 1 << cls][cls]
+            block = (len(pool) - (cls == prev)) * ways
+            if rank < block:
+                break
+            rank -= block
+        pick, rank = divmod(rank, ways)
+        # Skip the previous character when staying in its class
+        if cls == prev and pick >= pool.find(buf[i - 1]):
+            pick += 1
+        buf[i] = pool[pick]
+        seen |= 1 << cls
+        prev = cls
+    return buf
+
+
+@lru_cache(maxsize=64)
+def _count_table(sizes, length):
+    """
+    counts[r][seen][prev]: the number of repeat-free ways to fill ``r`` more
+    positions so that every class ends up present, given the set of classes
+    ``seen`` so far (a bitmask) and the class of the previous character
+    (``len(sizes)`` before the first). Classes of ``sizes`` characters.
+    """
+    classes = len(sizes)
+    everything = (1 << classes) - 1
+    counts = [[[int(seen == everything)] * (classes + 1) for seen in range(1 << classes)]]
+    for _ in range(length):
+        last = counts[-1]
+        counts.append([[sum((size - (cls == prev)) * last[seen | 1 << cls][cls]
+                             for cls, size in enumerate(sizes))
+                        for prev in range(classes + 1)]
+                       for seen in range(1 << classes)])
+    return counts
+
+
+def _randbelow(limit, urandom=random_bytes):
+    """
+    Uniform integer in [0, limit) from ``urandom`` bytes, by rejection
+    """
+    bits = limit.bit_length()
+    size = (bits + 7) // 8
+    while True:
+        value = int.from_bytes(urandom(size), 'big') >> (8 * size - bits)
+        if value < limit:
+            return value
+
+
+def _broken_records(compiled, length, block):
+    """
+    Indexes of the ``length``-byte records in ``block`` that repeat a
+    character or miss a required class
+    """
+    # Byte i of the block XORed with itself shifted by one is zero exactly
+    # where block[i] == block[i + 1]; the last byte is XORed with zero
+    size = len(block)
+    shifted = int.from_bytes(block, 'little') ^ int.from_bytes(block[1:], 'little')
+    diff = shifted.to_bytes(size, 'little')
+    broken = set()
+    i = diff.find(0)
+    while 0 <= i < size - 1:
+        if i % length != length - 1:
+            broken.add(i // length)
+        i = diff.find(0, i + 1)
+    marks = block.translate(compiled.class_table)
+    find = marks.find
+    for mark in range(1, len(compiled.required) + 1):
+        for start in range(0, len(block), length):
+            if find(mark, start, start + length) < 0:
+                broken.add(start // length)
+    return broken
+
+
+def _generate_alternating(charset, length, urandom=random_bytes):
+    """
+    With one or two characters available, the only repeat-free passwords
+    alternate between them
+    """
+    if len(charset) < 2:
+        raise ValueError("At least two distinct characters are needed to avoid repeats")
+    first = urandom(1)[0] & 1
+    pair = charset[first:first + 1] + charset[1 - first:2 - first]
+    return (pair * (length // 2 + 1))[:length]
@@ -0,0 +1,154 @@
+"""
+Lightweight counters and histograms exported in the Prometheus text format.
+
+Counters are always exact. Hot-path stage timings are sampled: only one call
+in PASSWORD_METRICS_SAMPLE (default 16) is timed, so instrumentation costs a
+counter increment on the other calls. Set PASSWORD_METRICS=0 to turn
+everything off. Values are per process; with several server workers, scrape
+each one.
+"""
+from bisect import bisect_left
+from itertools import count
+import os
+import threading
+
+ENABLED = os.environ.get('PASSWORD_METRICS', '1') != '0'
+SAMPLE_EVERY = max(1, int(os.environ.get('PASSWORD_METRICS_SAMPLE', 16)))
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Seconds; password generation stages run in microseconds, requests in milliseconds
+STAGE_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 1e-2)
+REQUEST_BUCKETS = (1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2, 0.1, 0.5, 1.0)
+
+
+class Counter:
+    """
+    Monotonic counter with optional labels
+    """
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels=(), amount=1):
+        if not ENABLED:
+            return
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, labels=()):
+        return self._values.get(labels, 0)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} counter']
+        with self._lock:
+            values = sorted(self._values.items())
+        for labels, value in values:
+            lines.append(f'{self.name}{_format_labels(self.labelnames, labels)} {value}')
+        return lines
+
+
+class Histogram:
+    """
+    Histogram with fixed upper bounds and optional labels
+    """
+
+    def __init__(self, name, documentation, buckets, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        self.labelnames = labelnames
+        # labels -> [per-bucket counts (last is +Inf), sum]
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, labels=()):
+        if not ENABLED:
+            return
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            series = sorted((labels, list(counts), total) for labels, (counts, total) in self._series.items())
+        for labels, counts, total in series:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + ('+Inf',), counts):
+                cumulative += bucket_count
+                bucket_labels = _format_labels(self.labelnames + ('le',), labels + (str(bound),))
+                lines.append(f'{self.name}_bucket{bucket_labels} {cumulative}')
+            suffix = _format_labels(self.labelnames, labels)
+            lines.append(f'{self.name}_sum{suffix} {total}')
+            lines.append(f'{self.name}_count{suffix} {cumulative}')
+        return lines
+
+
+def _format_labels(names, values):
+    if not names:
+        return ''
+    pairs = ','.join('{}="{}"'.format(name, str(value).replace('\\', '\\\\').replace('"', '\\"'))
+                     for name, value in zip(names, values))
+    return '{' + pairs + '}'
+
+
+_ticks = count()
+
+
+def sample():
+    """
+    Return True for the calls whose stage timings should be recorded
+    """
+    return ENABLED and next(_ticks) % SAMPLE_EVERY == 0
+
+
+_policy_labels = {}
+
+
+def policy_label(policy):
+    """
+    Low-cardinality label for a PasswordPolicy: enabled classes, whether the
+    security rules apply and whether characters are excluded (not the length)
+    """
+    key = (policy.use_uppercase, policy.use_lowercase, policy.use_numbers,
+           policy.use_symbols, policy.enforce_rules,
+           bool(policy.exclude_chars or policy.exclude_presets))
+    label = _policy_labels.get(key)
+    if label is None:
+        classes = ''.join(flag for flag, enabled in zip('ulns', key) if enabled) or 'none'
+        label = _policy_labels[key] = (classes + (':rules' if key[4] else '')
+                                       + (':exclude' if key[5] else ''))
+    return label
+
+
+REQUESTS = Counter('password_requests_total', "Password requests by endpoint and policy",
+                   ('endpoint', 'policy'))
+PASSWORDS = Counter('password_generated_total', "Passwords generated; rate() gives passwords/sec",
+                    ('endpoint',))
+ERRORS = Counter('password_errors_total', "Requests answered with an error", ('endpoint',))
+RATE_LIMITED = Counter('password_rate_limited_total', "Requests refused with 429", ('endpoint',))
+STAGE_SECONDS = Histogram('password_stage_seconds', "Sampled time spent in each generation stage",
+                          STAGE_BUCKETS, ('stage',))
+REQUEST_SECONDS = Histogram('password_request_seconds', "Request handling time by endpoint",
+                            REQUEST_BUCKETS, ('endpoint',))
+
+REGISTRY = [REQUESTS, PASSWORDS, ERRORS, RATE_LIMITED, STAGE_SECONDS, REQUEST_SECONDS]
+
+
+def render(registry=REGISTRY):
+    """
+    Render every metric in the Prometheus text exposition format
+    """
+    lines = []
+    for metric in registry:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,80 @@
+"""
+Diceware-style passphrase generation.
+
+Words are picked uniformly from a packed Wordlist with 32-bit rejection
+sampling over the OS CSPRNG, so every word contributes exactly
+log2(len(wordlist)) bits of entropy.
+"""
+from collections import namedtuple
+import math
+
+from password_core.sources import random_bytes
+
+DIGITS = '0123456789'
+DEFAULT_WORDS = 6
+DEFAULT_SEPARATOR = '-'
+MAX_WORDS = 64
+MAX_DIGITS = 16
+
+_LIMIT_32 = 1 << 32
+
+Passphrase = namedtuple('Passphrase', ['passphrase', 'bits', 'bits_per_word'])
+
+
+def _random_indexes(count, upper, urandom=random_bytes):
+    """
+    Return ``count`` uniform random integers in [0, upper)
+    """
+    limit = _LIMIT_32 - _LIMIT_32 % upper
+    indexes = []
+    while len(indexes) < count:
+        block = urandom(4 * (count - len(indexes)) + 8)
+        for start in range(0, len(block) - 3, 4):
+            value = int.from_bytes(block[start:start + 4], 'big')
+            if value < limit:
+                indexes.append(value % upper)
+                if len(indexes) == count:
+                    break
+    return indexes
+
+
+def passphrase_entropy(wordlist_size, words, digits=0):
+    """
+    Entropy in bits of a passphrase; capitalization and separators are fixed
+    and add nothing, each injected digit adds log2(10)
+    """
+    return words * math.log2(wordlist_size) + digits * math.log2(len(DIGITS))
+
+
+def generate_passphrase(words=DEFAULT_WORDS, separator=DEFAULT_SEPARATOR, capitalize=False,
+                        digits=0, wordlist=None, urandom=random_bytes):
+    """
+    Generate a passphrase of ``words`` words joined by ``separator``.
+
+    ``capitalize`` upper-cases the first letter of every word and ``digits``
+    appends that many random digits, each to a randomly chosen word.
+    Returns a Passphrase with the passphrase and its entropy. ``urandom``
+    replaces the OS CSPRNG, e.g. with a sources.SeededSource stream.
+    """
+    if not isinstance(words, int) or not 1 <= words <= MAX_WORDS:
+        raise ValueError(f"Passphrase word count must be between 1 and {MAX_WORDS}")
+    if not isinstance(digits, int) or not 0 <= digits <= MAX_DIGITS:
+        raise ValueError(f"Passphrase digit count must be between 0 and {MAX_DIGITS}")
+    if not isinstance(separator, str):
+        raise ValueError("Passphrase separator must be a string")
+    if wordlist is None:
+        from password_core.wordlist import get_wordlist
+        wordlist = get_wordlist()
+    if len(wordlist) < 2:
+        raise ValueError("The wordlist needs at least two words")
+
+    chosen = [wordlist[index] for index in _random_indexes(words, len(wordlist), urandom)]
+    if capitalize:
+        chosen = [word[:1].upper() + word[1:] for word in chosen]
+    if digits:
+        for draw in _random_indexes(digits, words * len(DIGITS), urandom):
+            position, digit = divmod(draw, len(DIGITS))
+            chosen[position] += DIGITS[digit]
+
+    bits_per_word = math.log2(len(wordlist))
+    return Passphrase(separator.join(chosen), passphrase_entropy(len(wordlist), words, digits), bits_per_word)
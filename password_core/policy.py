@@ -0,0 +1,227 @@
+"""
+Password policy model and compiled character-set tables.
+
+A PasswordPolicy describes what the user asked for. Its charset is built by
+concatenating the selected character classes and stripping excluded
+characters. The result only depends on the options, so it is compiled once
+into lookup tables and kept in a small LRU cache.
+"""
+from functools import lru_cache
+import math
+
+from password_core.sources import random_bytes
+
+UPPERCASE = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+LOWERCASE = 'abcdefghijklmnopqrstuvwxyz'
+NUMBERS = '0123456789'
+SYMBOLS = '!@#$%^&*()_+-=[]{}|;:,.<>?'
+
+# Character classes in the order they are added to the charset
+CHARACTER_SETS = (
+    ('uppercase', UPPERCASE),
+    ('lowercase', LOWERCASE),
+    ('numbers', NUMBERS),
+    ('symbols', SYMBOLS),
+)
+
+# Named exclusion sets that can be combined with custom exclude_chars
+EXCLUSION_PRESETS = {
+    # Characters easily confused with one another when read or typed
+    'ambiguous': '0O1lI|',
+    # Characters an unquoted shell word would interpret
+    'shell': '!#$&*()|;<>?[]{}^',
+    # Everything but the RFC 3986 unreserved characters
+    'url': '!@#$%^&*()+=[]{}|;:,<>?',
+    'brackets': '()[]{}<>',
+}
+
+POLICY_CACHE_SIZE = 256
+
+MIN_LENGTH = 4
+
+
+class CompiledPolicy:
+    """
+    Charset lookup tables for one combination of generation options.
+
+    ``table`` maps every byte value onto the charset and ``rejected`` lists
+    the byte values at or above ``limit``, the largest multiple of the charset
+    size. ``os.urandom(n).translate(table, rejected)`` therefore yields
+    uniformly distributed charset bytes. ``class_sets`` holds the remaining
+    characters of each selected class after exclusions, and ``required`` the
+    non-empty ones as bytes, i.e. the classes a rule-abiding password must
+    draw from. ``class_table`` maps each character onto the 1-based index of
+    its class in ``required``, so translating a block with it shows which
+    class every position came from. ``full_size`` is the charset size
+    before exclusions.
+    """
+    __slots__ = ('flags', 'exclude', 'charset', 'text', 'size', 'full_size', 'limit',
+                 'table', 'rejected', 'class_sets', 'required', 'class_table')
+
+    def __init__(self, flags, exclude):
+        self.flags = flags
+        self.exclude = exclude
+
+        class_sets = {}
+        full_size = 0
+        for (name, chars), enabled in zip(CHARACTER_SETS, flags):
+            if enabled:
+                class_sets[name] = ''.join(c for c in chars if c not in exclude)
+                full_size += len(chars)
+        self.full_size = full_size
+        self.class_sets = class_sets
+        self.required = tuple(chars.encode('ascii') for chars in class_sets.values() if chars)
+        class_table = bytearray(256)
+        for mark, pool in enumerate(self.required, 1):
+            for char in pool:
+                class_table[char] = mark
+        self.class_table = bytes(class_table)
+
+        self.text = ''.join(class_sets.values())
+        self.charset = self.text.encode('ascii')
+        self.size = len(self.charset)
+
+        if self.size:
+            self.limit = 256 - (256 % self.size)
+            self.table = bytes(self.charset[b % self.size] for b in range(256))
+            self.rejected = bytes(range(self.limit, 256))
+        else:
+            self.limit = 0
+            self.table = None
+            self.rejected = None
+
+    def sample(self, count, urandom=random_bytes):
+        """
+        Return ``count`` uniformly chosen charset bytes drawn from ``urandom``
+        (the OS CSPRNG unless a sources.SeededSource stream is passed)
+        """
+        pool = bytearray()
+        while len(pool) < count:
+            # Over-draw by the expected rejection rate to avoid extra rounds
+            missing = count - len(pool)
+            block = urandom(missing * 256 // self.limit + 64)
+            pool += block.translate(self.table, self.rejected)
+        del pool[count:]
+        return pool
+
+    def excluded_bits(self, length):
+        """
+        Entropy in bits that the exclusions take away from a ``length``
+        character password (per-character uniform estimate)
+        """
+        if not self.size or self.size == self.full_size:
+            return 0.0
+        return length * math.log2(self.full_size / self.size)
+
+
+@lru_cache(maxsize=POLICY_CACHE_SIZE)
+def _compile(flags, exclude):
+    return CompiledPolicy(flags, exclude)
+
+
+def exclusion_set(exclude_chars='', presets=()):
+    """
+    Normalise custom characters plus named EXCLUSION_PRESETS into the
+    frozenset the compile caches are keyed by; ``presets`` is a name or a
+    sequence of names. ``exclude_chars`` may be None for no characters.
+    Raises ValueError for anything but a string of characters and known
+    preset names.
+    """
+    if exclude_chars is None:
+        exclude_chars = ''
+    elif not isinstance(exclude_chars, str):
+        raise ValueError("Excluded characters must be a string")
+    if not presets:
+        return frozenset(exclude_chars)
+    if isinstance(presets, str):
+        presets = (presets,)
+    elif not isinstance(presets, (list, tuple, set, frozenset)):
+        raise ValueError("Exclusion presets must be a preset name or a list of names")
+    excluded = set(exclude_chars)
+    for name in presets:
+        if not isinstance(name, str) or name not in EXCLUSION_PRESETS:
+            raise ValueError(f"Unknown exclusion preset {name!r}; "
+                             f"choose from {', '.join(EXCLUSION_PRESETS)}")
+        excluded.update(EXCLUSION_PRESETS[name])
+    return frozenset(excluded)
+
+
+def compile_policy(use_uppercase=True, use_lowercase=True, use_numbers=True,
+                   use_symbols=True, exclude_chars='', exclude_presets=()):
+    """
+    Return the cached CompiledPolicy for these options
+    """
+    flags = (bool(use_uppercase), bool(use_lowercase), bool(use_numbers), bool(use_symbols))
+    return _compile(flags, exclusion_set(exclude_chars, exclude_presets))
+
+
+class PasswordPolicy:
+    """
+    Generation options shared by every front end.
+
+    Field names follow the keyword arguments of PasswordGenerator.generate_password().
+    """
+    __slots__ = ('length', 'use_uppercase', 'use_lowercase', 'use_numbers',
+                 'use_symbols', 'exclude_chars', 'enforce_rules', 'exclude_presets')
+
+    def __init__(self, length=12, use_uppercase=True, use_lowercase=True,
+                 use_numbers=True, use_symbols=True, exclude_chars='',
+                 enforce_rules=True, exclude_presets=()):
+        self.length = length
+        self.use_uppercase = use_uppercase
+        self.use_lowercase = use_lowercase
+        self.use_numbers = use_numbers
+        self.use_symbols = use_symbols
+        self.exclude_chars = exclude_chars
+        self.enforce_rules = enforce_rules
+        self.exclude_presets = exclude_presets
+
+    @classmethod
+    def from_json(cls, data):
+        """
+        Build a policy from the fields of a /generate JSON payload
+        """
+        return cls(
+            length=data.get('length', 12),
+            use_uppercase=data.get('uppercase', True),
+            use_lowercase=data.get('lowercase', True),
+            use_numbers=data.get('numbers', True),
+            use_symbols=data.get('symbols', True),
+            exclude_chars=data.get('exclude', ''),
+            enforce_rules=data.get('enforce_rules', True),
+            exclude_presets=data.get('exclude_presets', ()),
+        )
+
+    @property
+    def key(self):
+        """
+        Hashable identity of the policy, e.g. for caches and pools
+        """
+        return (self.length, bool(self.use_uppercase), bool(self.use_lowercase),
+                bool(self.use_numbers), bool(self.use_symbols),
+                exclusion_set(self.exclude_chars, self.exclude_presets), bool(self.enforce_rules))
+
+    def __repr__(self):
+        fields = ', '.join(f'{name}={getattr(self, name)!r}' for name in self.__slots__)
+        return f'PasswordPolicy({fields})'
+
+    @property
+    def compiled(self):
+        """
+        The cached CompiledPolicy for this policy's character options
+        """
+        return compile_policy(self.use_uppercase, self.use_lowercase, self.use_numbers,
+                              self.use_symbols, self.exclude_chars, self.exclude_presets)
+
+    def validate(self):
+        """
+        Return the compiled policy, or raise ValueError if nothing can be generated
+        """
+        compiled = self.compiled
+        if not any(compiled.flags):
+            raise ValueError("At least one character type must be selected")
+        if not compiled.size:
+            raise ValueError("No characters available after exclusions")
+        if not isinstance(self.length, int) or self.length < MIN_LENGTH:
+            raise ValueError(f"Password length must be at least {MIN_LENGTH} characters")
+        return compiled
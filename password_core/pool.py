@@ -0,0 +1,300 @@
+"""
+Pre-generated password pools for the asyncio server mode.
+
+A PasswordPool keeps ready-made passwords for one policy between a low and a
+high watermark. A PoolManager creates pools for policies once they have been
+requested often enough, hands out passwords from them, and runs the
+background task that tops them up, so the request path normally just pops an
+entry. Refill batches are generated on the loop's default executor, so the
+event loop keeps answering requests meanwhile, and only policies up to
+``max_length`` characters are pooled. Entries are generated straight into
+bytearrays (no str copies) and zeroed when they are handed out, expire, or
+the pool is cleared.
+"""
+import asyncio
+from collections import deque
+import time
+
+from password_core.engine import generate_password, generate_records
+
+DEFAULT_LOW_WATERMARK = 256
+DEFAULT_HIGH_WATERMARK = 1024
+DEFAULT_MAX_AGE = 300.0
+DEFAULT_REFILL_BATCH = 128
+DEFAULT_MAX_POOLS = 16
+DEFAULT_PROMOTE_AFTER = 5
+DEFAULT_REFILL_INTERVAL = 1.0
+DEFAULT_MAX_POOL_LENGTH = 256
+
+
+def _wipe(buf):
+    buf[:] = bytes(len(buf))
+
+
+class PasswordPool:
+    """
+    Bounded FIFO of ready passwords for one policy
+    """
+
+    def __init__(self, policy, low_watermark=DEFAULT_LOW_WATERMARK,
+                 high_watermark=DEFAULT_HIGH_WATERMARK, max_age=DEFAULT_MAX_AGE,
+                 blocklist=None):
+        if not 0 <= low_watermark <= high_watermark:
+            raise ValueError("Watermarks must satisfy 0 <= low <= high")
+        policy.validate()
+        self.policy = policy
+        self.low_watermark = low_watermark
+        self.high_watermark = high_watermark
+        self.max_age = max_age
+        self.blocklist = blocklist
+        self._entries = deque()
+
+        self.hits = 0
+        self.misses = 0
+        self.generated = 0
+        self.discarded = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def needs_refill(self):
+        return len(self._entries) < self.low_watermark
+
+    def missing(self, limit=None):
+        """
+        Number of passwords to generate to reach the high watermark, at most ``limit``
+        """
+        count = self.high_watermark - len(self._entries)
+        if limit is not None:
+            count = min(count, limit)
+        return max(count, 0)
+
+    def generate(self, count):
+        """
+        Generate ``count`` entries as one bytearray for add(); safe to run
+        off the event loop, since it does not touch the pool
+        """
+        return generate_records(self.policy, count, self.blocklist)
+
+    def add(self, block):
+        """
+        Split a bytearray from generate() into entries and wipe it
+        """
+        now = time.monotonic()
+        length = self.policy.length
+        self._entries.extend((now, block[start:start + length])
+                             for start in range(0, len(block), length))
+        self.generated += len(block) // length
+        _wipe(block)
+
+    def refill(self, limit=None):
+        """
+        Top the pool up towards the high watermark, adding at most ``limit``
+        passwords; returns how many were added
+        """
+        count = self.missing(limit)
+        if count:
+            self.add(self.generate(count))
+        return count
+
+    def pop(self):
+        """
+        Return the oldest fresh password, or None if the pool is empty
+        """
+        self.discard_stale()
+        if not self._entries:
+            self.misses += 1
+            return None
+        _, buf = self._entries.popleft()
+        password = buf.decode('ascii')
+        _wipe(buf)
+        self.hits += 1
+        return password
+
+    def discard_stale(self):
+        """
+        Wipe and drop entries older than ``max_age`` seconds
+        """
+        if self.max_age is None:
+            return
+        cutoff = time.monotonic() - self.max_age
+        entries = self._entries
+        while entries and entries[0][0] < cutoff:
+            _wipe(entries.popleft()[1])
+            self.discarded += 1
+
+    def clear(self):
+        while self._entries:
+            _wipe(self._entries.popleft()[1])
+
+    def metrics(self):
+        return {
+            'size': len(self._entries),
+            'low_watermark': self.low_watermark,
+            'high_watermark': self.high_watermark,
+            'hits': self.hits,
+            'misses': self.misses,
+            'generated': self.generated,
+            'discarded': self.discarded,
+        }
+
+
+class PoolManager:
+    """
+    Owns one PasswordPool per popular policy and the task that refills them.
+
+    A policy gets a pool once it has been requested ``promote_after`` times,
+    up to ``max_pools`` pools, provided it is at most ``max_length``
+    characters long. Requests for other policies, or arriving while a pool
+    is empty, are generated on demand.
+    """
+
+    def __init__(self, low_watermark=DEFAULT_LOW_WATERMARK,
+                 high_watermark=DEFAULT_HIGH_WATERMARK, max_age=DEFAULT_MAX_AGE,
+                 refill_batch=DEFAULT_REFILL_BATCH, max_pools=DEFAULT_MAX_POOLS,
+                 promote_after=DEFAULT_PROMOTE_AFTER,
+                 refill_interval=DEFAULT_REFILL_INTERVAL, blocklist=None,
+                 max_length=DEFAULT_MAX_POOL_LENGTH):
+        self.low_watermark = low_watermark
+        self.high_watermark = high_watermark
+        self.max_age = max_age
+        self.refill_batch = refill_batch
+        self.max_pools = max_pools
+        self.promote_after = promote_after
+        self.refill_interval = refill_interval
+        self.blocklist = blocklist
+        self.max_length = max_length
+
+        self._pools = {}
+        self._demand = {}
+        self._wake = None
+        self._stopping = None
+        self._task = None
+        self.on_demand = 0
+
+    def add_policy(self, policy):
+        """
+        Create (or return) the pool for a policy, e.g. to pre-warm it at startup
+        """
+        key = policy.key
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = PasswordPool(policy, self.low_watermark, self.high_watermark,
+                                self.max_age, self.blocklist)
+            self._pools[key] = pool
+            self._demand.pop(key, None)
+            self._request_refill()
+        return pool
+
+    def get(self, policy):
+        """
+        Return a password for the policy, from its pool when possible
+        """
+        policy.validate()
+        key = policy.key
+        pool = self._pools.get(key)
+        if pool is not None:
+            password = pool.pop()
+            if pool.needs_refill():
+                self._request_refill()
+            if password is not None:
+                return password
+        elif len(self._pools) < self.max_pools and policy.length <= self.max_length:
+            seen = self._demand.get(key, 0) + 1
+            if seen >= self.promote_after:
+                password = generate_password(policy, self.blocklist)
+                self.add_policy(policy)
+                self.on_demand += 1
+                return password
+            if len(self._demand) >= 1024:
+                self._demand.clear()
+            self._demand[key] = seen
+
+        self.on_demand += 1
+        return generate_password(policy, self.blocklist)
+
+    def _request_refill(self):
+        if self._wake is not None:
+            self._wake.set()
+
+    async def run(self):
+        """
+        Refill loop; tops pools up in small batches, yielding to the event
+        loop between batches so request handling is never starved
+        """
+        self._wake = asyncio.Event()
+        self._stopping = asyncio.Event()
+        self._wake.set()
+        stopping = asyncio.ensure_future(self._stopping.wait())
+        try:
+            while not self._stopping.is_set():
+                wake = asyncio.ensure_future(self._wake.wait())
+                try:
+                    await asyncio.wait({wake, stopping}, timeout=self.refill_interval,
+                                       return_when=asyncio.FIRST_COMPLETED)
+                finally:
+                    wake.cancel()
+                if self._stopping.is_set():
+                    break
+                self._wake.clear()
+                for pool in list(self._pools.values()):
+                    pool.discard_stale()
+                    if pool.needs_refill():
+                        await self._refill(pool)
+        finally:
+            stopping.cancel()
+
+    async def _refill(self, pool):
+        """
+        Top a pool up in batches generated on the default executor
+        """
+        loop = asyncio.get_running_loop()
+        while not self._stopping.is_set():
+            count = pool.missing(self.refill_batch)
+            if not count:
+                break
+            try:
+                block = await loop.run_in_executor(None, pool.generate, count)
+            except ValueError:
+                # E.g. every candidate is breached; requests get the error on demand
+                break
+            if self._stopping.is_set():
+                _wipe(block)
+                break
+            pool.add(block)
+
+    def start(self):
+        """
+        Start the refill task on the running event loop
+        """
+        if self._task is None:
+            self._task = asyncio.ensure_future(self.run())
+        return self._task
+
+    async def stop(self):
+        """
+        Stop the refill task and wipe every pool
+        """
+        if self._task is not None:
+            if self._stopping is not None:
+                self._stopping.set()
+            else:
+                # The task has not run yet, so there is no loop to wind down
+                self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self._wake = self._stopping = None
+        for pool in self._pools.values():
+            pool.clear()
+
+    def metrics(self):
+        return {
+            'pools': [
+                dict(pool.metrics(), policy=repr(pool.policy))
+                for pool in self._pools.values()
+            ],
+            'on_demand': self.on_demand,
+        }
@@ -0,0 +1,163 @@
+"""
+Opt-in sampling profiler producing collapsed stacks for flame graphs.
+
+While a profile is active, a background thread samples the profiled
+thread's stack every PASSWORD_PROFILE_INTERVAL seconds (default 0.001). The
+slowest PASSWORD_PROFILE_KEEP (default 20) profiles are kept in memory, one
+collapsed-stack line per distinct stack::
+
+    /generate;generate_password (app.py:430);generate_secure_password (engine.py:94) 3
+
+which flamegraph.pl, speedscope or inferno read directly. Set
+PASSWORD_PROFILE=1 to profile every request or GUI generate action, and
+PASSWORD_PROFILE_OUTPUT to a file to have the slowest profiles written there
+at exit. When profiling is off, nothing runs except the ENABLED check.
+"""
+import atexit
+import heapq
+import os
+import sys
+import threading
+import time
+
+ENABLED = os.environ.get('PASSWORD_PROFILE', '0') not in ('', '0')
+INTERVAL = float(os.environ.get('PASSWORD_PROFILE_INTERVAL', 0.001))
+KEEP = int(os.environ.get('PASSWORD_PROFILE_KEEP', 20))
+OUTPUT = os.environ.get('PASSWORD_PROFILE_OUTPUT')
+
+
+class Profile:
+    """
+    Stack samples of one profiled request or action
+    """
+    __slots__ = ('name', 'thread_id', 'started', 'duration', 'samples')
+
+    def __init__(self, name, thread_id):
+        self.name = name
+        self.thread_id = thread_id
+        self.started = time.perf_counter()
+        self.duration = 0.0
+        # collapsed stack -> sample count
+        self.samples = {}
+
+    def __lt__(self, other):
+        return self.duration < other.duration
+
+    def add(self, frame):
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+            frame = frame.f_back
+        stack.append(self.name)
+        key = ';'.join(reversed(stack))
+        self.samples[key] = self.samples.get(key, 0) + 1
+
+    def collapsed(self):
+        """
+        Collapsed-stack lines; profiles shorter than the sampling interval
+        may have none
+        """
+        return ''.join(f'{stack} {count}\n' for stack, count in self.samples.items())
+
+
+class Profiler:
+    """
+    Samples every active profile from one background thread and keeps the
+    slowest ``keep`` finished profiles
+    """
+
+    def __init__(self, interval=INTERVAL, keep=KEEP):
+        self.interval = interval
+        self.keep = keep
+        self._active = {}
+        self._slowest = []
+        self._lock = threading.Lock()
+        self._thread = None
+        self._switch_interval = None
+
+    def start(self, name):
+        """
+        Start profiling the calling thread; pass the result to stop()
+        """
+        profile = Profile(name, threading.get_ident())
+        with self._lock:
+            self._active[profile.thread_id] = profile
+            if self._thread is None:
+                # The sampler can only look at stacks when it holds the GIL,
+                # so let it take the GIL at least once per interval
+                self._switch_interval = sys.getswitchinterval()
+                sys.setswitchinterval(min(self._switch_interval, self.interval))
+                self._thread = threading.Thread(target=self._run, name='password-profiler', daemon=True)
+                self._thread.start()
+        return profile
+
+    def stop(self, profile):
+        profile.duration = time.perf_counter() - profile.started
+        with self._lock:
+            self._active.pop(profile.thread_id, None)
+            if len(self._slowest) < self.keep:
+                heapq.heappush(self._slowest, profile)
+            elif self._slowest and self._slowest[0].duration < profile.duration:
+                heapq.heapreplace(self._slowest, profile)
+        return profile
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._active:
+                    sys.setswitchinterval(self._switch_interval)
+                    self._thread = None
+                    return
+                frames = sys._current_frames()
+                for thread_id, profile in self._active.items():
+                    frame = frames.get(thread_id)
+                    if frame is not None:
+                        profile.add(frame)
+
+    def slowest(self):
+        """
+        Finished profiles kept so far, slowest first
+        """
+        with self._lock:
+            return sorted(self._slowest, reverse=True)
+
+    def collapsed(self):
+        """
+        Collapsed stacks of the slowest profiles, ready for a flame graph
+        """
+        return ''.join(profile.collapsed() for profile in self.slowest())
+
+    def write(self, path):
+        with open(path, 'w') as f:
+            f.write(self.collapsed())
+
+
+class profile_section:
+    """
+    Context manager profiling a block when profiling is enabled (or
+    ``force`` is true) and doing nothing otherwise
+    """
+    __slots__ = ('name', 'force', '_profile')
+
+    def __init__(self, name, force=False):
+        self.name = name
+        self.force = force
+        self._profile = None
+
+    def __enter__(self):
+        if ENABLED or self.force:
+            self._profile = profiler.start(self.name)
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._profile is not None:
+            profiler.stop(self._profile)
+        return False
+
+
+profiler = Profiler()
+
+if ENABLED and OUTPUT:
+    atexit.register(lambda: profiler.write(OUTPUT))
@@ -0,0 +1,184 @@
+"""
+Per-client token buckets for the HTTP front ends.
+
+Every client has two buckets: one counting requests and one counting
+passwords generated. Buckets refill continuously at ``rate`` tokens per
+second up to ``burst``. A request that would overdraw either bucket is
+refused straight away with the number of seconds after which it would
+succeed, so nothing ever queues.
+
+RateLimiter keeps the buckets in a fixed-size in-process table and evicts
+the least recently seen client when it is full. SharedRateLimiter keeps
+them in a memory-mapped file instead, so that every worker process on a
+machine enforces the same quota.
+"""
+from collections import OrderedDict
+from hashlib import blake2b
+import mmap
+import os
+import struct
+import threading
+import time
+
+DEFAULT_REQUEST_RATE = 20.0
+DEFAULT_REQUEST_BURST = 40.0
+DEFAULT_PASSWORD_RATE = 50000.0
+DEFAULT_PASSWORD_BURST = 10000000.0
+DEFAULT_MAX_CLIENTS = 4096
+
+
+class RateLimiter:
+    """
+    In-process token buckets for up to ``max_clients`` clients
+    """
+
+    def __init__(self, request_rate=DEFAULT_REQUEST_RATE, request_burst=DEFAULT_REQUEST_BURST,
+                 password_rate=DEFAULT_PASSWORD_RATE, password_burst=DEFAULT_PASSWORD_BURST,
+                 max_clients=DEFAULT_MAX_CLIENTS, clock=time.monotonic):
+        if min(request_rate, request_burst, password_rate, password_burst) <= 0:
+            raise ValueError("Rate limits must be positive")
+        if max_clients < 1:
+            raise ValueError("Rate limiter needs room for at least one client")
+        self.limits = (request_rate, request_burst, password_rate, password_burst)
+        self.max_clients = max_clients
+        self.clock = clock
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def check(self, client, passwords=1):
+        """
+        Charge one request and ``passwords`` passwords to ``client``.
+
+        Returns 0.0 if the request may go ahead, otherwise the number of
+        seconds to wait before retrying. Raises ValueError if ``passwords``
+        is more than the password burst, since no wait would help.
+        """
+        _check_cost(passwords, self.limits)
+        now = self.clock()
+        with self._lock:
+            bucket = self._buckets.get(client)
+            if bucket is None:
+                if len(self._buckets) >= self.max_clients:
+                    self._buckets.popitem(last=False)
+                bucket = self._buckets[client] = [self.limits[1], self.limits[3], now]
+            else:
+                self._buckets.move_to_end(client)
+            bucket[0], bucket[1], wait = _take(bucket[0], bucket[1], now - bucket[2], passwords, self.limits)
+            bucket[2] = now
+        return wait
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+class SharedRateLimiter:
+    """
+    Token buckets stored in a memory-mapped file shared by every process
+    that opens it.
+
+    The file is a set-associative table of (client hash, request tokens,
+    password tokens, last update) slots, ``WAYS`` slots per set. A new client
+    takes the least recently updated slot of its set. Updates are serialised
+    with flock(), so this backend needs a POSIX system.
+    """
+    SLOT = struct.Struct('<Qddd')
+    WAYS = 4
+
+    def __init__(self, path, request_rate=DEFAULT_REQUEST_RATE, request_burst=DEFAULT_REQUEST_BURST,
+                 password_rate=DEFAULT_PASSWORD_RATE, password_burst=DEFAULT_PASSWORD_BURST,
+                 max_clients=DEFAULT_MAX_CLIENTS, clock=time.time):
+        try:
+            import fcntl
+        except ImportError:
+            raise ValueError("A shared rate limit file needs a POSIX system (fcntl)")
+        if min(request_rate, request_burst, password_rate, password_burst) <= 0:
+            raise ValueError("Rate limits must be positive")
+        self.limits = (request_rate, request_burst, password_rate, password_burst)
+        self.sets = max(1, max_clients // self.WAYS)
+        self.path = path
+        # Wall-clock time, because every process needs the same clock
+        self.clock = clock
+        self._flock = fcntl.flock
+        self._lock_ex = fcntl.LOCK_EX
+        self._lock_un = fcntl.LOCK_UN
+        self._lock = threading.Lock()
+
+        size = self.sets * self.WAYS * self.SLOT.size
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        if os.fstat(self._fd).st_size < size:
+            os.ftruncate(self._fd, size)
+        self._map = mmap.mmap(self._fd, size)
+
+    def check(self, client, passwords=1):
+        """
+        Same contract as RateLimiter.check()
+        """
+        _check_cost(passwords, self.limits)
+        key = int.from_bytes(blake2b(client.encode('utf-8'), digest_size=8).digest(), 'little') or 1
+        base = (key % self.sets) * self.WAYS * self.SLOT.size
+        slot = self.SLOT
+        now = self.clock()
+
+        with self._lock:
+            self._flock(self._fd, self._lock_ex)
+            try:
+                victim, oldest = base, None
+                for offset in range(base, base + self.WAYS * slot.size, slot.size):
+                    slot_key, requests, passwords_left, last = slot.unpack_from(self._map, offset)
+                    if slot_key == key:
+                        break
+                    if oldest is None or last < oldest:
+                        victim, oldest = offset, last
+                else:
+                    offset = victim
+                    requests, passwords_left, last = self.limits[1], self.limits[3], now
+                requests, passwords_left, wait = _take(
+                    requests, passwords_left, now - last, passwords, self.limits)
+                slot.pack_into(self._map, offset, key, requests, passwords_left, now)
+            finally:
+                self._flock(self._fd, self._lock_un)
+        return wait
+
+    def close(self):
+        self._map.close()
+        os.close(self._fd)
+
+
+def _check_cost(passwords, limits):
+    if passwords > limits[3]:
+        raise ValueError(f"Requests are limited to {int(limits[3])} passwords per client")
+
+
+def _take(requests, passwords, elapsed, cost, limits):
+    """
+    Refill both buckets for ``elapsed`` seconds and try to take one request
+    and ``cost`` passwords; returns (requests, passwords, wait)
+    """
+    request_rate, request_burst, password_rate, password_burst = limits
+    elapsed = max(elapsed, 0.0)
+    requests = min(request_burst, requests + elapsed * request_rate)
+    passwords = min(password_burst, passwords + elapsed * password_rate)
+    if requests >= 1 and passwords >= cost:
+        return requests - 1, passwords - cost, 0.0
+    wait = max((1 - requests) / request_rate, (cost - passwords) / password_rate)
+    return requests, passwords, wait
+
+
+def rate_limiter_from_env(environ=os.environ):
+    """
+    Build the limiter configured by the PASSWORD_RATE_* environment
+    variables, or return None when PASSWORD_RATE_LIMIT=0
+    """
+    if environ.get('PASSWORD_RATE_LIMIT', '1') == '0':
+        return None
+    options = {
+        'request_rate': float(environ.get('PASSWORD_RATE_REQUESTS', DEFAULT_REQUEST_RATE)),
+        'request_burst': float(environ.get('PASSWORD_RATE_REQUEST_BURST', DEFAULT_REQUEST_BURST)),
+        'password_rate': float(environ.get('PASSWORD_RATE_PASSWORDS', DEFAULT_PASSWORD_RATE)),
+        'password_burst': float(environ.get('PASSWORD_RATE_PASSWORD_BURST', DEFAULT_PASSWORD_BURST)),
+        'max_clients': int(environ.get('PASSWORD_RATE_CLIENTS', DEFAULT_MAX_CLIENTS)),
+    }
+    shared_path = environ.get('PASSWORD_RATE_SHARED')
+    if shared_path:
+        return SharedRateLimiter(shared_path, **options)
+    return RateLimiter(**options)
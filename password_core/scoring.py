@@ -0,0 +1,235 @@
+"""
+Password strength scoring shared by the web app and the GUI.
+
+estimate_entropy() makes a single pass over the password using precomputed
+per-codepoint class and character-pair tables, and score_password() derives
+the Weak/Fair/Good/Strong criteria score from the same pass.
+"""
+from collections import namedtuple
+import math
+
+MAX_SCORE = 8
+
+# Character class bits
+LOWER = 1
+UPPER = 2
+DIGIT = 4
+SYMBOL = 8
+OTHER = 16
+
+# Alphabet size a brute-force attacker has to cover for each class
+CLASS_SIZES = {LOWER: 26, UPPER: 26, DIGIT: 10, SYMBOL: 33, OTHER: 100}
+
+# Bits credited to a character that merely continues a pattern
+REPEAT_BITS = 1.0
+SEQUENCE_BITS = 1.0
+WALK_BITS = math.log2(6)
+
+# Kinds of character pairs in the pattern table
+_SEQUENCE = 1
+_WALK = 2
+
+_KEYBOARD_ROWS = (
+    ('`1234567890-=', '~!@#$%^&*()_+'),
+    ('qwertyuiop[]\\', 'QWERTYUIOP{}|'),
+    ("asdfghjkl;'", 'ASDFGHJKL:"'),
+    ('zxcvbnm,./', 'ZXCVBNM<>?'),
+)
+
+StrengthScore = namedtuple('StrengthScore', ['score', 'max_score', 'percent', 'label', 'bits'])
+
+EntropyEstimate = namedtuple('EntropyEstimate', [
+    'bits', 'alphabet_size', 'class_mask', 'repeats', 'sequences', 'keyboard_walks'
+])
+
+
+def _build_class_table():
+    table = bytearray(128)
+    for code in range(128):
+        char = chr(code)
+        if 'a' <= char <= 'z':
+            table[code] = LOWER
+        elif 'A' <= char <= 'Z':
+            table[code] = UPPER
+        elif '0' <= char <= '9':
+            table[code] = DIGIT
+        elif code >= 32:
+            table[code] = SYMBOL
+        else:
+            table[code] = OTHER
+    return bytes(table)
+
+
+def _build_pair_table(class_of):
+    """
+    Flag every ASCII character pair (prev << 7 | next) that continues an
+    alphabetical/numerical sequence or a walk between neighbouring keys
+    """
+    table = bytearray(128 * 128)
+
+    # Keys on a US QWERTY layout by (row, column), shifted and unshifted
+    keys = {}
+    for row, (plain, shifted) in enumerate(_KEYBOARD_ROWS):
+        for column, chars in enumerate(zip(plain, shifted)):
+            keys[row, column] = [ord(char) for char in chars]
+    for (row, column), codes in keys.items():
+        for neighbour in (keys.get((row + dr, column + dc))
+                          for dr in (-1, 0, 1) for dc in (-1, 0, 1)):
+            if neighbour:
+                for a in codes:
+                    for b in neighbour:
+                        if a != b:
+                            table[a << 7 | b] = _WALK
+
+    for code in range(1, 127):
+        if class_of[code] in (LOWER, UPPER, DIGIT):
+            for step in (-1, 1):
+                if class_of[code + step] == class_of[code]:
+                    table[code << 7 | code + step] = _SEQUENCE
+    return bytes(table)
+
+
+_CLASS_OF = _build_class_table()
+_PAIRS = _build_pair_table(_CLASS_OF)
+
+# Effective alphabet size and bits per character for every class mask
+_ALPHABET_SIZES = tuple(
+    sum(size for bit, size in CLASS_SIZES.items() if mask & bit) for mask in range(32)
+)
+_BITS_PER_CHAR = tuple(math.log2(size) if size else 0.0 for size in _ALPHABET_SIZES)
+
+
+def estimate_entropy(password, _class_of=_CLASS_OF, _pairs=_PAIRS):
+    """
+    Estimate the entropy of a password in bits.
+
+    Every character is worth log2 of the alphabet implied by the classes the
+    password uses, except characters that repeat the previous one, continue
+    a sequence such as "abc"/"321", or walk to a neighbouring keyboard key,
+    which only earn a small fixed number of bits.
+    """
+    mask = 0
+    repeats = sequences = walks = 0
+    prev = 1 << 21  # above any code point, so the first character never matches
+
+    for code in map(ord, password):
+        if code < 128:
+            mask |= _class_of[code]
+            if code == prev:
+                repeats += 1
+            elif prev < 128:
+                kind = _pairs[prev << 7 | code]
+                if kind == _SEQUENCE:
+                    sequences += 1
+                elif kind == _WALK:
+                    walks += 1
+        else:
+            mask |= OTHER
+            if code == prev:
+                repeats += 1
+        prev = code
+
+    return _make_estimate(len(password), mask, repeats, sequences, walks)
+
+
+def _make_estimate(length, mask, repeats, sequences, walks):
+    per_char = _BITS_PER_CHAR[mask]
+    plain = length - repeats - sequences - walks
+    bits = (plain * per_char
+            + repeats * min(REPEAT_BITS, per_char)
+            + sequences * min(SEQUENCE_BITS, per_char)
+            + walks * min(WALK_BITS, per_char))
+    return EntropyEstimate(bits, _ALPHABET_SIZES[mask], mask, repeats, sequences, walks)
+
+
+def score_password(password):
+    """
+    Score a password against the strength criteria
+    """
+    return _score_estimate(len(password), estimate_entropy(password))
+
+
+def _score_estimate(length, estimate):
+    mask = estimate.class_mask
+    score = 0
+
+    # Length scoring
+    if length >= 8: score += 1
+    if length >= 12: score += 1
+    if length >= 16: score += 1
+
+    # Character variety
+    if mask & LOWER: score += 1
+    if mask & UPPER: score += 1
+    if mask & DIGIT: score += 1
+    if mask & (SYMBOL | OTHER): score += 1
+
+    # No consecutive repeats
+    if length and not estimate.repeats: score += 1
+
+    percent = (score / MAX_SCORE) * 100
+    return StrengthScore(score, MAX_SCORE, percent, strength_label(percent), estimate.bits)
+
+
+class IncrementalScorer:
+    """
+    Scores a password that changes a little at a time, such as a live
+    preview whose length is being dragged.
+
+    The class mask and pattern counts after every prefix of the last scored
+    password are kept, so scoring a new password only walks the characters
+    after the prefix it shares with the previous one. Results are identical
+    to score_password(). Not thread-safe; use one scorer per thread.
+    """
+
+    def __init__(self):
+        self._password = ''
+        # (mask, repeats, sequences, walks) after each prefix, starting with ''
+        self._states = [(0, 0, 0, 0)]
+
+    def score(self, password):
+        previous = self._password
+        if password.startswith(previous):
+            common = len(previous)
+        elif previous.startswith(password):
+            common = len(password)
+        else:
+            common = 0
+            limit = min(len(previous), len(password))
+            while common < limit and previous[common] == password[common]:
+                common += 1
+
+        states = self._states
+        del states[common + 1:]
+        mask, repeats, sequences, walks = states[-1]
+        prev = ord(password[common - 1]) if common else 1 << 21
+        for code in map(ord, password[common:]):
+            if code < 128:
+                mask |= _CLASS_OF[code]
+                if code == prev:
+                    repeats += 1
+                elif prev < 128:
+                    kind = _PAIRS[prev << 7 | code]
+                    if kind == _SEQUENCE:
+                        sequences += 1
+                    elif kind == _WALK:
+                        walks += 1
+            else:
+                mask |= OTHER
+                if code == prev:
+                    repeats += 1
+            prev = code
+            states.append((mask, repeats, sequences, walks))
+
+        self._password = password
+        return _score_estimate(len(password), _make_estimate(len(password), mask, repeats, sequences, walks))
+
+
+def strength_label(percent):
+    """
+    Map a strength percentage onto Weak/Fair/Good/Strong
+    """
+    if percent < 40: return "Weak"
+    elif percent < 70: return "Fair"
+    elif percent < 90: return "Good"
+    else: return "Strong"
@@ -0,0 +1,142 @@
+"""
+Sources of the random bytes behind every generated password.
+
+The samplers take a ``urandom``-style callable (``n -> n bytes``). The
+default, random_bytes(), serves OS CSPRNG bytes from a per-thread buffer
+refilled PASSWORD_RANDOM_BUFFER bytes (default 64 KiB) at a time, so
+concurrent requests take slices of their own buffer with no lock and no
+syscall per password. Buffers are dropped in a forked child so processes
+never share random bytes; PASSWORD_RANDOM_BUFFER=0 reads os.urandom
+directly.
+
+A source hands out one such callable per password index:
+
+* SystemSource, the default, always returns random_bytes.
+* SeededSource derives password N's bytes from keyed BLAKE2b in counter
+  mode over (N, counter), so password N of a seed can be produced in O(1),
+  and any range of indexes independently and in parallel. Block samplers
+  take one stream per fixed-size block of indexes instead. It exists for
+  reproducible benchmarks and load tests only.
+
+Server processes call lock_to_system() when they start, after which
+SeededSource refuses to be created, so a deterministic stream can never end
+up behind a production route.
+"""
+from _thread import _local
+from io import BytesIO
+import os
+
+BUFFER_SIZE = int(os.environ.get('PASSWORD_RANDOM_BUFFER', 65536))
+
+_locked = False
+
+
+# Each thread's ``read`` attribute is the read method of an io.BytesIO over
+# its current block of OS random bytes
+_buffer = _local()
+
+
+def random_bytes(count):
+    """
+    Drop-in replacement for os.urandom served from the calling thread's buffer
+    """
+    try:
+        data = _buffer.read(count)
+    except AttributeError:
+        data = b''
+    if len(data) < count:
+        if count > BUFFER_SIZE // 4:
+            # Large draws would only churn the buffer
+            return os.urandom(count)
+        # The short remainder of the old block is dropped, never reused
+        read = _buffer.read = BytesIO(os.urandom(BUFFER_SIZE)).read
+        data = read(count)
+    return data
+
+
+def _reset_after_fork():
+    global _buffer
+    _buffer = _local()
+
+
+if BUFFER_SIZE <= 0:
+    random_bytes = os.urandom
+elif hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+class SystemSource:
+    """
+    The OS CSPRNG, through the per-thread buffers
+    """
+    deterministic = False
+
+    def randbytes_for(self, index):
+        return random_bytes
+
+    def __repr__(self):
+        return 'SystemSource()'
+
+
+SYSTEM_SOURCE = SystemSource()
+
+
+class SeededSource:
+    """
+    Deterministic, counter-based byte streams keyed by ``seed``
+    (an int, str or bytes). NOT for real passwords.
+    """
+    deterministic = True
+
+    def __init__(self, seed):
+        if _locked:
+            raise ValueError("Seeded generation is disabled in this process")
+        # Imported here so that the default path does not pay for hashlib
+        from hashlib import blake2b
+        self._blake2b = blake2b
+        if isinstance(seed, int):
+            seed = seed.to_bytes((seed.bit_length() + 8) // 8, 'big', signed=True)
+        elif isinstance(seed, str):
+            seed = seed.encode('utf-8')
+        self._key = blake2b(seed, digest_size=32, person=b'pwgen-seed').digest()
+
+    def randbytes_for(self, index):
+        """
+        Return the byte stream of password ``index``: successive calls
+        continue where the previous one stopped
+        """
+        return self._stream(index.to_bytes(8, 'big'))
+
+    def randbytes_for_block(self, block):
+        """
+        Return the byte stream of block ``block`` of passwords, for samplers
+        that draw a fixed-size block of passwords at a time. Block streams
+        never coincide with per-password streams.
+        """
+        return self._stream(b'block' + block.to_bytes(8, 'big'))
+
+    def _stream(self, prefix):
+        key = self._key
+        blake2b = self._blake2b
+        state = [0, b'']
+
+        def randbytes(count):
+            counter, buffered = state
+            while len(buffered) < count:
+                buffered += blake2b(prefix + counter.to_bytes(8, 'big'), key=key).digest()
+                counter += 1
+            state[0] = counter
+            state[1] = buffered[count:]
+            return buffered[:count]
+        return randbytes
+
+    def __repr__(self):
+        return 'SeededSource(...)'
+
+
+def lock_to_system():
+    """
+    Forbid SeededSource in this process from now on
+    """
+    global _locked
+    _locked = True
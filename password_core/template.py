@@ -0,0 +1,184 @@
+"""
+Pattern-template password generation.
+
+A template describes a password position by position::
+
+    C  uppercase consonant      c  lowercase consonant
+    V  uppercase vowel          v  lowercase vowel
+    A  uppercase letter         a  lowercase letter
+    9  digit                    #  symbol
+    *  any letter, digit or symbol
+
+    (...)  group     X{n}  repeat the previous item n times
+    \\X     the literal character X; any other character is also literal
+
+so ``Cvccvc-99`` is a capitalised pronounceable word, a dash and two digits,
+and ``(cv){2}9{4}#`` is two syllables, four digits and a symbol.
+
+Templates are parsed once and compiled into a cached tuple of per-position
+sampling tables, so generating is a single loop with no re-parsing. Every
+compiled template knows its exact entropy.
+"""
+from functools import lru_cache
+import math
+
+from password_core.engine import MAX_BREACH_RETRIES
+from password_core.policy import LOWERCASE, NUMBERS, SYMBOLS, UPPERCASE
+from password_core.sources import random_bytes
+
+VOWELS = 'aeiou'
+CONSONANTS = ''.join(c for c in LOWERCASE if c not in VOWELS)
+
+TEMPLATE_CLASSES = {
+    'C': CONSONANTS.upper(),
+    'c': CONSONANTS,
+    'V': VOWELS.upper(),
+    'v': VOWELS,
+    'A': UPPERCASE,
+    'a': LOWERCASE,
+    '9': NUMBERS,
+    '#': SYMBOLS,
+    '*': UPPERCASE + LOWERCASE + NUMBERS + SYMBOLS,
+}
+
+MAX_TEMPLATE_LENGTH = 1024
+TEMPLATE_CACHE_SIZE = 128
+
+_LIMITS = (0,) + tuple(256 - (256 % n) for n in range(1, 257))
+
+
+class CompiledTemplate:
+    """
+    A parsed template: one (pool, size, rejection limit) entry per position.
+
+    Literal positions have a pool of one character and cost no randomness.
+    """
+    __slots__ = ('template', 'positions', 'length', 'bits')
+
+    def __init__(self, template, pools):
+        self.template = template
+        self.positions = tuple((pool, len(pool), _LIMITS[len(pool)]) for pool in pools)
+        self.length = len(pools)
+        self.bits = sum(math.log2(len(pool)) for pool in pools)
+
+    def generate(self, urandom=random_bytes):
+        """
+        Generate one password from the template
+        """
+        buf = bytearray(self.length)
+        randbytes = urandom(2 * self.length + 16)
+        available = len(randbytes)
+        cursor = 0
+        for i, (pool, size, limit) in enumerate(self.positions):
+            if size == 1:
+                buf[i] = pool[0]
+                continue
+            while True:
+                if cursor == available:
+                    randbytes = urandom(self.length + 16)
+                    available = len(randbytes)
+                    cursor = 0
+                value = randbytes[cursor]
+                cursor += 1
+                if value < limit:
+                    break
+            buf[i] = pool[value % size]
+        return buf.decode('utf-8')
+
+    def generate_many(self, count, source=None, start=0):
+        if source is None:
+            return [self.generate() for _ in range(count)]
+        return [self.generate(source.randbytes_for(index)) for index in range(start, start + count)]
+
+
+def _literal(char):
+    # One single-byte pool per UTF-8 byte, so literals never cost randomness
+    return [bytes((byte,)) for byte in char.encode('utf-8')]
+
+
+def _parse(template, index, exclude, depth):
+    """
+    Parse items until the end of the template or a closing parenthesis;
+    returns (list of pools, index after the parsed items)
+    """
+    pools = []
+    while index < len(template):
+        char = template[index]
+        if char == ')':
+            if depth == 0:
+                raise ValueError(f"Template has an unmatched ')' at position {index}")
+            break
+
+        if char == '(':
+            item, index = _parse(template, index + 1, exclude, depth + 1)
+            if index >= len(template):
+                raise ValueError("Template has an unclosed '('")
+            index += 1
+        elif char == '\\':
+            if index + 1 >= len(template):
+                raise ValueError("Template ends with an unfinished escape")
+            item = _literal(template[index + 1])
+            index += 2
+        elif char == '{':
+            raise ValueError(f"Template repeat at position {index} has nothing to repeat")
+        elif char in TEMPLATE_CLASSES:
+            pool = ''.join(c for c in TEMPLATE_CLASSES[char] if c not in exclude)
+            if not pool:
+                raise ValueError(f"Template class '{char}' has no characters left after exclusions")
+            item = [pool.encode('ascii')]
+            index += 1
+        else:
+            item = _literal(char)
+            index += 1
+
+        # Optional {n} repeat
+        if index < len(template) and template[index] == '{':
+            end = template.find('}', index)
+            if end == -1 or not template[index + 1:end].isdigit():
+                raise ValueError(f"Template repeat at position {index} must look like {{n}}")
+            repeat = int(template[index + 1:end])
+            if len(pools) + len(item) * repeat > MAX_TEMPLATE_LENGTH:
+                raise ValueError(f"Templates may produce at most {MAX_TEMPLATE_LENGTH} characters")
+            item = item * repeat
+            index = end + 1
+
+        pools.extend(item)
+        if len(pools) > MAX_TEMPLATE_LENGTH:
+            raise ValueError(f"Templates may produce at most {MAX_TEMPLATE_LENGTH} characters")
+    return pools, index
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def _compile(template, exclude):
+    pools, _ = _parse(template, 0, exclude, 0)
+    if not pools:
+        raise ValueError("Template must produce at least one character")
+    return CompiledTemplate(template, pools)
+
+
+def compile_template(template, exclude_chars=''):
+    """
+    Return the cached CompiledTemplate for a template string, raising
+    ValueError for malformed templates
+    """
+    if not isinstance(template, str) or not template:
+        raise ValueError("Template must be a non-empty string")
+    return _compile(template, frozenset(exclude_chars))
+
+
+def generate_template(template, exclude_chars='', blocklist=None, source=None, index=0):
+    """
+    Generate one password from a template string, redrawing candidates
+    found in ``blocklist``. ``source`` and ``index`` select the random
+    stream as in engine.generate_password().
+    """
+    compiled = compile_template(template, exclude_chars)
+    urandom = random_bytes if source is None else source.randbytes_for(index)
+    if blocklist is None:
+        return compiled.generate(urandom)
+    for _ in range(MAX_BREACH_RETRIES):
+        password = compiled.generate(urandom)
+        if password not in blocklist:
+            return password
+    raise ValueError("Could not generate a password outside the breached-password list; "
+                     "try a template with more random positions")
@@ -0,0 +1,142 @@
+"""
+Compact, memory-mapped wordlists for passphrase generation.
+
+A packed wordlist is a single file::
+
+    b'PWWORDS1' | count (uint32 LE) | offsets ((count + 1) x uint32 LE) | UTF-8 blob
+
+Word ``i`` is ``blob[offsets[i]:offsets[i + 1]]``. The file is opened with
+mmap on first use, so start-up costs nothing, no per-word Python objects
+exist until a word is picked, and every process maps the same pages.
+
+Build one from a plain or EFF diceware-style list ("11111<TAB>abacus")::
+
+    python -m password_core.wordlist build eff_large_wordlist.txt password_core/data/wordlist.bin
+"""
+import mmap
+import os
+import struct
+
+MAGIC = b'PWWORDS1'
+HEADER = struct.Struct('<8sI')
+OFFSET = struct.Struct('<I')
+OFFSET_PAIR = struct.Struct('<II')
+
+DEFAULT_WORDLIST_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'wordlist.bin')
+
+
+class Wordlist:
+    """
+    Read-only, indexable view of a packed wordlist file
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count = HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a packed wordlist")
+        self._offsets = HEADER.size
+        self._blob = HEADER.size + (self.count + 1) * OFFSET.size
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if not 0 <= index < self.count:
+            raise IndexError("word index out of range")
+        start, end = OFFSET_PAIR.unpack_from(self._map, self._offsets + index * OFFSET.size)
+        return self._map[self._blob + start:self._blob + end].decode('utf-8')
+
+    def close(self):
+        self._map.close()
+
+
+def build_wordlist(source_path, output_path):
+    """
+    Pack a text wordlist into the binary format; returns the number of words.
+
+    Blank lines, duplicates and diceware roll numbers are dropped.
+    """
+    words = []
+    seen = set()
+    with open(source_path, encoding='utf-8') as source:
+        for line in source:
+            fields = line.split()
+            if not fields:
+                continue
+            word = fields[-1]
+            if word not in seen:
+                seen.add(word)
+                words.append(word.encode('utf-8'))
+
+    if not words:
+        raise ValueError(f"{source_path} contains no words")
+
+    directory = os.path.dirname(output_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(output_path, 'wb') as out:
+        out.write(HEADER.pack(MAGIC, len(words)))
+        position = 0
+        out.write(OFFSET.pack(position))
+        for word in words:
+            position += len(word)
+            out.write(OFFSET.pack(position))
+        for word in words:
+            out.write(word)
+    return len(words)
+
+
+_loaded = {}
+
+
+def wordlist_path(path=None):
+    """
+    Resolve ``path``, the PASSWORD_WORDLIST environment variable, or the
+    default location, in that order
+    """
+    return path or os.environ.get('PASSWORD_WORDLIST') or DEFAULT_WORDLIST_PATH
+
+
+def wordlist_available(path=None):
+    """
+    Whether passphrase mode can run; no wordlist ships with the code, so
+    front ends disable the mode until one has been built
+    """
+    return os.path.exists(wordlist_path(path))
+
+
+def get_wordlist(path=None):
+    """
+    Return the (lazily opened, cached) wordlist at wordlist_path(path)
+    """
+    path = wordlist_path(path)
+    wordlist = _loaded.get(path)
+    if wordlist is None:
+        if not os.path.exists(path):
+            raise ValueError(f"Passphrase mode is unavailable: no wordlist at {path}; build one with "
+                             "'python -m password_core.wordlist build' or set PASSWORD_WORDLIST")
+        wordlist = _loaded[path] = Wordlist(path)
+    return wordlist
+
+
+def main(argv=None):
+    # Imported here so loading wordlists from the CLI does not pull in argparse
+    import argparse
+
+    parser = argparse.ArgumentParser(prog='python -m password_core.wordlist',
+                                     description="Pack a text wordlist for passphrase generation")
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help="pack a text wordlist")
+    build.add_argument('source')
+    build.add_argument('output', nargs='?', default=DEFAULT_WORDLIST_PATH)
+    args = parser.parse_args(argv)
+
+    count = build_wordlist(args.source, args.output)
+    print(f"Packed {count} words into {args.output}")
+
+
+if __name__ == '__main__':
+    main()
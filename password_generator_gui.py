@@ -1,15 +1,87 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
-import random
-import string
+from tkinter import ttk, messagebox, filedialog
 import pyperclip
-import re
+import os
+import queue
+import threading
+
+import password_core
+from password_core import EXCLUSION_PRESETS, IncrementalScorer, PasswordPolicy, exclusion_set
+from password_core.bulk import EXPORT_FORMATS, generate_bulk, load_key
+from password_core.profiling import profile_section
+from password_core.wordlist import wordlist_available
+
+# Label and progress bar colours for each strength level
+STRENGTH_COLORS = {
+    "Weak": "red",
+    "Fair": "orange",
+    "Good": "blue",
+    "Strong": "green"
+}
+
+# How often the Tk thread collects results from the worker threads
+POLL_INTERVAL_MS = 50
+
+# Option changes are coalesced into at most one live preview per frame
+PREVIEW_INTERVAL_MS = 16
+
+# Bulk export generates and writes this many passwords at a time
+EXPORT_CHUNK_SIZE = 4096
+EXPORT_BUFFER_SIZE = 1 << 20
+
+# Save dialog file types for each export format
+EXPORT_FILE_TYPES = {
+    "lines": (".txt", "Text files", "*.txt"),
+    "fixed": (".dat", "Fixed-width records", "*.dat"),
+    "binary": (".bin", "Binary exports", "*.bin"),
+}
+
+class ExportCancelled(Exception):
+    """Raised from a bulk export's progress callback to stop it"""
+
+class BackgroundWorker:
+    """
+    Runs jobs one at a time on a daemon thread. Results are handed back to
+    the Tk thread, which picks them up every POLL_INTERVAL_MS with root.after,
+    so callbacks can safely touch widgets.
+    """
+    def __init__(self, root):
+        self.root = root
+        self.jobs = queue.Queue()
+        self.results = queue.Queue()
+        threading.Thread(target=self._run, daemon=True).start()
+        self.root.after(POLL_INTERVAL_MS, self._poll)
+    
+    def submit(self, work, callback):
+        """Run ``work()`` on the worker; ``callback(result, error)`` then runs on the Tk thread"""
+        self.jobs.put((work, callback))
+    
+    def post(self, callback, *args):
+        """Schedule ``callback(*args)`` on the Tk thread (callable from the worker)"""
+        self.results.put((callback, args))
+    
+    def _run(self):
+        while True:
+            work, callback = self.jobs.get()
+            try:
+                self.post(callback, work(), None)
+            except Exception as e:
+                self.post(callback, None, e)
+    
+    def _poll(self):
+        try:
+            while True:
+                callback, args = self.results.get_nowait()
+                callback(*args)
+        except queue.Empty:
+            pass
+        self.root.after(POLL_INTERVAL_MS, self._poll)
 
 class PasswordGeneratorGUI:
     def __init__(self, root):
         self.root = root
         self.root.title("Advanced Password Generator - Internship Task")
-        self.root.geometry("600x700")
+        self.root.geometry("600x910")
         self.root.resizable(True, True)
         self.root.configure(bg='#f0f0f0')
         
@@ -21,7 +93,28 @@ class PasswordGeneratorGUI:
         self.numbers_var = tk.BooleanVar(value=True)
         self.symbols_var = tk.BooleanVar(value=True)
         self.exclude_var = tk.StringVar()
+        self.preset_vars = {name: tk.BooleanVar(value=False) for name in EXCLUSION_PRESETS}
         self.security_rules_var = tk.BooleanVar(value=True)
+        self.mode_var = tk.StringVar(value="password")
+        self.words_var = tk.IntVar(value=6)
+        self.template_var = tk.StringVar(value="Cvccvc-99")
+        self.export_count_var = tk.IntVar(value=100000)
+        self.export_format_var = tk.StringVar(value="lines")
+        self.export_encrypt_var = tk.BooleanVar(value=False)
+        self.export_cancel = None
+        
+        # Live preview state; preview_seq lets stale worker jobs be skipped
+        self.preview_job = None
+        self.preview_key = None
+        self.preview_seq = 0
+        self.shown_length = self.length_var.get()
+        # Only used on self.worker's thread
+        self.scorer = IncrementalScorer()
+        
+        # Generation and scoring run off the Tk thread; bulk exports get their
+        # own worker so single passwords never wait behind them
+        self.worker = BackgroundWorker(root)
+        self.export_worker = BackgroundWorker(root)
         
         self.setup_ui()
         
@@ -92,6 +185,32 @@ class PasswordGeneratorGUI:
         exclude_entry = ttk.Entry(custom_frame, textvariable=self.exclude_var, width=30)
         exclude_entry.grid(row=0, column=1, padx=(10, 0))
         
+        ttk.Label(custom_frame, text="Exclusion presets:").grid(row=1, column=0, sticky=tk.W, pady=(5, 0))
+        presets_frame = ttk.Frame(custom_frame)
+        presets_frame.grid(row=1, column=1, sticky=tk.W, padx=(10, 0), pady=(5, 0))
+        for column, (name, var) in enumerate(self.preset_vars.items()):
+            ttk.Checkbutton(presets_frame, text=name.capitalize(),
+                            variable=var).grid(row=0, column=column, sticky=tk.W, padx=(0, 8))
+        self.exclusion_label = ttk.Label(custom_frame, text="", font=("Arial", 9))
+        self.exclusion_label.grid(row=2, column=1, sticky=tk.W, padx=(10, 0))
+        
+        ttk.Label(custom_frame, text="Generate:").grid(row=3, column=0, sticky=tk.W, pady=(10, 0))
+        mode_frame = ttk.Frame(custom_frame)
+        mode_frame.grid(row=3, column=1, sticky=tk.W, padx=(10, 0), pady=(10, 0))
+        ttk.Radiobutton(mode_frame, text="Password", value="password",
+                        variable=self.mode_var).grid(row=0, column=0, sticky=tk.W)
+        # No wordlist ships with the app; passphrases need one built first
+        passphrase_state = tk.NORMAL if wordlist_available() else tk.DISABLED
+        ttk.Radiobutton(mode_frame, text="Passphrase", value="passphrase", variable=self.mode_var,
+                        state=passphrase_state).grid(row=0, column=1, sticky=tk.W, padx=(10, 0))
+        ttk.Label(mode_frame, text="Words:").grid(row=0, column=2, padx=(10, 0))
+        ttk.Spinbox(mode_frame, from_=3, to=12, textvariable=self.words_var, width=4,
+                    state=passphrase_state).grid(row=0, column=3, padx=(5, 0))
+        ttk.Radiobutton(mode_frame, text="Template", value="template",
+                        variable=self.mode_var).grid(row=1, column=0, sticky=tk.W, pady=(5, 0))
+        ttk.Entry(mode_frame, textvariable=self.template_var,
+                  width=20).grid(row=1, column=1, columnspan=3, sticky=tk.W, padx=(10, 0), pady=(5, 0))
+        
         # Generate button
         generate_btn = ttk.Button(main_frame, text="Generate Secure Password", 
                                  command=self.generate_password, style="Accent.TButton")
@@ -107,6 +226,31 @@ class PasswordGeneratorGUI:
         self.strength_bar = ttk.Progressbar(strength_frame, orient=tk.HORIZONTAL, length=400, mode='determinate')
         self.strength_bar.grid(row=1, column=0, sticky=(tk.W, tk.E), pady=(5, 0))
         
+        # Bulk export
+        export_frame = ttk.LabelFrame(main_frame, text="Bulk Export", padding="15")
+        export_frame.grid(row=8, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 15))
+        
+        ttk.Label(export_frame, text="Passwords:").grid(row=0, column=0, sticky=tk.W)
+        ttk.Spinbox(export_frame, from_=1, to=10000000, increment=1000, textvariable=self.export_count_var,
+                    width=10).grid(row=0, column=1, sticky=tk.W, padx=(10, 0))
+        self.export_button = ttk.Button(export_frame, text="Export to File...", command=self.export_passwords)
+        self.export_button.grid(row=0, column=2, padx=(10, 0))
+        self.cancel_button = ttk.Button(export_frame, text="Cancel", command=self.cancel_export, state=tk.DISABLED)
+        self.cancel_button.grid(row=0, column=3, padx=(10, 0))
+        
+        
+        ttk.Label(export_frame, text="Format:").grid(row=1, column=0, sticky=tk.W, pady=(10, 0))
+        ttk.Combobox(export_frame, textvariable=self.export_format_var, values=EXPORT_FORMATS,
+                     state="readonly", width=8).grid(row=1, column=1, sticky=tk.W, padx=(10, 0), pady=(10, 0))
+        ttk.Checkbutton(export_frame, text="Encrypt with a key file",
+                        variable=self.export_encrypt_var).grid(row=1, column=2, columnspan=2, sticky=tk.W,
+                                                               padx=(10, 0), pady=(10, 0))
+        
+        self.export_bar = ttk.Progressbar(export_frame, orient=tk.HORIZONTAL, mode='determinate')
+        self.export_bar.grid(row=2, column=0, columnspan=4, sticky=(tk.W, tk.E), pady=(10, 0))
+        self.export_status = ttk.Label(export_frame, text="")
+        self.export_status.grid(row=3, column=0, columnspan=4, sticky=tk.W, pady=(5, 0))
+        
         # Configure grid weights
         self.root.columnconfigure(0, weight=1)
         self.root.rowconfigure(0, weight=1)
@@ -117,151 +261,296 @@ class PasswordGeneratorGUI:
         security_frame.columnconfigure(0, weight=1)
         custom_frame.columnconfigure(1, weight=1)
         strength_frame.columnconfigure(0, weight=1)
+        export_frame.columnconfigure(3, weight=1)
         
         # Generate initial password
         self.generate_password()
+        
+        # Regenerate and rescore live as options change
+        for var in (self.length_var, self.uppercase_var, self.lowercase_var, self.numbers_var,
+                    self.symbols_var, self.exclude_var, self.security_rules_var, self.mode_var,
+                    self.words_var, self.template_var, *self.preset_vars.values()):
+            var.trace_add('write', self.schedule_preview)
     
     def update_length_label(self, value):
-        self.length_label.config(text=str(int(float(value))))
+        # The scale reports every pixel of motion; only whole lengths matter
+        length = int(float(value))
+        if length != self.shown_length:
+            self.shown_length = length
+            self.length_label.config(text=str(length))
+    
+    def options_key(self):
+        """The options that affect the current mode, to skip previews that would change nothing"""
+        mode = self.mode_var.get()
+        if mode == "passphrase":
+            return (mode, self.words_var.get(), self.security_rules_var.get())
+        if mode == "template":
+            return (mode, self.template_var.get(), self.exclude_var.get(), self.selected_presets())
+        return (mode, int(self.length_var.get()), self.uppercase_var.get(), self.lowercase_var.get(),
+                self.numbers_var.get(), self.symbols_var.get(), self.exclude_var.get(),
+                self.selected_presets(), self.security_rules_var.get())
+    
+    def selected_presets(self):
+        return tuple(name for name, var in self.preset_vars.items() if var.get())
+    
+    def update_exclusion_label(self):
+        """Show how much entropy the exclusions cost with the current options"""
+        mode = self.mode_var.get()
+        if mode == "passphrase":
+            removed = 0.0
+        elif mode == "template":
+            excluded = exclusion_set(self.exclude_var.get(), self.selected_presets())
+            template = self.template_var.get()
+            removed = (password_core.compile_template(template).bits
+                       - password_core.compile_template(template, excluded).bits)
+        else:
+            policy = self.current_policy()
+            removed = policy.validate().excluded_bits(policy.length)
+        self.exclusion_label.config(text=f"Exclusions remove ~{removed:.1f} bits" if removed else "")
+    
+    def schedule_preview(self, *args):
+        # A pending preview reads the options when it runs, so later changes
+        # in the same frame are picked up by it
+        if self.preview_job is None:
+            self.preview_job = self.root.after(PREVIEW_INTERVAL_MS, self.run_preview)
+    
+    def run_preview(self):
+        self.preview_job = None
+        try:
+            key = self.options_key()
+        except tk.TclError:
+            # Half-typed spinbox value
+            return
+        if key == self.preview_key:
+            return
+        self.preview_key = key
+        self.preview_seq += 1
+        seq = self.preview_seq
+        
+        try:
+            self.update_exclusion_label()
+            if self.mode_var.get() == "password":
+                # Keep the shown password's prefix while only the length changes
+                policy = self.current_policy()
+                policy.validate()
+                previous = self.password_var.get()
+                produce = lambda: (password_core.resize_password(policy, previous), None)
+            else:
+                generate = self.make_generator()
+                
+                def produce():
+                    passwords, bits = generate(1)
+                    return passwords[0], bits
+        except ValueError as e:
+            self.show_preview_error(e)
+            return
+        
+        def work():
+            if seq != self.preview_seq:
+                # Superseded by a newer change before it started
+                return None
+            password, bits = produce()
+            return seq, password, self.scorer.score(password), bits
+        
+        self.worker.submit(work, self.show_preview)
+    
+    def show_preview(self, result, error):
+        if error is not None:
+            self.show_preview_error(error)
+            return
+        if result is None or result[0] != self.preview_seq:
+            return
+        _, password, strength, bits = result
+        self.password_var.set(password)
+        self.show_strength(strength, bits)
+    
+    def show_preview_error(self, error):
+        # Previews update as the user types, so problems are shown inline
+        self.strength_label.config(text=f"⚠ {error}", foreground="red")
+        self.strength_bar['value'] = 0
     
     def generate_password(self):
         try:
-            length = self.length_var.get()
-            use_upper = self.uppercase_var.get()
-            use_lower = self.lowercase_var.get()
-            use_numbers = self.numbers_var.get()
-            use_symbols = self.symbols_var.get()
-            exclude_chars = self.exclude_var.get()
+            generate = self.make_generator()
+            self.update_exclusion_label()
+        except ValueError as e:
+            messagebox.showerror("Error", f"{e}!")
+            return
+        
+        def work():
+            # Profiled when PASSWORD_PROFILE is set; see password_core.profiling
+            with profile_section("gui.generate"):
+                passwords, bits = generate(1)
+                return passwords[0], self.scorer.score(passwords[0]), bits
+        
+        # Previews still queued must not replace this password
+        self.preview_seq += 1
+        self.worker.submit(work, self.show_generated)
+    
+    def show_generated(self, result, error):
+        if error is not None:
+            if isinstance(error, ValueError):
+                messagebox.showerror("Error", f"{error}!")
+            else:
+                messagebox.showerror("Error", f"An error occurred: {str(error)}")
+            return
+        password, strength, bits = result
+        self.password_var.set(password)
+        self.show_strength(strength, bits)
+    
+    def make_generator(self):
+        """
+        Read the current options (on the Tk thread) and return a function
+        ``generate(count) -> (passwords, exact bits or None)`` that is safe to
+        call from the worker threads
+        """
+        mode = self.mode_var.get()
+        if mode == "passphrase":
+            # Strong rules add capitals and a digit to the words
             enforce_rules = self.security_rules_var.get()
+            words = self.words_var.get()
             
-            # Validate at least one character type is selected
-            if not any([use_upper, use_lower, use_numbers, use_symbols]):
-                messagebox.showerror("Error", "Please select at least one character type!")
+            def generate(count):
+                results = [password_core.generate_passphrase(words=words, capitalize=enforce_rules,
+                                                             digits=1 if enforce_rules else 0)
+                           for _ in range(count)]
+                return [result.passphrase for result in results], results[0].bits
+            return generate
+        
+        if mode == "template":
+            excluded = exclusion_set(self.exclude_var.get(), self.selected_presets())
+            compiled = password_core.compile_template(self.template_var.get(), excluded)
+            return lambda count: (compiled.generate_many(count), compiled.bits)
+        
+        policy = self.current_policy()
+        policy.validate()
+        return lambda count: (password_core.generate_many(policy, count), None)
+    
+    def current_policy(self):
+        return PasswordPolicy(
+            length=int(self.length_var.get()),
+            use_uppercase=self.uppercase_var.get(),
+            use_lowercase=self.lowercase_var.get(),
+            use_numbers=self.numbers_var.get(),
+            use_symbols=self.symbols_var.get(),
+            exclude_chars=self.exclude_var.get(),
+            enforce_rules=self.security_rules_var.get(),
+            exclude_presets=self.selected_presets()
+        )
+    
+    def export_passwords(self):
+        """Generate ``export_count_var`` passwords into a file on the export worker"""
+        output_format = self.export_format_var.get()
+        encrypt = self.export_encrypt_var.get()
+        # Fixed-width, binary and encrypted exports are written straight from
+        # the bulk generator's record buffer; plain text works in every mode
+        use_bulk = output_format != "lines" or encrypt
+        try:
+            count = self.export_count_var.get()
+            if count < 1:
+                raise ValueError("Export count must be at least 1")
+            if use_bulk:
+                if self.mode_var.get() != "password":
+                    raise ValueError("Fixed-width, binary and encrypted exports need password mode")
+                policy = self.current_policy()
+                policy.validate()
+            else:
+                generate = self.make_generator()
+        except (ValueError, tk.TclError) as e:
+            messagebox.showerror("Error", f"{e}!")
+            return
+        
+        key = None
+        if encrypt:
+            key_path = os.environ.get('PASSWORD_EXPORT_KEY_FILE') or filedialog.askopenfilename(
+                title="Choose a 32-byte export key")
+            if not key_path:
                 return
-            
-            # Character sets
-            upper_chars = string.ascii_uppercase
-            lower_chars = string.ascii_lowercase
-            number_chars = string.digits
-            symbol_chars = '!@#$%^&*()_+-=[]{}|;:,.<>?'
-            
-            # Remove excluded characters
-            if exclude_chars:
-                upper_chars = ''.join(c for c in upper_chars if c not in exclude_chars)
-                lower_chars = ''.join(c for c in lower_chars if c not in exclude_chars)
-                number_chars = ''.join(c for c in number_chars if c not in exclude_chars)
-                symbol_chars = ''.join(c for c in symbol_chars if c not in exclude_chars)
-            
-            # Build character pool
-            char_pool = ''
-            if use_upper: char_pool += upper_chars
-            if use_lower: char_pool += lower_chars
-            if use_numbers: char_pool += number_chars
-            if use_symbols: char_pool += symbol_chars
-            
-            if not char_pool:
-                messagebox.showerror("Error", "No characters available after exclusions!")
+            try:
+                key = load_key(key_path)
+            except (OSError, ValueError) as e:
+                messagebox.showerror("Error", f"{e}!")
                 return
+        
+        extension, description, pattern = EXPORT_FILE_TYPES[output_format]
+        if encrypt:
+            extension, description, pattern = ".enc", "Encrypted exports", "*.enc"
+        path = filedialog.asksaveasfilename(defaultextension=extension,
+                                            filetypes=[(description, pattern), ("All files", "*.*")])
+        if not path:
+            return
+        
+        cancelled = self.export_cancel = threading.Event()
+        self.export_bar['maximum'] = count
+        self.export_bar['value'] = 0
+        self.export_button.config(state=tk.DISABLED)
+        self.cancel_button.config(state=tk.NORMAL)
+        self.export_status.config(text=f"Exporting 0 / {count:,}")
+        
+        def bulk_work():
+            def progress(done):
+                if cancelled.is_set():
+                    raise ExportCancelled()
+                self.export_worker.post(self.show_export_progress, done, count)
             
-            # Generate password
-            if enforce_rules:
-                password = self.generate_secure_password(length, upper_chars, lower_chars, number_chars, symbol_chars, use_upper, use_lower, use_numbers, use_symbols)
-            else:
-                password = ''.join(random.choice(char_pool) for _ in range(length))
-            
-            self.password_var.set(password)
-            self.analyze_password_strength(password)
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"An error occurred: {str(e)}")
+            try:
+                result = generate_bulk(policy, count, workers=1, chunk_size=EXPORT_CHUNK_SIZE,
+                                       progress=progress)
+            except ExportCancelled:
+                return 0, path
+            with result, open(path, 'wb') as out:
+                result.export(out, output_format, key)
+            return count, path
+        
+        def work():
+            written = 0
+            with open(path, 'w', encoding='utf-8', newline='\n', buffering=EXPORT_BUFFER_SIZE) as out:
+                while written < count and not cancelled.is_set():
+                    passwords, _ = generate(min(EXPORT_CHUNK_SIZE, count - written))
+                    out.write('\n'.join(passwords))
+                    out.write('\n')
+                    written += len(passwords)
+                    self.export_worker.post(self.show_export_progress, written, count)
+            if cancelled.is_set():
+                os.remove(path)
+            return written, path
+        
+        self.export_worker.submit(bulk_work if use_bulk else work, self.finish_export)
     
-    def generate_secure_password(self, length, upper_chars, lower_chars, number_chars, symbol_chars, use_upper, use_lower, use_numbers, use_symbols):
-        """Generate password that adheres to security rules"""
-        password = []
-        
-        # Ensure at least one character from each selected type
-        if use_upper and upper_chars:
-            password.append(random.choice(upper_chars))
-        if use_lower and lower_chars:
-            password.append(random.choice(lower_chars))
-        if use_numbers and number_chars:
-            password.append(random.choice(number_chars))
-        if use_symbols and symbol_chars:
-            password.append(random.choice(symbol_chars))
-        
-        # Fill remaining length with random characters from all pools
-        char_pool = ''
-        if use_upper: char_pool += upper_chars
-        if use_lower: char_pool += lower_chars
-        if use_numbers: char_pool += number_chars
-        if use_symbols: char_pool += symbol_chars
-        
-        while len(password) < length:
-            password.append(random.choice(char_pool))
-        
-        # Shuffle the password
-        random.shuffle(password)
-        
-        # Convert to string and check if we need to truncate
-        password = ''.join(password)
-        
-        # Ensure no repeated characters consecutively
-        for i in range(1, len(password)):
-            if password[i] == password[i-1]:
-                # Replace with different character
-                new_char = random.choice([c for c in char_pool if c != password[i]])
-                password = password[:i] + new_char + password[i+1:]
-        
-        return password[:length]
+    def cancel_export(self):
+        if self.export_cancel is not None:
+            self.export_cancel.set()
+            self.cancel_button.config(state=tk.DISABLED)
     
-    def analyze_password_strength(self, password):
-        """Analyze password strength and update UI"""
-        score = 0
-        max_score = 8
-        
-        # Length scoring
-        if len(password) >= 8: score += 1
-        if len(password) >= 12: score += 1
-        if len(password) >= 16: score += 1
-        
-        # Character variety
-        if any(c.islower() for c in password): score += 1
-        if any(c.isupper() for c in password): score += 1
-        if any(c.isdigit() for c in password): score += 1
-        if any(not c.isalnum() for c in password): score += 1
-        
-        # No consecutive repeats
-        has_repeats = any(password[i] == password[i+1] for i in range(len(password)-1))
-        if not has_repeats: score += 1
-        
-        # Calculate percentage and strength text
-        strength_percent = (score / max_score) * 100
-        
-        if strength_percent < 40:
-            strength_text = "Weak"
-            color = "red"
-        elif strength_percent < 70:
-            strength_text = "Fair"
-            color = "orange"
-        elif strength_percent < 90:
-            strength_text = "Good"
-            color = "blue"
+    def show_export_progress(self, written, count):
+        self.export_bar['value'] = written
+        self.export_status.config(text=f"Exporting {written:,} / {count:,}")
+    
+    def finish_export(self, result, error):
+        cancelled = self.export_cancel.is_set()
+        self.export_cancel = None
+        self.export_button.config(state=tk.NORMAL)
+        self.cancel_button.config(state=tk.DISABLED)
+        if error is not None:
+            self.export_status.config(text="Export failed")
+            messagebox.showerror("Error", f"Export failed: {error}")
+        elif cancelled:
+            self.export_status.config(text="Export cancelled")
         else:
-            strength_text = "Strong"
-            color = "green"
+            written, path = result
+            self.export_status.config(text=f"Exported {written:,} passwords to {os.path.basename(path)}")
+    
+    def show_strength(self, strength, bits=None):
+        """Show an already computed StrengthScore"""
+        color = STRENGTH_COLORS[strength.label]
+        if bits is None:
+            bits = strength.bits
         
-        self.strength_label.config(text=f"{strength_text} ({score}/{max_score} criteria met)", foreground=color)
-        self.strength_bar['value'] = strength_percent
+        self.strength_label.config(text=f"{strength.label} ({strength.score}/{strength.max_score} criteria met, ~{bits:.0f} bits)", foreground=color)
+        self.strength_bar['value'] = strength.percent
         
         # Update progress bar color based on strength
-        if strength_percent < 40:
-            self.strength_bar.configure(style="Red.Horizontal.TProgressbar")
-        elif strength_percent < 70:
-            self.strength_bar.configure(style="Orange.Horizontal.TProgressbar")
-        elif strength_percent < 90:
-            self.strength_bar.configure(style="Blue.Horizontal.TProgressbar")
-        else:
-            self.strength_bar.configure(style="Green.Horizontal.TProgressbar")
+        self.strength_bar.configure(style=f"{color.capitalize()}.Horizontal.TProgressbar")
     
     def copy_to_clipboard(self):
         password = self.password_var.get()
@@ -1,5 +1,19 @@
+// Passwords fetched per /generate/batch request, and the queue length at
+// which the next batch is prefetched
+const BATCH_SIZE = 20;
+const PREFETCH_THRESHOLD = 5;
+
+// Delay before refetching while the slider or exclude field is being edited
+const OPTIONS_DEBOUNCE_MS = 150;
+
 class PasswordGenerator {
     constructor() {
+        // Prefetched {password, strength} entries for the options in queueKey
+        this.queue = [];
+        this.queueKey = null;
+        this.pendingBatch = null;
+        this.debounceTimer = null;
+
         this.initializeElements();
         this.setupEventListeners();
         this.generatePassword(); // Generate initial password
@@ -28,7 +42,7 @@ class PasswordGenerator {
     setupEventListeners() {
         this.lengthSlider.addEventListener('input', () => {
             this.lengthValue.textContent = this.lengthSlider.value;
-            this.generatePassword();
+            this.generateDebounced();
         });
 
         this.generateBtn.addEventListener('click', () => {
@@ -48,78 +62,118 @@ class PasswordGenerator {
         });
 
         this.excludeChars.addEventListener('input', () => {
-            this.generatePassword();
+            this.generateDebounced();
         });
     }
 
+    generateDebounced() {
+        clearTimeout(this.debounceTimer);
+        this.debounceTimer = setTimeout(() => this.generatePassword(), OPTIONS_DEBOUNCE_MS);
+    }
+
+    getOptions() {
+        return {
+            length: parseInt(this.lengthSlider.value),
+            uppercase: this.uppercaseCheck.checked,
+            lowercase: this.lowercaseCheck.checked,
+            numbers: this.numbersCheck.checked,
+            symbols: this.symbolsCheck.checked,
+            exclude: this.excludeChars.value
+        };
+    }
+
     generatePassword() {
-        const length = parseInt(this.lengthSlider.value);
-        const useUppercase = this.uppercaseCheck.checked;
-        const useLowercase = this.lowercaseCheck.checked;
-        const useNumbers = this.numbersCheck.checked;
-        const useSymbols = this.symbolsCheck.checked;
-        const exclude = this.excludeChars.value;
+        const options = this.getOptions();
 
         // Validate at least one character type is selected
-        if (!useUppercase && !useLowercase && !useNumbers && !useSymbols) {
+        if (!options.uppercase && !options.lowercase && !options.numbers && !options.symbols) {
             this.passwordOutput.value = 'Select at least one character type';
-            this.updateStrengthIndicator('none');
+            this.updateStrengthIndicator('None');
             return;
         }
 
-        let charset = '';
-        if (useUppercase) charset += 'ABCDEFGHIJKLMNOPQRSTUVWXYZ';
-        if (useLowercase) charset += 'abcdefghijklmnopqrstuvwxyz';
-        if (useNumbers) charset += '0123456789';
-        if (useSymbols) charset += '!@#$%^&*()_+-=[]{}|;:,.<>?';
+        // Changed options invalidate everything fetched for the old ones
+        const key = JSON.stringify(options);
+        if (key !== this.queueKey) {
+            this.queue = [];
+            this.queueKey = key;
+            this.pendingBatch = null;
+        }
 
-        // Remove excluded characters
-        if (exclude) {
-            charset = charset.split('').filter(char => !exclude.includes(char)).join('');
+        if (this.queue.length > 0) {
+            this.showEntry(this.queue.shift());
+            if (this.queue.length <= PREFETCH_THRESHOLD) {
+                this.fetchBatch(options, key);
+            }
+            return;
         }
 
-        // Generate password
-        let password = '';
-        for (let i = 0; i < length; i++) {
-            const randomIndex = Math.floor(Math.random() * charset.length);
-            password += charset[randomIndex];
+        this.fetchBatch(options, key)
+            .then(() => {
+                if (key === this.queueKey && this.queue.length > 0) {
+                    this.showEntry(this.queue.shift());
+                }
+            })
+            .catch(error => {
+                if (key !== this.queueKey) return;
+                console.error('Error:', error);
+                this.passwordOutput.value = `Error: ${error.message}`;
+                this.updateStrengthIndicator('None');
+            });
+    }
+
+    fetchBatch(options, key) {
+        // One request in flight per set of options
+        if (this.pendingBatch) {
+            return this.pendingBatch;
         }
 
-        this.passwordOutput.value = password;
-        this.updateStrengthIndicator(this.calculatePasswordStrength(password));
+        // Passwords come from the server's CSPRNG-backed generator
+        const batch = fetch('/generate/batch', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ ...options, count: BATCH_SIZE, include_strength: true })
+        })
+        .then(response => response.json().then(data => {
+            if (!response.ok) {
+                throw new Error(data.error || response.statusText);
+            }
+            return data;
+        }))
+        .then(data => {
+            // Drop batches for options that changed while the request was out
+            if (key === this.queueKey) {
+                data.passwords.forEach((password, i) => {
+                    this.queue.push({ password: password, strength: data.strengths[i] });
+                });
+            }
+        })
+        .finally(() => {
+            if (this.pendingBatch === batch) {
+                this.pendingBatch = null;
+            }
+        });
+
+        this.pendingBatch = batch;
+        batch.catch(() => {});
+        return batch;
     }
 
-    calculatePasswordStrength(password) {
-        let score = 0;
-        
-        // Length score
-        if (password.length >= 8) score += 1;
-        if (password.length >= 12) score += 1;
-        if (password.length >= 16) score += 1;
-        
-        // Character variety score
-        if (/[a-z]/.test(password)) score += 1;
-        if (/[A-Z]/.test(password)) score += 1;
-        if (/[0-9]/.test(password)) score += 1;
-        if (/[^a-zA-Z0-9]/.test(password)) score += 1;
-        
-        // Determine strength level
-        if (score <= 2) return 'weak';
-        if (score <= 4) return 'fair';
-        if (score <= 6) return 'good';
-        return 'strong';
+    showEntry(entry) {
+        this.passwordOutput.value = entry.password;
+        this.updateStrengthIndicator(entry.strength);
     }
 
     updateStrengthIndicator(strength) {
         const strengthLabels = {
-            'none': { text: 'No password', class: '' },
-            'weak': { text: 'Weak', class: 'strength-weak' },
-            'fair': { text: 'Fair', class: 'strength-fair' },
-            'good': { text: 'Good', class: 'strength-good' },
-            'strong': { text: 'Strong', class: 'strength-strong' }
+            'None': { text: 'No password', class: '' },
+            'Weak': { text: 'Weak', class: 'strength-weak' },
+            'Fair': { text: 'Fair', class: 'strength-fair' },
+            'Good': { text: 'Good', class: 'strength-good' },
+            'Strong': { text: 'Strong', class: 'strength-strong' }
         };
 
-        const strengthInfo = strengthLabels[strength];
+        const strengthInfo = strengthLabels[strength] || strengthLabels['None'];
         this.strengthText.textContent = strengthInfo.text;
         this.strengthIndicator.className = 'strength-indicator ' + strengthInfo.class;
     }
@@ -127,7 +181,7 @@ class PasswordGenerator {
     copyToClipboard() {
         const password = this.passwordOutput.value;
         
-        if (!password || password === 'Select at least one character type') {
+        if (!password || password === 'Select at least one character type' || password.startsWith('Error')) {
             alert('Please generate a password first!');
             return;
         }
@@ -0,0 +1,79 @@
+"""
+Static web UI assets, loaded and compressed once at start-up.
+
+index.html, style.css and script.js are read into memory together with
+gzip (and, when the brotli package is installed, brotli) variants, and
+each variant gets a content-hash ETag. index.html refers to the other two
+with their hash in the query string, so they can be cached as immutable
+and only the small page itself is ever revalidated.
+"""
+import gzip
+from hashlib import blake2b
+import os
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ASSET_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+CONTENT_TYPES = {
+    '.html': 'text/html; charset=utf-8',
+    '.css': 'text/css; charset=utf-8',
+    '.js': 'text/javascript; charset=utf-8',
+}
+
+PAGE_CACHE_CONTROL = 'no-cache'
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+
+class StaticAsset:
+    """
+    One asset held in memory as {encoding: (body, etag)}
+    """
+    __slots__ = ('name', 'content_type', 'cache_control', 'variants', 'version')
+
+    def __init__(self, name, body, cache_control):
+        self.name = name
+        self.content_type = CONTENT_TYPES[os.path.splitext(name)[1]]
+        self.cache_control = cache_control
+        self.version = blake2b(body, digest_size=8).hexdigest()
+
+        self.variants = {'identity': (body, f'"{self.version}"')}
+        compressed = gzip.compress(body, 9, mtime=0)
+        if len(compressed) < len(body):
+            self.variants['gzip'] = (compressed, f'"{self.version}-gz"')
+        if brotli is not None:
+            compressed = brotli.compress(body, quality=11)
+            if len(compressed) < len(body):
+                self.variants['br'] = (compressed, f'"{self.version}-br"')
+
+    def select(self, accepts):
+        """
+        Pick the smallest variant the client accepts; ``accepts(encoding)``
+        tells whether an encoding is acceptable. Returns (encoding, body, etag).
+        """
+        for encoding in ('br', 'gzip'):
+            if encoding in self.variants and accepts(encoding):
+                return (encoding,) + self.variants[encoding]
+        return ('identity',) + self.variants['identity']
+
+
+def load_assets(root=ASSET_ROOT):
+    """
+    Load the web UI; returns {url path: StaticAsset}
+    """
+    assets = {}
+    for name in ('style.css', 'script.js'):
+        with open(os.path.join(root, name), 'rb') as f:
+            assets['/' + name] = StaticAsset(name, f.read(), IMMUTABLE_CACHE_CONTROL)
+
+    with open(os.path.join(root, 'index.html'), 'rb') as f:
+        page = f.read()
+    # Point the page at the current version of each asset
+    for path, asset in assets.items():
+        name = asset.name.encode('ascii')
+        page = page.replace(b'"' + name + b'"', f'"{asset.name}?v={asset.version}"'.encode('ascii'))
+    assets['/'] = StaticAsset('index.html', page, PAGE_CACHE_CONTROL)
+    return assets
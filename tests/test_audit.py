@@ -0,0 +1,50 @@
+import io
+import json
+import unittest
+
+from password_core.audit import MAX_LINE_BYTES, audit, iter_blocks
+
+
+def audit_lines(data, **kwargs):
+    text = ''.join(text for text, _ in audit(io.BytesIO(data), **kwargs))
+    return [json.loads(line) for line in text.splitlines()]
+
+
+class IterBlocksTest(unittest.TestCase):
+
+    def test_blocks_end_on_newlines(self):
+        data = b'one\ntwo\nthree\nfour\n'
+        blocks = list(iter_blocks(io.BytesIO(data), 6))
+        self.assertEqual(b''.join(blocks), data)
+        for block in blocks:
+            self.assertTrue(block.endswith(b'\n'))
+
+    def test_long_line_is_kept_whole_and_bounded(self):
+        data = b'a\n' + b'x' * (3 * MAX_LINE_BYTES) + b'\nb'
+        blocks = list(iter_blocks(io.BytesIO(data), 10))
+        self.assertEqual(sum(block.count(b'\n') for block in blocks), 2)
+        self.assertLessEqual(max(map(len, blocks)), MAX_LINE_BYTES + 10)
+
+
+class AuditTest(unittest.TestCase):
+
+    def test_line_numbers_do_not_depend_on_block_size(self):
+        data = b'short\n' + b'x' * 50 + b'\nabc\n' + 'é'.encode() * 9000 + b'\nlast'
+        expected = audit_lines(data)
+        self.assertEqual([record['line'] for record in expected], [1, 2, 3, 4, 5])
+        for block_size in (1, 10, 64, 5000):
+            self.assertEqual(audit_lines(data, block_size=block_size), expected)
+
+    def test_workers_keep_input_order(self):
+        data = b''.join(b'pw%d!Aa\n' % i for i in range(500))
+        self.assertEqual(audit_lines(data, workers=2, block_size=256),
+                         audit_lines(data, block_size=256))
+
+    def test_summary_counts_non_empty_lines(self):
+        data = b'abc\n\nPassword1!\r\n'
+        summary = list(audit(io.BytesIO(data)))[-1][1]
+        self.assertEqual(summary.total, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
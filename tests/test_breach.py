@@ -0,0 +1,95 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import unittest
+
+from password_core import PasswordPolicy
+from password_core.breach import BreachList, build_index
+from password_core.engine import generate_many, generate_records
+
+BREACHED = ['password', '123456', 'letmein', 'correct horse battery staple', 'Tr0ub4dor&3']
+
+
+def sha1_hex(password):
+    return hashlib.sha1(password.encode('utf-8')).hexdigest().upper()
+
+
+class BreachListTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.source = os.path.join(self.directory, 'pwned.txt')
+        self.index = os.path.join(self.directory, 'breached.sha1')
+
+    def build(self, passwords, with_counts=True):
+        lines = sorted(sha1_hex(p) for p in passwords)
+        with open(self.source, 'w') as f:
+            for count, line in enumerate(lines, 1):
+                f.write(f'{line}:{count}\n' if with_counts else f'{line}\n')
+        count = build_index(self.source, self.index)
+        breach_list = BreachList(self.index)
+        self.addCleanup(breach_list.close)
+        return count, breach_list
+
+    def test_lookup(self):
+        count, breach_list = self.build(BREACHED)
+        self.assertEqual(count, len(BREACHED))
+        self.assertEqual(len(breach_list), len(BREACHED))
+        for password in BREACHED:
+            self.assertIn(password, breach_list)
+        for password in ('Password', 'password1', '', 'letmein '):
+            self.assertNotIn(password, breach_list)
+        self.assertTrue(breach_list.contains_digest(hashlib.sha1(b'123456').digest()))
+
+    def test_lookup_without_bloom_filter(self):
+        _, breach_list = self.build(BREACHED, with_counts=False)
+        breach_list.close()
+        os.remove(self.index + '.bloom')
+        breach_list = BreachList(self.index)
+        self.addCleanup(breach_list.close)
+        for password in BREACHED:
+            self.assertIn(password, breach_list)
+        self.assertNotIn('hunter2', breach_list)
+
+    def test_many_entries(self):
+        passwords = [f'pw{i}' for i in range(5000)]
+        _, breach_list = self.build(passwords + passwords[:10])
+        self.assertEqual(len(breach_list), 5000)
+        for password in passwords[::97]:
+            self.assertIn(password, breach_list)
+        misses = sum(f'other{i}' in breach_list for i in range(2000))
+        self.assertEqual(misses, 0)
+
+    def test_empty_index(self):
+        count, breach_list = self.build([])
+        self.assertEqual(count, 0)
+        self.assertNotIn('password', breach_list)
+
+    def test_unsorted_input_is_rejected(self):
+        with open(self.source, 'w') as f:
+            f.write('\n'.join(sorted((sha1_hex(p) for p in BREACHED), reverse=True)))
+        with self.assertRaises(ValueError):
+            build_index(self.source, self.index)
+
+    def test_malformed_line_is_rejected(self):
+        with open(self.source, 'w') as f:
+            f.write(sha1_hex('a')[:30] + '\n')
+        with self.assertRaises(ValueError):
+            build_index(self.source, self.index)
+
+    def test_generators_skip_breached_passwords(self):
+        policy = PasswordPolicy(length=4, use_uppercase=False, use_lowercase=False, use_symbols=False,
+                                exclude_chars='3456789')
+        # Every repeat-free password over 0, 1 and 2 that does not start with 0
+        candidates = [a + b + c + d for a in '012' for b in '012' for c in '012' for d in '012'
+                      if a != b and b != c and c != d and a != '0']
+        _, breach_list = self.build(candidates)
+        for password in generate_many(policy, 100, breach_list):
+            self.assertEqual(password[0], '0')
+        self.assertEqual(bytes(generate_records(policy, 100, breach_list))[::4], b'0' * 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
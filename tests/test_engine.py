@@ -0,0 +1,115 @@
+from collections import Counter
+from itertools import product
+import unittest
+
+from password_core import PasswordPolicy
+from password_core.engine import (
+    generate_many,
+    generate_records,
+    secure_password_bytes,
+    secure_records,
+)
+
+
+def meets_rules(compiled, password):
+    return (all(any(char in pool for char in password) for pool in compiled.required)
+            and all(a != b for a, b in zip(password, password[1:])))
+
+
+def records(block, length):
+    return [bytes(block[i:i + length]) for i in range(0, len(block), length)]
+
+
+class RuleGuaranteeTest(unittest.TestCase):
+
+    POLICIES = [
+        PasswordPolicy(length=4),
+        PasswordPolicy(length=16),
+        PasswordPolicy(length=300),
+        PasswordPolicy(length=64, use_uppercase=False, use_lowercase=False, use_symbols=False),
+        PasswordPolicy(length=8, use_symbols=False, exclude_chars='BCDEFGHIJKLMNOPQRSTUVWXYZ'),
+        PasswordPolicy(length=6, use_uppercase=False, use_lowercase=False, use_symbols=False,
+                       exclude_chars='23456789'),
+    ]
+
+    def test_secure_password_bytes(self):
+        for policy in self.POLICIES:
+            compiled = policy.validate()
+            for _ in range(200):
+                password = secure_password_bytes(compiled, policy.length)
+                self.assertEqual(len(password), policy.length)
+                self.assertTrue(meets_rules(compiled, password), (policy.length, password))
+
+    def test_secure_records(self):
+        for policy in self.POLICIES:
+            compiled = policy.validate()
+            block = secure_records(compiled, policy.length, 500)
+            self.assertEqual(len(block), 500 * policy.length)
+            for password in records(block, policy.length):
+                self.assertTrue(meets_rules(compiled, password), (policy.length, password))
+
+    def test_generate_records_without_rules_uses_charset(self):
+        policy = PasswordPolicy(length=12, enforce_rules=False, exclude_chars='abc')
+        compiled = policy.validate()
+        block = generate_records(policy, 1000)
+        self.assertEqual(set(block) - set(compiled.charset), set())
+
+    def test_blocklist_is_respected(self):
+        policy = PasswordPolicy(length=4, use_uppercase=False, use_lowercase=False, use_symbols=False,
+                                exclude_chars='3456789')
+        # 0, 1 and 2 leave only 24 repeat-free passwords of length 4 with a digit
+        blocklist = {p for p in map(''.join, product('012', repeat=4)) if p[0] != '0'}
+        for password in generate_many(policy, 200, blocklist):
+            self.assertEqual(password[0], '0')
+        self.assertEqual(bytes(generate_records(policy, 200, blocklist))[::4], b'0' * 200)
+
+
+class UniformityTest(unittest.TestCase):
+    """
+    Every rule-abiding password must be equally likely. The charsets are
+    small enough to enumerate every valid password and compare the observed
+    counts with a chi-squared bound far above its expected value, so the
+    tests fail only for a real bias.
+    """
+
+    def check_uniform(self, compiled, length, sample):
+        valid = [p.encode('ascii') for p in map(''.join, product(compiled.text, repeat=length))
+                 if meets_rules(compiled, p.encode('ascii'))]
+        draws = 40 * len(valid)
+        counts = Counter(sample(draws))
+        self.assertLessEqual(set(counts), set(valid))
+        expected = draws / len(valid)
+        chi_squared = sum((counts[p] - expected) ** 2 / expected for p in valid)
+        # Mean len(valid) - 1, standard deviation about sqrt(2 * len(valid))
+        self.assertLess(chi_squared, len(valid) + 6 * (2 * len(valid)) ** 0.5)
+
+    def small_policies(self):
+        # (compiled, length): a repeat-free draw usually has both classes,
+        # and one that usually misses a class
+        yield PasswordPolicy(length=4, use_uppercase=False, use_symbols=False,
+                             exclude_chars='defghijklmnopqrstuvwxyz3456789').validate(), 3
+        yield PasswordPolicy(length=4, use_symbols=False,
+                             exclude_chars='BCDEFGHIJKLMNOPQRSTUVWXYZdefghijklmnopqrstuvwxyz23456789').validate(), 4
+
+    def test_secure_password_bytes(self):
+        for compiled, length in self.small_policies():
+            self.check_uniform(compiled, length, lambda n: [bytes(secure_password_bytes(compiled, length))
+                                                            for _ in range(n)])
+
+    def test_secure_records(self):
+        for compiled, length in self.small_policies():
+            self.check_uniform(compiled, length, lambda n: records(secure_records(compiled, length, n), length))
+
+    def test_sample_is_uniform_over_charset(self):
+        # 7 characters do not divide 256, so a modulo bias would show here
+        compiled = PasswordPolicy(length=4, use_uppercase=False, use_lowercase=False, use_symbols=False,
+                                  exclude_chars='789').validate()
+        draws = 70000
+        counts = Counter(compiled.sample(draws))
+        self.assertEqual(set(counts), set(compiled.charset))
+        for count in counts.values():
+            self.assertLess(abs(count - draws / 7), 6 * (draws / 7) ** 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
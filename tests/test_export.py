@@ -0,0 +1,109 @@
+import io
+import os
+import unittest
+
+from password_core import PasswordPolicy
+from password_core.bulk import (
+    BINARY_HEADER,
+    BINARY_MAGIC,
+    ENCRYPTED_MAGIC,
+    KEY_SIZE,
+    NONCE_SIZE,
+    SEGMENT_HEADER,
+    TAG_SIZE,
+    decrypt_export,
+    encrypt_export,
+    generate_bulk,
+    iter_encrypted,
+)
+
+try:
+    import cryptography  # noqa: F401
+except ImportError:
+    cryptography = None
+
+# On-disk size of one full 4096-byte segment
+SEGMENT_BYTES = SEGMENT_HEADER.size + NONCE_SIZE + 4096 + TAG_SIZE
+
+
+class ExportFormatTest(unittest.TestCase):
+
+    def setUp(self):
+        self.result = generate_bulk(PasswordPolicy(length=10), 500, workers=1)
+        self.addCleanup(self.result.close)
+
+    def export(self, output_format, key=None):
+        out = io.BytesIO()
+        self.result.export(out, output_format, key)
+        return out.getvalue()
+
+    def test_formats_hold_the_same_records(self):
+        passwords = list(self.result)
+        self.assertEqual(self.export('lines').decode('ascii').splitlines(), passwords)
+        self.assertEqual(self.export('fixed'), ''.join(passwords).encode('ascii'))
+        binary = self.export('binary')
+        self.assertEqual(BINARY_HEADER.unpack_from(binary), (BINARY_MAGIC, 10, 500))
+        self.assertEqual(binary[BINARY_HEADER.size:], self.export('fixed'))
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            self.export('csv')
+
+    @unittest.skipIf(cryptography is None, "needs the cryptography package")
+    def test_encrypted_export_round_trip(self):
+        key = os.urandom(KEY_SIZE)
+        for output_format in ('lines', 'fixed', 'binary'):
+            encrypted = self.export(output_format, key)
+            self.assertTrue(encrypted.startswith(ENCRYPTED_MAGIC))
+            self.assertEqual(decrypt_export(encrypted, key), self.export(output_format))
+
+
+@unittest.skipIf(cryptography is None, "needs the cryptography package")
+class EncryptionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.key = os.urandom(KEY_SIZE)
+        self.payload = os.urandom(10000)
+        # Small segments, so that reordering and truncation can be tried
+        self.encrypted = b''.join(iter_encrypted([self.payload[:3000], self.payload[3000:]],
+                                                 self.key, segment_size=4096))
+
+    def test_round_trip(self):
+        self.assertEqual(decrypt_export(self.encrypted, self.key), self.payload)
+        self.assertEqual(decrypt_export(encrypt_export(b'', self.key), self.key), b'')
+
+    def test_fresh_nonce_per_export(self):
+        self.assertNotEqual(encrypt_export(self.payload, self.key), encrypt_export(self.payload, self.key))
+
+    def test_wrong_key(self):
+        with self.assertRaises(ValueError):
+            decrypt_export(self.encrypted, os.urandom(KEY_SIZE))
+
+    def test_flipped_bit(self):
+        for position in (len(ENCRYPTED_MAGIC) + 20, len(self.encrypted) // 2, len(self.encrypted) - 1):
+            tampered = bytearray(self.encrypted)
+            tampered[position] ^= 1
+            with self.assertRaises(ValueError):
+                decrypt_export(bytes(tampered), self.key)
+
+    def test_truncated(self):
+        # Cut at every segment boundary, and inside the last segment
+        body = len(ENCRYPTED_MAGIC)
+        for end in (body + SEGMENT_BYTES, body + 2 * SEGMENT_BYTES, len(self.encrypted) - 1):
+            with self.assertRaises(ValueError):
+                decrypt_export(self.encrypted[:end], self.key)
+
+    def test_reordered_segments(self):
+        body = self.encrypted[len(ENCRYPTED_MAGIC):]
+        first, second = body[:SEGMENT_BYTES], body[SEGMENT_BYTES:2 * SEGMENT_BYTES]
+        swapped = ENCRYPTED_MAGIC + second + first + body[2 * SEGMENT_BYTES:]
+        with self.assertRaises(ValueError):
+            decrypt_export(swapped, self.key)
+
+    def test_not_an_export(self):
+        with self.assertRaises(ValueError):
+            decrypt_export(b'PWB1' + self.encrypted[4:], self.key)
+
+
+if __name__ == '__main__':
+    unittest.main()
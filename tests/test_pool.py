@@ -0,0 +1,39 @@
+import asyncio
+import time
+import unittest
+
+from password_core import PasswordPolicy
+from password_core.pool import PoolManager
+
+
+class PoolManagerStopTest(unittest.TestCase):
+
+    def test_stop_after_draining_pool(self):
+        async def drain_and_stop():
+            manager = PoolManager(low_watermark=4, high_watermark=8, promote_after=1)
+            pool = manager.add_policy(PasswordPolicy())
+            manager.start()
+            await asyncio.sleep(0.05)
+            for _ in range(20):
+                manager.get(PasswordPolicy())
+            start = time.monotonic()
+            await asyncio.wait_for(manager.stop(), 2)
+            return manager, pool, time.monotonic() - start
+
+        manager, pool, elapsed = asyncio.run(drain_and_stop())
+        self.assertLess(elapsed, 1.0)
+        self.assertIsNone(manager._task)
+        self.assertEqual(len(pool), 0)
+
+    def test_stop_before_task_runs(self):
+        async def start_and_stop():
+            manager = PoolManager()
+            manager.start()
+            await asyncio.wait_for(manager.stop(), 2)
+            return manager
+
+        self.assertIsNone(asyncio.run(start_and_stop())._task)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from password_core.ratelimit import RateLimiter, SharedRateLimiter, rate_limiter_from_env
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class RateLimiterTest(unittest.TestCase):
+
+    def make(self, **options):
+        self.clock = FakeClock()
+        return RateLimiter(clock=self.clock, **options)
+
+    def test_request_burst_then_wait(self):
+        limiter = self.make(request_rate=2, request_burst=3)
+        for _ in range(3):
+            self.assertEqual(limiter.check('a'), 0.0)
+        self.assertAlmostEqual(limiter.check('a'), 0.5)
+        # A refused request takes nothing
+        self.assertAlmostEqual(limiter.check('a'), 0.5)
+        self.clock.now += 0.5
+        self.assertEqual(limiter.check('a'), 0.0)
+        self.assertGreater(limiter.check('a'), 0.0)
+
+    def test_refill_is_capped_at_burst(self):
+        limiter = self.make(request_rate=1, request_burst=2)
+        limiter.check('a')
+        self.clock.now += 3600
+        self.assertEqual(limiter.check('a'), 0.0)
+        self.assertEqual(limiter.check('a'), 0.0)
+        self.assertGreater(limiter.check('a'), 0.0)
+
+    def test_password_quota(self):
+        limiter = self.make(password_rate=100, password_burst=1000)
+        self.assertEqual(limiter.check('a', 800), 0.0)
+        self.assertAlmostEqual(limiter.check('a', 400), 2.0)
+        self.clock.now += 2
+        self.assertEqual(limiter.check('a', 400), 0.0)
+        with self.assertRaises(ValueError):
+            limiter.check('a', 1001)
+
+    def test_clients_are_independent(self):
+        limiter = self.make(request_rate=1, request_burst=1)
+        self.assertEqual(limiter.check('a'), 0.0)
+        self.assertGreater(limiter.check('a'), 0.0)
+        self.assertEqual(limiter.check('b'), 0.0)
+
+    def test_least_recently_seen_client_is_evicted(self):
+        limiter = self.make(request_rate=1, request_burst=1, max_clients=2)
+        limiter.check('a')
+        limiter.check('b')
+        limiter.check('a')
+        limiter.check('c')
+        self.assertEqual(len(limiter), 2)
+        # 'a' was kept with its empty bucket; 'b' was evicted and starts over
+        self.assertGreater(limiter.check('a'), 0.0)
+        self.assertEqual(limiter.check('b'), 0.0)
+
+    def test_invalid_limits(self):
+        with self.assertRaises(ValueError):
+            RateLimiter(request_rate=0)
+        with self.assertRaises(ValueError):
+            RateLimiter(max_clients=0)
+
+
+class SharedRateLimiterTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, 'ratelimit')
+        self.clock = FakeClock()
+
+    def make(self):
+        limiter = SharedRateLimiter(self.path, request_rate=1, request_burst=2, clock=self.clock)
+        self.addCleanup(limiter.close)
+        return limiter
+
+    def test_limits_are_shared_between_instances(self):
+        first, second = self.make(), self.make()
+        self.assertEqual(first.check('a'), 0.0)
+        self.assertEqual(second.check('a'), 0.0)
+        self.assertAlmostEqual(first.check('a'), 1.0)
+        self.assertEqual(second.check('b'), 0.0)
+        self.clock.now += 1
+        self.assertEqual(second.check('a'), 0.0)
+
+
+class FromEnvironmentTest(unittest.TestCase):
+
+    def test_disabled(self):
+        self.assertIsNone(rate_limiter_from_env({'PASSWORD_RATE_LIMIT': '0'}))
+
+    def test_options(self):
+        limiter = rate_limiter_from_env({'PASSWORD_RATE_REQUESTS': '5', 'PASSWORD_RATE_CLIENTS': '10'})
+        self.assertIsInstance(limiter, RateLimiter)
+        self.assertEqual(limiter.limits[0], 5.0)
+        self.assertEqual(limiter.max_clients, 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
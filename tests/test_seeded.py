@@ -0,0 +1,59 @@
+import unittest
+
+from password_core import PasswordPolicy
+from password_core.bulk import generate_bulk
+from password_core.engine import generate_many, generate_password, generate_records, iter_many
+from password_core.sources import SeededSource
+
+
+class SeededDeterminismTest(unittest.TestCase):
+
+    POLICIES = [
+        PasswordPolicy(length=16),
+        PasswordPolicy(length=12, enforce_rules=False),
+        PasswordPolicy(length=40, use_uppercase=False, use_lowercase=False, use_symbols=False),
+    ]
+
+    def test_chunk_size_and_start_do_not_matter(self):
+        source = SeededSource('chunks')
+        for policy in self.POLICIES:
+            expected = generate_many(policy, 1000, source=source, start=100)
+            for chunk_size in (1, 7, 256, 999, 4096):
+                got = [p for chunk in iter_many(policy, 1000, chunk_size, source=source, start=100)
+                       for p in chunk]
+                self.assertEqual(got, expected)
+            for offset in (0, 5, 255, 256, 990):
+                self.assertEqual(generate_password(policy, source=source, index=100 + offset),
+                                 expected[offset])
+                self.assertEqual(generate_many(policy, 10, source=source, start=100 + offset),
+                                 expected[offset:offset + 10])
+            self.assertEqual(generate_records(policy, 1000, source=source, start=100).decode('ascii'),
+                             ''.join(expected))
+
+    def test_same_seed_same_passwords(self):
+        policy = PasswordPolicy(length=16)
+        self.assertEqual(generate_many(policy, 300, source=SeededSource(42)),
+                         generate_many(policy, 300, source=SeededSource(42)))
+        self.assertNotEqual(generate_many(policy, 300, source=SeededSource(42)),
+                            generate_many(policy, 300, source=SeededSource(43)))
+
+    def test_blocklist_replacements_are_deterministic(self):
+        source = SeededSource(7)
+        policy = PasswordPolicy(length=8)
+        blocklist = set(generate_many(policy, 600, source=source)[::7])
+        expected = generate_many(policy, 600, blocklist, source)
+        self.assertFalse(blocklist & set(expected))
+        self.assertEqual(generate_records(policy, 600, blocklist, source).decode('ascii'), ''.join(expected))
+        got = [p for chunk in iter_many(policy, 590, 13, blocklist, source, 10) for p in chunk]
+        self.assertEqual(got, expected[10:])
+
+    def test_bulk_matches_across_workers_and_chunks(self):
+        policy = PasswordPolicy(length=16)
+        expected = generate_many(policy, 3100, source=SeededSource('bulk'))
+        for workers, chunk_size in ((1, 3100), (2, 1000), (3, 97)):
+            with generate_bulk(policy, 3100, workers=workers, chunk_size=chunk_size, seed='bulk') as result:
+                self.assertEqual(list(result), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
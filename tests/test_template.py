@@ -0,0 +1,84 @@
+import math
+import unittest
+
+from password_core.sources import SeededSource
+from password_core.template import (
+    CONSONANTS,
+    MAX_TEMPLATE_LENGTH,
+    TEMPLATE_CLASSES,
+    VOWELS,
+    compile_template,
+    generate_template,
+)
+
+
+def matches(template_pools, password):
+    return len(password) == len(template_pools) and all(
+        char in pool for char, pool in zip(password, template_pools))
+
+
+class TemplateParserTest(unittest.TestCase):
+
+    def check(self, template, pools, exclude_chars=''):
+        compiled = compile_template(template, exclude_chars)
+        self.assertEqual(compiled.length, len(pools))
+        self.assertAlmostEqual(compiled.bits, sum(math.log2(len(pool)) for pool in pools))
+        for _ in range(100):
+            password = compiled.generate()
+            self.assertTrue(matches(pools, password), (template, password))
+
+    def test_classes_and_literals(self):
+        self.check('Cvccvc-99', [CONSONANTS.upper(), VOWELS, CONSONANTS, CONSONANTS, VOWELS, CONSONANTS,
+                                 '-', TEMPLATE_CLASSES['9'], TEMPLATE_CLASSES['9']])
+        self.check('A#*', [TEMPLATE_CLASSES['A'], TEMPLATE_CLASSES['#'], TEMPLATE_CLASSES['*']])
+
+    def test_groups_and_repeats(self):
+        self.check('(cv){2}9{3}', [CONSONANTS, VOWELS] * 2 + [TEMPLATE_CLASSES['9']] * 3)
+        self.check('((V){2}x){2}', [VOWELS.upper(), VOWELS.upper(), 'x'] * 2)
+        self.check('9{0}a', [TEMPLATE_CLASSES['a']])
+
+    def test_escapes_and_unicode_literals(self):
+        self.check('\\C\\9\\{c', ['C', '9', '{', CONSONANTS])
+        password = compile_template('é(v){2}').generate()
+        self.assertTrue(password.startswith('é'))
+        self.assertEqual(len(password), 3)
+
+    def test_literals_cost_no_entropy(self):
+        self.assertEqual(compile_template('xyz-').bits, 0.0)
+        self.assertAlmostEqual(compile_template('v').bits, math.log2(5))
+
+    def test_exclusions(self):
+        self.check('v{4}', [VOWELS.replace('a', '').replace('e', '')] * 4, exclude_chars='ae')
+        with self.assertRaises(ValueError):
+            compile_template('v', VOWELS)
+
+    def test_malformed_templates(self):
+        for template in ('', '(cv', 'cv)', '{2}', 'c{', 'c{x}', 'c{2', '(){-1}', 'abc\\'):
+            with self.assertRaises(ValueError, msg=template):
+                compile_template(template)
+        with self.assertRaises(ValueError):
+            compile_template(None)
+        with self.assertRaises(ValueError):
+            compile_template('()')
+
+    def test_length_limit(self):
+        self.assertEqual(compile_template(f'a{{{MAX_TEMPLATE_LENGTH}}}').length, MAX_TEMPLATE_LENGTH)
+        for template in (f'a{{{MAX_TEMPLATE_LENGTH + 1}}}', '(a{1000}){1000}', 'a' * (MAX_TEMPLATE_LENGTH + 1)):
+            with self.assertRaises(ValueError):
+                compile_template(template)
+
+    def test_seeded_and_blocklist(self):
+        source = SeededSource('template')
+        first = generate_template('Cvcc9{4}', source=source, index=3)
+        self.assertEqual(generate_template('Cvcc9{4}', source=source, index=3), first)
+        self.assertEqual(compile_template('Cvcc9{4}').generate_many(5, source, 1)[2], first)
+        # Only 'e' is left once the other vowels are blocked
+        blocklist = {'a', 'i', 'o', 'u'}
+        for _ in range(50):
+            self.assertEqual(generate_template('v', blocklist=blocklist), 'e')
+        with self.assertRaises(ValueError):
+            generate_template('x', blocklist={'x'})
+
+
+if __name__ == '__main__':
+    unittest.main()